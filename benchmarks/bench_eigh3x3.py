@@ -0,0 +1,102 @@
+"""Compare eigh3x3 against the general numpy eigensolvers on neighborhood covariances.
+
+Covariances come from random k-neighborhoods of flat, linear and isotropic
+point sets, so the closed form, its eigh fallback and the numba kernel are
+all exercised.
+
+Usage:
+    python benchmarks/bench_eigh3x3.py [n_points] [k]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from pyntcloud.utils import array
+from pyntcloud.utils.array import cov3D, eigh3x3
+
+
+def legacy_eigenvalues(cov):
+    """EigenValues before eigh3x3."""
+    eigenvalues = np.linalg.eigvals(cov)
+    sort = eigenvalues.argsort()
+    idx_trick = range(eigenvalues.shape[0])
+    return np.stack(
+        [eigenvalues[idx_trick, sort[:, i]] for i in (2, 1, 0)], axis=1
+    ).real
+
+
+def legacy_eigen_decomposition(cov):
+    """EigenDecomposition before eigh3x3."""
+    eigenvalues, eigenvectors = np.linalg.eig(cov)
+    sort = eigenvalues.argsort()[:, ::-1]
+    idx_trick = np.arange(eigenvalues.shape[0])[:, None]
+    return (
+        eigenvalues[idx_trick, sort].real,
+        eigenvectors.transpose(0, 2, 1)[idx_trick, sort].transpose(0, 2, 1).real,
+    )
+
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def covariances(n_points, k):
+    rng = np.random.default_rng(0)
+    n = n_points // 3
+    neighborhoods = np.concatenate(
+        [
+            rng.random((n, k, 3)) * [1, 1, 1e-3],
+            rng.random((n, k, 3)) * [1, 1e-3, 1e-3],
+            rng.random((n_points - 2 * n, k, 3)),
+        ]
+    )
+    return cov3D(neighborhoods)
+
+
+def main(n_points, k):
+    cov = covariances(n_points, k)
+    reference_values, reference_vectors = np.linalg.eigh(cov)
+    reference_values = reference_values[:, ::-1]
+    # warm up numba
+    eigh3x3(cov[:10])
+
+    print("{} covariances of {} neighbors".format(n_points, k))
+    print("eigenvalues only")
+    old_time, old = timeit(legacy_eigenvalues, cov)
+    print("{:24} {:8.3f} s".format("eigvals + argsort (old)", old_time))
+    for name, use_numba in [("numpy", False), ("numba", True)]:
+        array.is_numba_avaliable = use_numba
+        new_time, values = timeit(eigh3x3, cov, False)
+        error = np.abs(values - reference_values).max()
+        print(
+            "{:24} {:8.3f} s  {:6.1f}x  max error {:.1e}".format(
+                name, new_time, old_time / new_time, error
+            )
+        )
+
+    print("eigenvalues and eigenvectors")
+    old_time, _ = timeit(legacy_eigen_decomposition, cov)
+    print("{:24} {:8.3f} s".format("eig + argsort (old)", old_time))
+    eigh_time, _ = timeit(np.linalg.eigh, cov)
+    print("{:24} {:8.3f} s".format("eigh", eigh_time))
+    for name, use_numba in [("numpy", False), ("numba", True)]:
+        array.is_numba_avaliable = use_numba
+        new_time, (values, vectors) = timeit(eigh3x3, cov)
+        residual = np.abs(cov @ vectors - vectors * values[:, None, :]).max()
+        print(
+            "{:24} {:8.3f} s  {:6.1f}x  max |Av - ev| {:.1e}".format(
+                name, new_time, old_time / new_time, residual
+            )
+        )
+    array.is_numba_avaliable = True
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10**6,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 16,
+    )
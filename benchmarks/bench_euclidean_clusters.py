@@ -0,0 +1,88 @@
+"""Compare connected components EuclideanClusters against the previous voxel by voxel BFS.
+
+Usage:
+    python benchmarks/bench_euclidean_clusters.py [n_points] [n_voxels_per_axis]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from pyntcloud import PyntCloud
+from pyntcloud.utils.array import cartesian
+
+
+def legacy_voxel_neighbors(voxelgrid, voxel):
+    """VoxelGrid.get_voxel_neighbors before occupied voxels were cached."""
+    xyz = np.unravel_index(voxel, voxelgrid.x_y_z)
+    valid = [
+        [i for i in (c - 1, c, c + 1) if 0 <= i < n]
+        for c, n in zip(xyz, voxelgrid.x_y_z)
+    ]
+    ravel_indices = np.ravel_multi_index(cartesian(valid).T, voxelgrid.x_y_z)
+    return [x for x in ravel_indices if x in np.unique(voxelgrid.voxel_n)]
+
+
+def legacy_euclidean_clusters(voxelgrid):
+    """EuclideanClusters.compute before it used connected components."""
+    to_be_processed = np.zeros(voxelgrid.n_voxels, dtype=bool)
+    to_be_processed[np.unique(voxelgrid.voxel_n)] = True
+    clusters = np.zeros(voxelgrid.voxel_n.shape[0])
+    C = 0
+    while np.any(to_be_processed):
+        Q = [np.random.choice(np.where(to_be_processed)[0])]
+        for voxel in Q:
+            clusters[np.where(voxelgrid.voxel_n == voxel)[0]] = C
+            to_be_processed[voxel] = False
+            for neighbor in legacy_voxel_neighbors(voxelgrid, voxel):
+                if to_be_processed[neighbor]:
+                    Q.append(neighbor)
+                    to_be_processed[neighbor] = False
+        C += 1
+    return clusters
+
+
+def blobs(n_points, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(0, 100, (20, 3))
+    which = rng.integers(0, len(centers), n_points)
+    return centers[which] + rng.normal(0, 3, (n_points, 3))
+
+
+def same_partition(a, b):
+    pairs = np.unique(np.stack([a, b], axis=1), axis=0)
+    return len(pairs) == len(np.unique(a)) == len(np.unique(b))
+
+
+def timeit(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main(n_points, n):
+    cloud = PyntCloud(pd.DataFrame(blobs(n_points), columns=["x", "y", "z"]))
+    voxelgrid_id = cloud.add_structure("voxelgrid", n_x=n, n_y=n, n_z=n)
+    voxelgrid = cloud.structures[voxelgrid_id]
+    print(
+        "{} points, {} occupied voxels".format(n_points, len(voxelgrid.occupied_voxels))
+    )
+
+    new_time, name = timeit(
+        cloud.add_scalar_field, "euclidean_clusters", voxelgrid_id=voxelgrid_id
+    )
+    print("connected components:  {:8.3f} s".format(new_time))
+    old_time, old = timeit(legacy_euclidean_clusters, voxelgrid)
+    print("BFS (old):             {:8.3f} s".format(old_time))
+    print("speedup:               {:8.1f} x".format(old_time / new_time))
+
+    assert same_partition(cloud.points[name].values, old)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 16,
+    )
@@ -0,0 +1,93 @@
+"""Compare the vectorized OBJ reader against the previous line by line implementation.
+
+Usage:
+    python benchmarks/bench_obj.py [n_faces]
+"""
+
+import os
+import re
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from pyntcloud.io.obj import read_obj
+
+
+def legacy_read_obj(filename):
+    """read_obj before lines were parsed in bulk (triangles with v//vn only)."""
+    v = []
+    vn = []
+    f = []
+
+    with open(filename) as obj:
+        for line in obj:
+            if line.startswith("v "):
+                v.append(line.strip()[1:].split())
+
+            elif line.startswith("vn"):
+                vn.append(line.strip()[2:].split())
+
+            elif line.startswith("f"):
+                f.append(line.strip()[1:].lstrip())
+
+    points = pd.DataFrame(v, dtype="f4", columns=["x", "y", "z", "w"][: len(v[0])])
+    points = points.join(pd.DataFrame(vn, dtype="f4", columns=["nx", "ny", "nz"]))
+
+    mesh_columns = []
+    for i in range(f[0].count("//")):
+        mesh_columns.append("v{}".format(i + 1))
+        mesh_columns.append("vn{}".format(i + 1))
+    mesh = pd.DataFrame([re.split(r"\D+", x) for x in f], columns=mesh_columns).astype(
+        "i4"
+    )
+    mesh -= 1
+    return {"points": points, "mesh": mesh}
+
+
+def write_grid(filename, n_faces):
+    """Write a triangulated grid with about n_faces faces, in v//vn format."""
+    side = int(np.sqrt(n_faces / 2)) + 1
+    i, j = np.meshgrid(np.arange(side), np.arange(side), indexing="ij")
+    xyz = np.stack([i.ravel(), j.ravel(), np.sin(i.ravel() * 0.1)], axis=1) / side
+    normals = np.zeros_like(xyz)
+    normals[:, 2] = 1
+
+    ids = (i[:-1, :-1] * side + j[:-1, :-1]).ravel() + 1
+    lower = np.stack([ids, ids + side, ids + 1], axis=1)
+    upper = np.stack([ids + 1, ids + side, ids + side + 1], axis=1)
+    faces = np.concatenate([lower, upper])[:n_faces]
+
+    with open(filename, "w") as obj:
+        np.savetxt(obj, xyz, fmt="v %.6f %.6f %.6f")
+        np.savetxt(obj, normals, fmt="vn %.6f %.6f %.6f")
+        np.savetxt(obj, np.repeat(faces, 2, axis=1), fmt="f %d//%d %d//%d %d//%d")
+    return len(faces)
+
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main(n_faces):
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "bench.obj")
+        n_faces = write_grid(filename, n_faces)
+        print("{} faces, {:.1f} MB".format(n_faces, os.path.getsize(filename) / 1e6))
+
+        new_time, new = timeit(read_obj, filename)
+        print("read_obj:              {:8.3f} s".format(new_time))
+        old_time, old = timeit(legacy_read_obj, filename)
+        print("line by line (old):    {:8.3f} s".format(old_time))
+        print("speedup:               {:8.1f} x".format(old_time / new_time))
+
+        pd.testing.assert_frame_equal(new["points"], old["points"])
+        pd.testing.assert_frame_equal(new["mesh"], old["mesh"])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,121 @@
+"""Compare Octree against a dense VoxelGrid of the same resolution on lidar-like data.
+
+Usage:
+    python benchmarks/bench_octree.py [n_points] [level]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from pyntcloud.structures import Octree, VoxelGrid
+
+
+def lidar_like(n_points, seed=0):
+    """Points whose density decays with the distance to a sensor at the origin."""
+    rng = np.random.default_rng(seed)
+    n_ground = n_points * 3 // 4
+    distance = rng.exponential(15, n_ground)
+    angle = rng.uniform(0, 2 * np.pi, n_ground)
+    ground = np.stack(
+        [
+            distance * np.cos(angle),
+            distance * np.sin(angle),
+            rng.normal(0, 0.05, n_ground),
+        ],
+        axis=1,
+    )
+    # a few buildings/trees
+    n_objects = n_points - n_ground
+    centers = rng.uniform(-60, 60, (50, 2))
+    which = rng.integers(0, 50, n_objects)
+    objects = np.column_stack(
+        [
+            centers[which] + rng.normal(0, 2, (n_objects, 2)),
+            rng.uniform(0, 15, n_objects),
+        ]
+    )
+    return np.concatenate([ground, objects]).astype(np.float32)
+
+
+def nbytes(structure, names):
+    return sum(getattr(structure, name).nbytes for name in names)
+
+
+def voxelgrid_query_box(voxelgrid, points, lower, upper):
+    """Box query with a dense VoxelGrid: select the voxels, then check their points."""
+    ijk = [
+        np.clip(
+            np.searchsorted(voxelgrid.segments[i], [lower[i], upper[i]]) - 1, 0, None
+        )
+        for i in range(3)
+    ]
+    voxels = np.ravel_multi_index(
+        np.meshgrid(*[np.arange(a, b + 1) for a, b in ijk], indexing="ij"),
+        voxelgrid.x_y_z,
+        mode="clip",
+    ).ravel()
+    candidates = np.flatnonzero(np.isin(voxelgrid.voxel_n, voxels))
+    inside = np.all(
+        (points[candidates] >= lower) & (points[candidates] <= upper), axis=1
+    )
+    return candidates[inside]
+
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main(n_points, level):
+    points = lidar_like(n_points)
+    n = 2**level
+    print("{} points, {}^3 cells".format(n_points, n))
+
+    octree = Octree(points=points, max_level=level, max_points=32)
+    octree_time, _ = timeit(octree.compute)
+    voxelgrid = VoxelGrid(points=points, n_x=n, n_y=n, n_z=n)
+    voxelgrid_time, _ = timeit(voxelgrid.compute)
+
+    print("build Octree:          {:8.3f} s".format(octree_time))
+    print("build VoxelGrid:       {:8.3f} s".format(voxelgrid_time))
+    print(
+        "Octree memory:         {:8.1f} MB".format(
+            nbytes(octree, ["codes", "order", "leaf_n"]) / 1e6
+        )
+    )
+    print(
+        "VoxelGrid memory:      {:8.1f} MB".format(
+            nbytes(
+                voxelgrid, ["voxel_x", "voxel_y", "voxel_z", "voxel_n", "voxel_centers"]
+            )
+            / 1e6
+        )
+    )
+
+    rng = np.random.default_rng(1)
+    lowers = rng.uniform(-30, 30, (100, 3)) * [1, 1, 0]
+    boxes = [(lower, lower + [2, 2, 5]) for lower in lowers]
+
+    octree_time, octree_result = timeit(
+        lambda: [octree.query_box(lower, upper) for lower, upper in boxes]
+    )
+    voxelgrid_time, voxelgrid_result = timeit(
+        lambda: [
+            voxelgrid_query_box(voxelgrid, points, lower, upper)
+            for lower, upper in boxes
+        ]
+    )
+    for a, b in zip(octree_result, voxelgrid_result):
+        assert np.array_equal(a, b)
+    print("100 box queries Octree:    {:8.3f} s".format(octree_time))
+    print("100 box queries VoxelGrid: {:8.3f} s".format(voxelgrid_time))
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1000000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 8,
+    )
@@ -0,0 +1,105 @@
+"""Compare the ascii PLY reader against the previous python-engine implementation.
+
+Usage:
+    python benchmarks/bench_ply_ascii.py [n_points]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from pyntcloud import PyntCloud
+from pyntcloud.io.ply import parse_header, read_ply
+
+
+def legacy_read_ascii_ply(filename):
+    """The ascii branch of read_ply before the C parser was used."""
+    with open(filename, "rb") as ply:
+        header = parse_header(ply)
+    dtypes = header["dtypes"]
+    count = header["count"]
+    points_size = header["points_size"]
+    mesh_size = header["mesh_size"]
+
+    data = {}
+    names = [x[0] for x in dtypes["vertex"]]
+    data["points"] = pd.read_csv(
+        filename,
+        sep=" ",
+        header=None,
+        engine="python",
+        skiprows=count,
+        skipfooter=0 if mesh_size is None else mesh_size,
+        usecols=names,
+        names=names,
+    )
+    for n, col in enumerate(data["points"].columns):
+        data["points"][col] = data["points"][col].astype(dtypes["vertex"][n][1])
+
+    if mesh_size:
+        names = np.array([x[0] for x in dtypes["face"]])[[1, 2, 3]]
+        data["mesh"] = pd.read_csv(
+            filename,
+            sep=" ",
+            header=None,
+            engine="python",
+            skiprows=count + points_size,
+            usecols=[1, 2, 3],
+            names=names,
+        )
+        for n, col in enumerate(data["mesh"].columns):
+            data["mesh"][col] = data["mesh"][col].astype(dtypes["face"][n + 1][1])
+    return data
+
+
+def make_cloud(n_points):
+    rng = np.random.default_rng(0)
+    points = pd.DataFrame(
+        {
+            "x": rng.random(n_points, dtype=np.float32),
+            "y": rng.random(n_points, dtype=np.float32),
+            "z": rng.random(n_points, dtype=np.float32),
+            "red": rng.integers(0, 255, n_points, dtype=np.uint8),
+            "green": rng.integers(0, 255, n_points, dtype=np.uint8),
+            "blue": rng.integers(0, 255, n_points, dtype=np.uint8),
+        }
+    )
+    mesh = pd.DataFrame(
+        rng.integers(0, n_points, (n_points, 3), dtype=np.int32),
+        columns=["v1", "v2", "v3"],
+    )
+    return PyntCloud(points, mesh=mesh)
+
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main(n_points):
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "bench_ascii.ply")
+        make_cloud(n_points).to_file(filename, also_save=["mesh"], as_text=True)
+        print(
+            "{} points, {} faces, {:.1f} MB".format(
+                n_points, n_points, os.path.getsize(filename) / 1e6
+            )
+        )
+
+        new_time, new = timeit(read_ply, filename)
+        print("read_ply:              {:8.3f} s".format(new_time))
+        old_time, old = timeit(legacy_read_ascii_ply, filename)
+        print("python engine (old):   {:8.3f} s".format(old_time))
+        print("speedup:               {:8.1f} x".format(old_time / new_time))
+
+        pd.testing.assert_frame_equal(new["points"], old["points"])
+        pd.testing.assert_frame_equal(new["mesh"], old["mesh"])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,67 @@
+"""Compare arithmetic voxel indexing against the previous per-axis searchsorted.
+
+Points are processed in chunks so that 10^8 points fit in memory with the
+temporary arrays of the searchsorted implementation.
+
+Usage:
+    python benchmarks/bench_voxelgrid_query.py [n_points] [chunk_size]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from pyntcloud.structures import voxelgrid
+from pyntcloud.structures.voxelgrid import query_voxelgrid
+
+
+def legacy_query_voxelgrid(segments, x_y_z, points):
+    """VoxelGrid.query before voxel indices were computed arithmetically."""
+    voxel_x = np.clip(np.searchsorted(segments[0], points[:, 0]) - 1, 0, x_y_z[0])
+    voxel_y = np.clip(np.searchsorted(segments[1], points[:, 1]) - 1, 0, x_y_z[1])
+    voxel_z = np.clip(np.searchsorted(segments[2], points[:, 2]) - 1, 0, x_y_z[2])
+    return np.ravel_multi_index([voxel_x, voxel_y, voxel_z], x_y_z)
+
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main(n_points, chunk_size):
+    rng = np.random.default_rng(0)
+    x_y_z = np.array([512, 512, 64])
+    segments = [np.linspace(0, 100, n + 1) for n in x_y_z]
+    # warm up numba
+    query_voxelgrid(segments, x_y_z, rng.random((10, 3)))
+
+    times = {"searchsorted (old)": 0.0, "numpy": 0.0, "numba": 0.0}
+    for start in range(0, n_points, chunk_size):
+        points = rng.random((min(chunk_size, n_points - start), 3), dtype=np.float32)
+        points *= 100
+
+        old_time, old = timeit(legacy_query_voxelgrid, segments, x_y_z, points)
+        times["searchsorted (old)"] += old_time
+        for name, use_numba in [("numpy", False), ("numba", True)]:
+            voxelgrid.is_numba_avaliable = use_numba
+            new_time, new = timeit(query_voxelgrid, segments, x_y_z, points)
+            times[name] += new_time
+            assert np.array_equal(old, new)
+        voxelgrid.is_numba_avaliable = True
+
+    print("{} points, {} voxels".format(n_points, np.prod(x_y_z)))
+    for name, total in times.items():
+        print(
+            "{:20} {:8.3f} s  {:6.1f}x".format(
+                name, total, times["searchsorted (old)"] / total
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10**8,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10**7,
+    )
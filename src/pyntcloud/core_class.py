@@ -3,10 +3,11 @@ import os
 import numpy as np
 import pandas as pd
 
-from .structures.base import StructuresDict
+from .structures.base import StructuresDict, points_fingerprint
 from .filters import ALL_FILTERS
-from .io import FROM_FILE, TO_FILE, FROM_INSTANCE, TO_INSTANCE
-from .neighbors import k_neighbors, r_neighbors
+from .io import FROM_FILE, ITER_FILE, TO_FILE, FROM_INSTANCE, TO_INSTANCE
+from .io import read_structures, write_structures
+from .neighbors import k_neighbors, kr_neighbors, r_neighbors
 from .plot import DESCRIPTION, AVAILABLE_BACKENDS
 from .plot.matplotlib_backend import plot_with_matplotlib
 from .plot.pythreejs_backend import plot_with_pythreejs
@@ -14,7 +15,7 @@ from .plot.pyvista_backend import plot_with_pyvista
 from .samplers import ALL_SAMPLERS
 from .scalar_fields import ALL_SF
 from .structures import ALL_STRUCTURES
-from .utils.dataframe import convert_columns_dtype
+from .utils.dataframe import convert_columns_dtype, get_xyz
 
 
 class PyntCloud(object):
@@ -47,9 +48,6 @@ class PyntCloud(object):
             self.structures[key] = val
         for key, val in kwargs.items():
             setattr(self, key, val)
-        # store raw xyz values to share memory along structures
-        self.xyz = self.points[["x", "y", "z"]].values
-        self.centroid = self.xyz.mean(0)
 
     def __repr__(self):
         default = [
@@ -57,7 +55,7 @@ class PyntCloud(object):
             "_PyntCloud__mesh",
             "structures",
             "xyz",
-            "centroid",
+            "_PyntCloud__centroid",
         ]
         others = [
             "\n\t {}: {}".format(x, str(type(getattr(self, x))))
@@ -94,6 +92,13 @@ class PyntCloud(object):
             raise ValueError("Points must have x, y and z coordinates")
         self._update_points(df)
 
+    @property
+    def centroid(self):
+        # computed lazily, so memory mapped points are not read on creation
+        if self.__centroid is None:
+            self.__centroid = self.xyz.mean(0)
+        return self.__centroid
+
     @property
     def mesh(self):
         return self.__mesh
@@ -137,6 +142,37 @@ class PyntCloud(object):
         else:
             return cls(**FROM_FILE[ext](filename, **kwargs))
 
+    @classmethod
+    def iter_file(cls, filename, chunk_size=1000000, **kwargs):
+        """Read the points of a file in chunks, without loading the whole file.
+
+        Parameters
+        ----------
+        filename: str
+            Path to the file from which the data will be read
+
+        chunk_size: int, optional
+            Default: 1000000
+            Maximum number of points in each chunk.
+
+        kwargs: only usable in some formats
+
+        Returns
+        -------
+        chunks: generator of pd.DataFrame
+            Each DataFrame holds up to chunk_size points, indexed by their
+            position in the file.
+        """
+        ext = filename.split(".")[-1].upper()
+        if ext not in ITER_FILE:
+            raise ValueError(
+                "Unsupported file format; supported formats are: {}".format(
+                    list(ITER_FILE)
+                )
+            )
+        else:
+            return ITER_FILE[ext](filename, chunk_size=chunk_size, **kwargs)
+
     @classmethod
     def from_instance(cls, library, instance, **kwargs):
         """Convert library's instance to PyntCloud intstance.
@@ -235,6 +271,10 @@ class PyntCloud(object):
         Notes
         -----
 
+        The columns are set in a new DataFrame assigned to PyntCloud.points.
+        DataFrames obtained from PyntCloud.points before the call don't have
+        them.
+
         Available scalar fields are:
 
         **REQUIRE EIGENVALUES**
@@ -266,11 +306,41 @@ class PyntCloud(object):
                     Returned from: self.get_neighbors(k, ...) /
                     manually querying some self.kdtrees[x] /
                     other methods.
+                r_neighbors: (indptr, indices), optional
+                    Used instead of k_neighbors, for neighbourhoods of
+                    variable size. Returned from:
+                    self.get_neighbors(r=r, format="csr", ...) /
+                    self.get_neighbors(k=k, r=r, ...)
+                r: float, optional
+                    Default: None
+                    Only used to name the columns computed from r_neighbors.
+                chunk_size: int, optional
+                    Default: 100000
+                    Number of neighbourhoods processed at once.
+                max_workers: int, optional
+                    Default: 1
+                    Number of threads processing chunks.
 
             eigen_decomposition
 
             eigen_values
 
+            geometric_features
+                features: list of str, optional
+                    Default: None
+                    Any of anisotropy, curvature, eigenentropy, eigen_sum,
+                    linearity, omnivariance, planarity and sphericity.
+                    All of them if None.
+
+            multiscale_eigen_values
+                scales: list of int
+                    Number of neighbors of each scale, from a single
+                    self.get_neighbors(k=max(scales)).
+                features: list of str, optional
+                    Default: None
+                    Computed at each scale instead of the eigen values.
+                    See geometric_features.
+
         **REQUIRE NORMALS**
 
             orientation_degrees
@@ -305,6 +375,9 @@ class PyntCloud(object):
             voxel_z
 
             euclidean_clusters
+                min_cluster_size: int, optional
+                    Default: 1
+                    Points of clusters with less points are labeled as -1.
 
 
         **ONLY REQUIRE XYZ**
@@ -354,13 +427,21 @@ class PyntCloud(object):
 
         return scalar_fields_added
 
-    def add_structure(self, name, **kwargs):
+    def add_structure(self, name, force=False, **kwargs):
         """Build a structure and add it to the corresponding PyntCloud's attribute.
 
+        If a structure with the same name and kwargs was already built over the
+        current points, it is reused instead of being built again. Points are
+        compared by a hash of self.xyz.
+
         Parameters
         ----------
         name: str
             One of the available names. See below.
+        force: bool, optional
+            Default: False
+            If True, the structure is always built, replacing any stored one
+            with the same id.
         kwargs
             Vary for each name. See below.
 
@@ -400,22 +481,87 @@ class PyntCloud(object):
                     Default: True
                     If True, the bounding box of the point cloud will be adjusted
                     in order to have all the dimensions of equal length.
+                sparse: bool, optional
+                    Default: False
+                    If True, only the occupied voxels are stored. Use it for
+                    fine grids where n_voxels doesn't fit in memory.
 
             octree
-                TODO
+                max_level: int, optional
+                    Default: 10
+                    Depth of the deepest nodes, up to 21. At level l each axis
+                    of the bounding cube is divided into 2 ** l segments.
+                max_points: int, optional
+                    Default: None
+                    If not None, nodes with max_points or less points are not
+                    subdivided.
 
         """
         if name in ALL_STRUCTURES:
             info = ALL_STRUCTURES[name].extract_info(pyntcloud=self)
             structure = ALL_STRUCTURES[name](**info, **kwargs)
+            fingerprint = points_fingerprint(self.xyz)
+            if not force:
+                structure_found = self.structures.find(structure, fingerprint)
+                if structure_found is not None:
+                    return structure_found
+            params = structure.get_params()
             structure.compute()
-            structure_added = structure.get_and_set(self)
+            structure_added = structure.get_and_set(
+                self, params=params, fingerprint=fingerprint
+            )
 
         else:
             raise ValueError("Unsupported structure. Check docstring")
 
         return structure_added
 
+    def save_structures(self, path, structures=None):
+        """Save computed structures to a directory, so they can be loaded without
+        building them again.
+
+        Parameters
+        ----------
+        path: str
+            Directory. Created if it doesn't exist.
+        structures: list of str, optional
+            Default: None
+            Structure.id of the structures to be saved, all if None.
+        """
+        if structures is None:
+            structures = list(self.structures)
+        write_structures(
+            path,
+            self.xyz,
+            {key: self.structures[key] for key in structures},
+            params={key: self.structures.get_params(key) for key in structures},
+        )
+
+    def load_structures(self, path, mmap_mode="r"):
+        """Load the structures saved with save_structures.
+
+        The points must be the same as when the structures were saved; this is
+        checked with a hash of self.xyz.
+
+        Parameters
+        ----------
+        path: str
+            Directory written by save_structures.
+        mmap_mode: {None, "r", "r+", "c"}, optional
+            Default: "r"
+            See numpy.load. With "r" the arrays of the structures are memory
+            mapped read-only.
+
+        Returns
+        -------
+        structures: list of str
+            Structure.id of the loaded structures.
+        """
+        return [
+            structure.get_and_set(self, params=params)
+            for structure, params in read_structures(path, self, mmap_mode)
+        ]
+
     def get_filter(self, name, and_apply=False, **kwargs):
         """Compute filter over PyntCloud's points and return it.
 
@@ -462,6 +608,16 @@ class PyntCloud(object):
                 z_max: float
                     The maximum Z score which determines if the point is an outlier.
 
+        **REQUIRE OCTREE**
+
+            ARGS
+                octree_id : Octree.id
+                    octree = self.add_structure("octree", ...)
+
+            OCTREE_BBOX    (Bounding Box)
+                min_i, max_i: float
+                    The bounding box limits for each coordinate, included.
+
         **ONLY REQUIRE XYZ**
 
             BBOX    (Bounding Box)
@@ -538,6 +694,22 @@ class PyntCloud(object):
 
             voxelgrid_highest
 
+        **REQUIRE OCTREE**
+
+            ARGS
+                octree_id: Octree.id
+                    octree_id = self.add_structure("octree", ...)
+                level: int, optional
+                    Default: Octree.max_level
+                    Level of the nodes used to sample.
+
+            octree_centers
+
+            octree_centroids
+
+            octree_nearest
+                Point closest to the center of each node: a level of detail.
+
 
         **USE POINTS**
 
@@ -558,7 +730,9 @@ class PyntCloud(object):
         else:
             raise ValueError("Unsupported sampling method. Check docstring")
 
-    def get_neighbors(self, k=None, r=None, kdtree=None):
+    def get_neighbors(
+        self, k=None, r=None, kdtree=None, format="lists", chunk_size=100000
+    ):
         """For each point finds the indices that compose its neighborhood.
 
         Parameters
@@ -573,26 +747,46 @@ class PyntCloud(object):
             For "Fixed-radius neighbors" search.
             Radius of the sphere that will be used to build the neighborhood.
 
+            If both **k** and **r** are given, up to k nearest neighbors with
+            distance <= r are found, in "csr" format.
+
         kdtree: str, optional
             Default: None
             KDTree.id in self.structures.
 
             - If **kdtree** is None:
 
-            The KDTree will be computed and added to PyntCloud as part of the process.
+            The default KDTree will be computed and added to PyntCloud as part
+            of the process, or reused if it was already added.
 
             - Else:
 
             The given KDTree will be used for neighbor search.
 
+        format: {"lists", "csr"}, optional
+            Default: "lists"
+            Format of the neighbors found with r alone. See Returns.
+
+        chunk_size: int, optional
+            Default: 100000
+            Number of points queried at once, for k and for r with format "csr".
+            Bounds the temporary memory used.
+
         Returns
         -------
         neighbors: array-like
-            (N, k) ndarray if k is not None.
+            (N, k) int32 ndarray if only k is not None.
                 Indices of the 'k' nearest neighbors for the 'N' points.
-            (N,) ndarray of lists if r is not None.
+                int64 if N doesn't fit in int32.
+            (N,) ndarray of lists if r is not None and format is "lists".
                 Array holding a variable number of indices corresponding
-                to the neighbors with distance < r.
+                to the neighbors with distance <= r.
+            (indptr, indices) if r is not None and format is "csr".
+                The neighbors with distance <= r of point i are
+                indices[indptr[i]:indptr[i + 1]], including i itself.
+            (indptr, indices) if both k and r are not None.
+                As above, with at most k + 1 indices per point, sorted by
+                distance.
         """
         if kdtree is None:
             kdtree_id = self.add_structure("kdtree")
@@ -600,11 +794,14 @@ class PyntCloud(object):
         else:
             kdtree = self.structures[kdtree]
 
-        if k is not None:
-            return k_neighbors(kdtree, k)
+        if k is not None and r is not None:
+            return kr_neighbors(kdtree, k, r, chunk_size=chunk_size)
+
+        elif k is not None:
+            return k_neighbors(kdtree, k, chunk_size=chunk_size)
 
         elif r is not None:
-            return r_neighbors(kdtree, r)
+            return r_neighbors(kdtree, r, format=format, chunk_size=chunk_size)
 
         else:
             raise ValueError("You must supply 'k' or 'r' values.")
@@ -686,10 +883,38 @@ class PyntCloud(object):
     def _update_points(self, df):
         """Utility function. Implicitly called when self.points is assigned."""
         self.mesh = None
-        self.structures = StructuresDict()
+        # keep the eviction limits of the previous structures, if any
+        structures = getattr(self, "structures", StructuresDict())
+        self.structures = StructuresDict(
+            max_structures=structures.max_structures,
+            max_nbytes=structures.max_nbytes,
+        )
         self.__points = df
-        self.xyz = self.__points[["x", "y", "z"]].values
-        self.centroid = self.xyz.mean(0)
+        # store raw xyz values to share memory along structures
+        self.xyz = get_xyz(self.__points)
+        self.__centroid = None
+
+    def _add_columns(self, columns):
+        """Utility function. Set columns of self.points, replacing existing ones.
+
+        All the columns are set at once, in a new DataFrame assigned to
+        self.points, instead of inserting them one by one in the current one,
+        which fragments it. DataFrames previously obtained from self.points
+        are not modified. Structures and mesh are kept.
+
+        Parameters
+        ----------
+        columns: dict
+            Column name to (N,) values.
+        """
+        points = self.__points
+        existing = {k: v for k, v in columns.items() if k in points.columns}
+        new = {k: v for k, v in columns.items() if k not in points.columns}
+        if existing:
+            points = points.assign(**existing)
+        if new:
+            points = pd.concat([points, pd.DataFrame(new, index=points.index)], axis=1)
+        self.__points = points
 
     def plot(
         self,
@@ -6,6 +6,7 @@ from .kdtree import (
     RadiusOutlierRemovalFilter,
     StatisticalOutlierRemovalFilter,
 )
+from .octree import OctreeBoundingBoxFilter
 from .xyz import BoundingBoxFilter
 
 ALL_FILTERS = {
@@ -14,4 +15,6 @@ ALL_FILTERS = {
     # KDTree
     "ROR": RadiusOutlierRemovalFilter,
     "SOR": StatisticalOutlierRemovalFilter,
+    # Octree
+    "OCTREE_BBOX": OctreeBoundingBoxFilter,
 }
@@ -0,0 +1,66 @@
+import numpy as np
+
+from .base import Filter
+
+
+class OctreeFilter(Filter):
+    def __init__(self, *, pyntcloud, octree_id):
+        """
+        Parameters
+        ----------
+        pyntcloud: pyntcloud.PyntCloud
+        octree_id: pyntcloud.structures.Octree.id
+            Usually returned from PyntCloud.add_structure("octree"):
+            octree_id = my_cloud.add_structure("octree")
+        """
+        super().__init__(pyntcloud=pyntcloud)
+        self.octree_id = octree_id
+
+    def extract_info(self):
+        self.points = self.pyntcloud.xyz
+        self.octree = self.pyntcloud.structures[self.octree_id]
+
+    def compute(self):
+        pass
+
+
+class OctreeBoundingBoxFilter(OctreeFilter):
+    """Compute a bounding box filter using the given Octree.
+
+    Only the points of the octree nodes crossing the box borders are checked,
+    which is faster than BBOX for boxes much smaller than the point cloud.
+
+    Parameters
+    ----------
+    octree_id: pyntcloud.structures.Octree.id
+    min_x, max_x, min_y, max_y, min_z, max_z: float
+        The bounding box limits for each coordinate, included.
+        If some limits are missing, the default values are -infinite
+        for the min_i and infinite for the max_i.
+    """
+
+    def __init__(
+        self,
+        *,
+        pyntcloud,
+        octree_id,
+        min_x=-np.inf,
+        max_x=np.inf,
+        min_y=-np.inf,
+        max_y=np.inf,
+        min_z=-np.inf,
+        max_z=np.inf,
+    ):
+        super().__init__(pyntcloud=pyntcloud, octree_id=octree_id)
+        self.min_x, self.max_x = min_x, max_x
+        self.min_y, self.max_y = min_y, max_y
+        self.min_z, self.max_z = min_z, max_z
+
+    def compute(self):
+        inside = self.octree.query_box(
+            [self.min_x, self.min_y, self.min_z], [self.max_x, self.max_y, self.max_z]
+        )
+        bb_filter = np.zeros(len(self.points), dtype=bool)
+        bb_filter[inside] = True
+
+        return bb_filter
@@ -1,37 +1,57 @@
 from pyntcloud.io.open3d import from_open3d, to_open3d
 from pyntcloud.io.pyvista import from_pyvista, to_pyvista
+from .arrow import read_feather, read_parquet, write_feather, write_parquet
 from .ascii import read_ascii, write_ascii
-from .bin import read_bin, write_bin
-from .las import read_las
+from .bin import iter_bin, read_bin, write_bin
+from .las import iter_las, read_las
+from .metadata import FileInfo as FileInfo
+from .metadata import probe as probe
+from .metadata import probe_directory as probe_directory
 from .npz import read_npz, write_npz
 from .obj import read_obj, write_obj
-from .ply import read_ply, write_ply
+from .ply import iter_ply, read_ply, write_ply
 from .off import read_off
-from .pcd import read_pcd
+from .pcd import iter_pcd, read_pcd, write_pcd
+from .structures import read_structures as read_structures
+from .structures import write_structures as write_structures
 
 FROM_FILE = {
+    "ARROW": read_feather,
     "ASC": read_ascii,
     "BIN": read_bin,
     "CSV": read_ascii,
+    "FEATHER": read_feather,
     "LAS": read_las,
     "LAZ": read_las,
     "NPZ": read_npz,
     "OBJ": read_obj,
     "OFF": read_off,
+    "PARQUET": read_parquet,
     "PCD": read_pcd,
     "PLY": read_ply,
     "PTS": read_ascii,
     "TXT": read_ascii,
     "XYZ": read_ascii,
 }
+ITER_FILE = {
+    "BIN": iter_bin,
+    "LAS": iter_las,
+    "LAZ": iter_las,
+    "PCD": iter_pcd,
+    "PLY": iter_ply,
+}
 FROM_INSTANCE = {"PYVISTA": from_pyvista, "OPEN3D": from_open3d}
 
 TO_FILE = {
+    "ARROW": write_feather,
     "ASC": write_ascii,
     "BIN": write_bin,
     "CSV": write_ascii,
+    "FEATHER": write_feather,
     "NPZ": write_npz,
     "OBJ": write_obj,
+    "PARQUET": write_parquet,
+    "PCD": write_pcd,
     "PLY": write_ply,
     "PTS": write_ascii,
     "TXT": write_ascii,
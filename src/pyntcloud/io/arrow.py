@@ -0,0 +1,295 @@
+import json
+from types import SimpleNamespace
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from ..structures import ALL_STRUCTURES
+from ..utils.dataframe import check_columns, get_xyz
+
+# keys of the schema metadata
+INFO_KEY = b"pyntcloud"
+MESH_KEY = b"pyntcloud.mesh"
+
+
+def check_pyarrow():
+    if pa is None:
+        raise ImportError(
+            "pyarrow is needed for reading and writing .parquet/.feather/.arrow files."
+        )
+
+
+def build_table(points, mesh=None, structures=None, attributes=None):
+    """Build an arrow Table from points, with the rest stored in the schema metadata.
+
+    The mesh is stored as an Arrow IPC stream and the name and parameters of
+    each structure, plus any other attribute, as JSON. The number of points
+    is stored too, so probe_feather doesn't need to read the record batches.
+    """
+    info = {
+        "n_points": len(points),
+        "attributes": attributes or {},
+        "structures": [],
+    }
+    for structure_id, structure in (structures or {}).items():
+        name = next(
+            name for name, cls in ALL_STRUCTURES.items() if type(structure) is cls
+        )
+        info["structures"].append(
+            {"id": structure_id, "name": name, "params": structure.get_params()}
+        )
+    try:
+        metadata = {INFO_KEY: json.dumps(info).encode()}
+    except TypeError as e:
+        raise TypeError(
+            "Only JSON serializable attributes can be saved along with points: {}".format(
+                e
+            )
+        )
+
+    if mesh is not None:
+        mesh_table = pa.Table.from_pandas(mesh, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        options = pa.ipc.IpcWriteOptions(compression="zstd")
+        with pa.ipc.new_stream(sink, mesh_table.schema, options=options) as writer:
+            writer.write_table(mesh_table)
+        metadata[MESH_KEY] = sink.getvalue().to_pybytes()
+
+    table = pa.Table.from_pandas(points, preserve_index=False)
+    return table.replace_schema_metadata({**table.schema.metadata, **metadata})
+
+
+def read_schema_metadata(schema, data, structures=False):
+    """Restore the mesh, attributes and (optionally) structures stored by build_table."""
+    metadata = schema.metadata or {}
+    if MESH_KEY in metadata:
+        data["mesh"] = pa.ipc.open_stream(metadata[MESH_KEY]).read_all().to_pandas()
+
+    info = json.loads(metadata.get(INFO_KEY, b"{}"))
+    data.update(info.get("attributes", {}))
+
+    if structures and info.get("structures"):
+        # extract_info only needs the points and xyz of a PyntCloud
+        cloud = SimpleNamespace(points=data["points"], xyz=get_xyz(data["points"]))
+        data["structures"] = {}
+        for spec in info["structures"]:
+            cls = ALL_STRUCTURES[spec["name"]]
+            structure = cls(**cls.extract_info(cloud), **spec["params"])
+            structure.compute()
+            data["structures"][structure.id] = structure
+    return data
+
+
+def read_parquet(filename, columns=None, row_groups=None, structures=False):
+    """Read a .parquet file written by write_parquet.
+
+    Parameters
+    ----------
+    filename: str
+        Path to the filename
+    columns: list of str, optional
+        Default: None
+        Point columns to be read, all if None.
+    row_groups: list of int, optional
+        Default: None
+        Row groups to be read, all if None.
+    structures: bool, optional
+        Default: False
+        If True, the structures saved along with the points are built again.
+
+    Returns
+    -------
+    data: dict
+        Elements as pandas DataFrames, plus the saved attributes.
+    """
+    check_pyarrow()
+    parquet_file = pq.ParquetFile(filename, memory_map=True)
+    if columns is not None:
+        check_columns(columns, parquet_file.schema_arrow.names)
+    if row_groups is None:
+        table = parquet_file.read(columns=columns)
+    else:
+        table = parquet_file.read_row_groups(row_groups, columns=columns)
+
+    data = {"points": table.to_pandas()}
+    return read_schema_metadata(parquet_file.schema_arrow, data, structures)
+
+
+def write_parquet(
+    filename,
+    points,
+    mesh=None,
+    structures=None,
+    compression="zstd",
+    row_group_size=None,
+    **attributes,
+):
+    """Write points to a .parquet file.
+
+    Parameters
+    ----------
+    filename: str
+        The created file will be named with this
+    points: pandas DataFrame
+    mesh: pandas DataFrame, optional
+        Stored in the file metadata.
+    structures: dict, optional
+        Structure.id to Structure. Only their names and parameters are stored.
+    compression: str, optional
+        Default: "zstd"
+        See pyarrow.parquet.write_table.
+    row_group_size: int, optional
+        Default: None
+        Maximum number of points in each row group.
+    attributes: JSON serializable values stored in the file metadata.
+
+    Returns
+    -------
+    boolean
+        True if no problems
+    """
+    check_pyarrow()
+    table = build_table(points, mesh, structures, attributes)
+    pq.write_table(
+        table, filename, compression=compression, row_group_size=row_group_size
+    )
+    return True
+
+
+def read_feather(
+    filename, columns=None, row_groups=None, memory_map=True, structures=False
+):
+    """Read a .feather/.arrow (Arrow IPC) file written by write_feather.
+
+    Parameters
+    ----------
+    filename: str
+        Path to the filename
+    columns: list of str, optional
+        Default: None
+        Point columns to be read, all if None.
+    row_groups: list of int, optional
+        Default: None
+        Record batches to be read, all if None.
+    memory_map: bool, optional
+        Default: True
+        If True the file is memory mapped, so for uncompressed files only the
+        selected columns and batches are paged in.
+    structures: bool, optional
+        Default: False
+        If True, the structures saved along with the points are built again.
+
+    Returns
+    -------
+    data: dict
+        Elements as pandas DataFrames, plus the saved attributes.
+    """
+    check_pyarrow()
+    source = pa.memory_map(filename) if memory_map else pa.OSFile(filename)
+    reader = pa.ipc.open_file(source)
+    if columns is not None:
+        check_columns(columns, reader.schema.names)
+    if row_groups is None:
+        table = reader.read_all()
+    else:
+        table = pa.Table.from_batches(
+            [reader.get_batch(i) for i in row_groups], schema=reader.schema
+        )
+    if columns is not None:
+        table = table.select(columns)
+
+    data = {"points": table.to_pandas(split_blocks=True)}
+    return read_schema_metadata(reader.schema, data, structures)
+
+
+def write_feather(
+    filename,
+    points,
+    mesh=None,
+    structures=None,
+    compression=None,
+    row_group_size=None,
+    **attributes,
+):
+    """Write points to a .feather/.arrow (Arrow IPC) file.
+
+    Parameters
+    ----------
+    filename: str
+        The created file will be named with this
+    points: pandas DataFrame
+    mesh: pandas DataFrame, optional
+        Stored in the file metadata.
+    structures: dict, optional
+        Structure.id to Structure. Only their names and parameters are stored.
+    compression: {None, "lz4", "zstd"}, optional
+        Default: None
+        Uncompressed files can be memory mapped without copies.
+    row_group_size: int, optional
+        Default: None
+        Maximum number of points in each record batch.
+    attributes: JSON serializable values stored in the file metadata.
+
+    Returns
+    -------
+    boolean
+        True if no problems
+    """
+    check_pyarrow()
+    table = build_table(points, mesh, structures, attributes)
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.ipc.new_file(filename, table.schema, options=options) as writer:
+        writer.write_table(table, max_chunksize=row_group_size)
+    return True
+
+
+def probe_parquet(filename):
+    """Read the number of points and fields of a .parquet file from its footer."""
+    check_pyarrow()
+    parquet_file = pq.ParquetFile(filename)
+    schema = parquet_file.schema_arrow
+    return {
+        "n_points": parquet_file.metadata.num_rows,
+        "n_faces": mesh_size(schema),
+        "fields": {
+            field.name: np.dtype(field.type.to_pandas_dtype()) for field in schema
+        },
+    }
+
+
+def probe_feather(filename):
+    """Read the number of points and fields of a .feather/.arrow file.
+
+    The number of points is read from the schema metadata written by
+    write_feather. Files written otherwise are memory mapped and their record
+    batches counted, which for compressed files means decompressing them.
+    """
+    check_pyarrow()
+    reader = pa.ipc.open_file(pa.memory_map(filename))
+    info = json.loads((reader.schema.metadata or {}).get(INFO_KEY, b"{}"))
+    n_points = info.get("n_points")
+    if n_points is None:
+        n_points = sum(
+            reader.get_batch(i).num_rows for i in range(reader.num_record_batches)
+        )
+    return {
+        "n_points": n_points,
+        "n_faces": mesh_size(reader.schema),
+        "fields": {
+            field.name: np.dtype(field.type.to_pandas_dtype())
+            for field in reader.schema
+        },
+    }
+
+
+def mesh_size(schema):
+    metadata = schema.metadata or {}
+    if MESH_KEY not in metadata:
+        return 0
+    return pa.ipc.open_stream(metadata[MESH_KEY]).read_all().num_rows
@@ -2,11 +2,15 @@
 
 # Contributed by: Nicholas Mitchell
 
+import os
+
 import numpy as np
 import pandas as pd
 
+from ..utils.dataframe import check_columns
+
 
-def read_bin(filename, shape=None, **kwargs):
+def read_bin(filename, shape=None, columns=None, **kwargs):
     """Read a _raw binary_ file and store all possible elements in pandas DataFrame.
 
     If the shape of the array is known, it can be specified using `shape`. The
@@ -23,6 +27,10 @@ def read_bin(filename, shape=None, **kwargs):
     filename: str
         Path to the filename
     shape: (n_rows, n_cols) - shape to be formed from the loaded binary array, optional.
+    columns: list of str, optional
+        Default: None
+        Subset of x, y and z to be read. For raw binary files the file is memory
+        mapped and only the selected columns are copied.
     **kwargs:
     kwargs: numpy.fromfile supported kwargs
         Check NumPy documentation for all possibilities.
@@ -35,7 +43,17 @@ def read_bin(filename, shape=None, **kwargs):
     data = {}
 
     kwargs["dtype"] = kwargs.get("dtype", np.float32)
-    arr = np.fromfile(filename, **kwargs)
+    if columns is not None:
+        check_columns(columns, ["x", "y", "z"])
+    if columns is not None and not kwargs.get("sep"):
+        arr = np.memmap(
+            filename, dtype=kwargs["dtype"], mode="r", offset=kwargs.get("offset", 0)
+        )
+        count = kwargs.get("count", -1)
+        if count >= 0:
+            arr = arr[:count]
+    else:
+        arr = np.fromfile(filename, **kwargs)
 
     if shape is not None:
         try:
@@ -51,11 +69,78 @@ def read_bin(filename, shape=None, **kwargs):
     else:
         arr = arr.reshape((-1, 3))
 
-    data["points"] = pd.DataFrame(arr[:, 0:3], columns=["x", "y", "z"])
+    if columns is None:
+        data["points"] = pd.DataFrame(arr[:, 0:3], columns=["x", "y", "z"])
+    else:
+        data["points"] = pd.DataFrame(
+            {name: np.array(arr[:, "xyz".index(name)]) for name in columns}
+        )
 
     return data
 
 
+def iter_bin(filename, chunk_size=1000000, shape=None, dtype=np.float32):
+    """Iterate over the points of a _raw binary_ file in chunks.
+
+    The file is assumed to have row-major format, as in `read_bin`.
+
+    Parameters
+    ----------
+    filename: str
+        Path to the filename
+    chunk_size: int, optional
+        Default: 1000000
+        Maximum number of points in each chunk.
+    shape: (n_rows, n_cols) - shape of the stored array, optional.
+        Only n_cols is used. If None, three columns are assumed.
+    dtype: numpy dtype, optional
+        Default: np.float32
+
+    Yields
+    ------
+    points: pandas DataFrame
+        Up to chunk_size points, indexed by their position in the file.
+    """
+    n_cols = 3 if shape is None else shape[1]
+    start = 0
+    with open(filename, "rb") as f:
+        while True:
+            arr = np.fromfile(f, dtype=dtype, count=chunk_size * n_cols)
+            if arr.size == 0:
+                break
+            arr = arr.reshape((-1, n_cols))
+            points = pd.DataFrame(arr[:, 0:3], columns=["x", "y", "z"])
+            points.index = pd.RangeIndex(start, start + len(arr))
+            start += len(arr)
+            yield points
+
+
+def probe_bin(filename, shape=None, dtype=np.float32):
+    """Compute the number of points of a _raw binary_ file from its size.
+
+    Parameters
+    ----------
+    filename: str
+        Path to the filename
+    shape: (n_rows, n_cols) - shape of the stored array, optional.
+        Only n_cols is used. If None, three columns are assumed.
+    dtype: numpy dtype, optional
+        Default: np.float32
+
+    Returns
+    -------
+    info: dict
+        n_points, n_faces and fields (x, y, z to numpy dtype).
+    """
+    n_cols = 3 if shape is None else shape[1]
+    n_points = os.path.getsize(filename) // (np.dtype(dtype).itemsize * n_cols)
+    return {
+        "n_points": n_points,
+        "n_faces": 0,
+        "fields": {name: np.dtype(dtype) for name in ("x", "y", "z")},
+    }
+
+
 def write_bin(filename, **kwargs):
     """Write the raw point data in `PyntCloud.xyz` to a binary file.
 
@@ -10,16 +10,20 @@ except ImportError:
     pylas = None
 import pandas as pd
 
+from ..utils.dataframe import check_columns
+
 
 def convert_location_to_dtype(data, dtype_str):
     data["points"] = data["points"].astype(
-        {"x": dtype_str, "y": dtype_str, "z": dtype_str}
+        {name: dtype_str for name in ("x", "y", "z") if name in data["points"]}
     )
     return data
 
 
 def get_color_dtype(data, column_names):
-    has_color = all(column in data["points"] for column in column_names)
+    has_color = bool(column_names) and all(
+        column in data["points"] for column in column_names
+    )
     if has_color:
         color_data_types = [
             data["points"][column_name].dtype for column_name in column_names
@@ -34,7 +38,14 @@ def get_color_dtype(data, column_names):
     return color_data_type
 
 
-def convert_color_to_dtype(data, output_dtype):
+def convert_color_to_dtype(data, output_dtype, scale=None):
+    """Convert the color columns of data["points"] to output_dtype.
+
+    scale: bool, optional
+        Default: None
+        Whether uint16 colors are divided by 256 when converted to uint8.
+        If None, they are only if some value is above 255.
+    """
     # From the LAS specification (https://portal.ogc.org/files/17-030r1):
     #   NOTE: Red, Green, Blue values should always be normalized to
     #   16 bit values. For example, when encoding an 8 bit per channel
@@ -42,7 +53,10 @@ def convert_color_to_dtype(data, output_dtype):
     #   fields. This normalization allows color values from different camera
     #   bit depths to be accurately merged.
     assert output_dtype in ["uint8", "uint16"]
-    column_names = ["red", "green", "blue"]
+    # only some of the channels may have been read
+    column_names = [
+        column for column in ("red", "green", "blue") if column in data["points"]
+    ]
     input_dtype = get_color_dtype(data, column_names)
     if input_dtype is not None:
         # Color information in las/laz files is stored as uint8 or uint16
@@ -50,37 +64,122 @@ def convert_color_to_dtype(data, output_dtype):
             raise ValueError(
                 f"Invalid color dtype. Expected one of ['uint8', 'uint16'], but got {input_dtype}"
             )
+        colors = data["points"][column_names]
+        # scaled values are assigned, since the columns can't hold them in place
         if input_dtype == "uint8" and output_dtype == "uint16":
-            data["points"].loc[:, column_names] *= 256
+            data["points"] = data["points"].assign(**(colors.astype("uint16") * 256))
         elif input_dtype == "uint16" and output_dtype == "uint8":
-            column_max_values = data["points"].loc[:, column_names].max()
-            # Do not scale color values restricted to [0, 255]
-            if column_max_values.to_numpy().max() >= 256:
-                data["points"].loc[:, column_names] /= 256
+            if scale is None:
+                # Do not scale color values restricted to [0, 255]
+                scale = colors.to_numpy().max(initial=0) >= 256
+            if scale:
+                data["points"] = data["points"].assign(**(colors // 256))
         data["points"] = data["points"].astype(
-            {"red": output_dtype, "green": output_dtype, "blue": output_dtype}
+            {column: output_dtype for column in column_names}
         )
     return data
 
 
-def read_las_with_laspy(filename):
+def laspy_points_to_dataframe(points, columns=None):
+    """Build a DataFrame from a laspy ScaleAwarePointRecord.
+
+    Only the fields in columns (lowercase dimension names) are copied, all if None.
+    x, y and z hold the scaled coordinates.
+    """
+    names = {name.lower(): name for name in points.array.dtype.names}
+    if columns is None:
+        columns = list(names)
+    df = {}
+    for name in columns:
+        if name in ("x", "y", "z"):
+            df[name] = np.array(getattr(points, name))
+        else:
+            df[name] = np.array(points.array[names[name]])
+    return pd.DataFrame(df, copy=False)
+
+
+def raw_bbox(header, bbox):
+    """Convert bbox into inclusive bounds on the raw integer X, Y, Z of a las file.
+
+    Parameters
+    ----------
+    header: laspy.LasHeader
+    bbox: (xmin, ymin, xmax, ymax) or (xmin, ymin, zmin, xmax, ymax, zmax)
+
+    Returns
+    -------
+    lower, upper: int ndarray
+        Raw bounds for X, Y (and Z).
+    """
+    bbox = np.asarray(bbox, dtype=np.float64)
+    if bbox.shape not in ((4,), (6,)):
+        raise ValueError(
+            "bbox must be (xmin, ymin, xmax, ymax) or "
+            "(xmin, ymin, zmin, xmax, ymax, zmax), got {}".format(bbox)
+        )
+    n_dims = len(bbox) // 2
+    scales = header.scales[:n_dims]
+    offsets = header.offsets[:n_dims]
+    lower = np.ceil((bbox[:n_dims] - offsets) / scales).astype(np.int64)
+    upper = np.floor((bbox[n_dims:] - offsets) / scales).astype(np.int64)
+    return lower, upper
+
+
+def bbox_intersects_header(header, bbox):
+    """Whether bbox intersects the bounds stored in the header."""
+    n_dims = len(bbox) // 2
+    return np.all(np.asarray(bbox[:n_dims]) <= header.maxs[:n_dims]) and np.all(
+        np.asarray(bbox[n_dims:]) >= header.mins[:n_dims]
+    )
+
+
+def crop_las_points(points, lower, upper):
+    """Keep the points of a laspy record whose raw coordinates are within bounds."""
+    mask = np.ones(len(points), dtype=bool)
+    for name, lo, hi in zip(("X", "Y", "Z"), lower, upper):
+        raw = points.array[name]
+        mask &= (raw >= lo) & (raw <= hi)
+    return points[mask]
+
+
+def read_las_with_laspy(filename, columns=None, bbox=None, chunk_size=1000000):
     if laspy is None:
         raise ImportError("laspy (>=2.0) is needed for reading .las files.")
     data = {}
     with laspy.open(filename) as las_file:
-        las = las_file.read()
-        data["points"] = pd.DataFrame(las.points.array)
-        data["points"].columns = (name.lower() for name in data["points"].columns)
+        if columns is None and bbox is None:
+            las = las_file.read()
+            data["points"] = laspy_points_to_dataframe(las.points)
+            data["las_header"] = las.header
+            return data
 
-        data["points"]["x"] = pd.Series(np.array(las.x))
-        data["points"]["y"] = pd.Series(np.array(las.y))
-        data["points"]["z"] = pd.Series(np.array(las.z))
+        header = las_file.header
+        data["las_header"] = header
 
-        data["las_header"] = las.header
+        if columns is not None:
+            point_dtype = header.point_format.dtype()
+            check_columns(columns, [name.lower() for name in point_dtype.names])
+
+        chunks = []
+        if bbox is not None:
+            lower, upper = raw_bbox(header, bbox)
+        if bbox is None or bbox_intersects_header(header, bbox):
+            # read in chunks so only the selected points and columns are kept
+            for las_points in las_file.chunk_iterator(chunk_size):
+                if bbox is not None:
+                    las_points = crop_las_points(las_points, lower, upper)
+                chunks.append(laspy_points_to_dataframe(las_points, columns))
+
+        if chunks:
+            data["points"] = pd.concat(chunks, ignore_index=True)
+        else:
+            data["points"] = laspy_points_to_dataframe(
+                laspy.ScaleAwarePointRecord.zeros(0, header=header), columns
+            )
     return data
 
 
-def read_las_with_pylas(filename):
+def read_las_with_pylas(filename, columns=None, bbox=None):
     data = {}
     if pylas is None:
         raise ImportError("pylas is needed for reading .las files.")
@@ -94,10 +193,28 @@ def read_las_with_pylas(filename):
         data["points"]["z"] = pd.Series(np.array(las.z))
 
         data["las_header"] = las.header
+
+    if bbox is not None:
+        n_dims = len(bbox) // 2
+        mask = np.ones(len(data["points"]), dtype=bool)
+        for name, lo, hi in zip("xyz", bbox[:n_dims], bbox[n_dims:]):
+            mask &= data["points"][name].between(lo, hi).values
+        data["points"] = data["points"][mask].reset_index(drop=True)
+
+    if columns is not None:
+        check_columns(columns, data["points"].columns)
+        data["points"] = data["points"][columns]
     return data
 
 
-def read_las(filename, xyz_dtype="float32", rgb_dtype="uint8", backend="laspy"):
+def read_las(
+    filename,
+    xyz_dtype="float32",
+    rgb_dtype="uint8",
+    backend="laspy",
+    columns=None,
+    bbox=None,
+):
     """Read a .las/laz file and store elements in pandas DataFrame.
 
     Parameters
@@ -108,15 +225,26 @@ def read_las(filename, xyz_dtype="float32", rgb_dtype="uint8", backend="laspy"):
         Defines the data type of the xyz coordinate
     rgb_dtype: str
         Defines the data type of the color
+    columns: list of str, optional
+        Default: None
+        Point dimensions (lowercase) to be read, all if None.
+        With laspy, points are decoded in chunks and only the selected
+        dimensions are kept.
+    bbox: (xmin, ymin, xmax, ymax) or (xmin, ymin, zmin, xmax, ymax, zmax), optional
+        Default: None
+        Only the points inside this box (bounds included) are kept.
+        With laspy, each chunk is filtered on the raw integer coordinates before
+        they are scaled, and files whose header bounds don't intersect the box
+        are not read at all.
     Returns
     -------
     data: dict
         Elements as pandas DataFrames.
     """
     if backend == "pylas":
-        data = read_las_with_pylas(filename)
+        data = read_las_with_pylas(filename, columns=columns, bbox=bbox)
     elif backend == "laspy":
-        data = read_las_with_laspy(filename)
+        data = read_las_with_laspy(filename, columns=columns, bbox=bbox)
     else:
         raise ValueError(
             f"Unsupported backend. Expected one of ['pylas', 'laspy'] but got {backend}"
@@ -124,3 +252,112 @@ def read_las(filename, xyz_dtype="float32", rgb_dtype="uint8", backend="laspy"):
     data = convert_location_to_dtype(data, xyz_dtype)
     data = convert_color_to_dtype(data, rgb_dtype)
     return data
+
+
+def probe_las(filename):
+    """Read the number of points, dimensions and bounds of a .las/laz file from its header.
+
+    Parameters
+    ----------
+    filename: str
+        Path to the filename
+
+    Returns
+    -------
+    info: dict
+        n_points, n_faces, fields (lowercase dimension name to numpy dtype, with
+        x, y and z as the scaled float64 coordinates) and bounds
+        (xmin, ymin, zmin, xmax, ymax, zmax).
+    """
+    if laspy is None:
+        raise ImportError("laspy (>=2.0) is needed for reading .las files.")
+    with laspy.open(filename) as las_file:
+        header = las_file.header
+        point_dtype = header.point_format.dtype()
+        fields = {
+            name.lower(): (
+                np.dtype(np.float64) if name in ("X", "Y", "Z") else point_dtype[name]
+            )
+            for name in point_dtype.names
+        }
+        return {
+            "n_points": header.point_count,
+            "n_faces": 0,
+            "fields": fields,
+            "bounds": tuple(float(v) for v in header.mins)
+            + tuple(float(v) for v in header.maxs),
+        }
+
+
+def iter_las(
+    filename, chunk_size=1000000, xyz_dtype="float32", rgb_dtype="uint8", bbox=None
+):
+    """Iterate over the points of a .las/laz file in chunks.
+
+    Uses laspy's chunk iterator, so only one chunk is decompressed at a time.
+
+    Parameters
+    ----------
+    filename: str
+        Path to the filename
+    chunk_size: int, optional
+        Default: 1000000
+        Maximum number of points in each chunk.
+    xyz_dtype: str
+        Defines the data type of the xyz coordinate
+    rgb_dtype: str
+        Defines the data type of the color.
+        As in read_las, uint16 colors are only scaled to uint8 if some value
+        of the file (inside bbox) is above 255. Deciding it takes a first
+        pass over the file, which stops at the first such value.
+    bbox: (xmin, ymin, xmax, ymax) or (xmin, ymin, zmin, xmax, ymax, zmax), optional
+        Default: None
+        Only the points inside this box (bounds included) are yielded.
+
+    Yields
+    ------
+    points: pandas DataFrame
+        Up to chunk_size points, indexed by their position in the file.
+        When bbox is used, chunks are indexed by their position among the
+        selected points.
+    """
+    if laspy is None:
+        raise ImportError("laspy (>=2.0) is needed for reading .las files.")
+    scale = None
+    if rgb_dtype == "uint8":
+        scale = has_colors_above_255(filename, chunk_size, bbox)
+    start = 0
+    for las_points in iter_las_points(filename, chunk_size, bbox):
+        data = {"points": laspy_points_to_dataframe(las_points)}
+        data = convert_location_to_dtype(data, xyz_dtype)
+        data = convert_color_to_dtype(data, rgb_dtype, scale=scale)
+        points = data["points"]
+        points.index = pd.RangeIndex(start, start + len(points))
+        start += len(points)
+        yield points
+
+
+def iter_las_points(filename, chunk_size, bbox=None):
+    """Iterate over the laspy point records of a .las/laz file, cropped to bbox."""
+    with laspy.open(filename) as las_file:
+        if bbox is not None:
+            lower, upper = raw_bbox(las_file.header, bbox)
+            if not bbox_intersects_header(las_file.header, bbox):
+                return
+        for las_points in las_file.chunk_iterator(chunk_size):
+            if bbox is not None:
+                las_points = crop_las_points(las_points, lower, upper)
+            yield las_points
+
+
+def has_colors_above_255(filename, chunk_size, bbox=None):
+    """Whether any red, green or blue value of the file (inside bbox) is above 255."""
+    with laspy.open(filename) as las_file:
+        dimensions = set(las_file.header.point_format.dimension_names)
+    channels = [name for name in ("red", "green", "blue") if name in dimensions]
+    if not channels:
+        return False
+    for las_points in iter_las_points(filename, chunk_size, bbox):
+        if any(las_points.array[name].max(initial=0) > 255 for name in channels):
+            return True
+    return False
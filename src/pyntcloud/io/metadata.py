@@ -0,0 +1,131 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+
+from .arrow import probe_feather, probe_parquet
+from .bin import probe_bin
+from .las import probe_las
+from .npz import probe_npz
+from .off import probe_off
+from .pcd import probe_pcd
+from .ply import probe_ply
+
+PROBE_FILE = {
+    "ARROW": probe_feather,
+    "BIN": probe_bin,
+    "FEATHER": probe_feather,
+    "LAS": probe_las,
+    "LAZ": probe_las,
+    "NPZ": probe_npz,
+    "OFF": probe_off,
+    "PARQUET": probe_parquet,
+    "PCD": probe_pcd,
+    "PLY": probe_ply,
+}
+
+FileInfo = namedtuple(
+    "FileInfo", ["filename", "format", "n_points", "n_faces", "fields", "bounds"]
+)
+FileInfo.__doc__ = """Metadata of a point cloud file, read from its header.
+
+filename: str
+format: str
+    Upper case extension of the file.
+n_points: int
+n_faces: int
+fields: dict
+    Point field name to numpy dtype.
+bounds: tuple of float or None
+    (xmin, ymin, zmin, xmax, ymax, zmax), if stored in the header.
+"""
+
+
+def probe(filename, **kwargs):
+    """Read the metadata of a point cloud file without reading its data.
+
+    Parameters
+    ----------
+    filename: str
+        Path to the file.
+
+    kwargs: only usable in some formats
+
+    Returns
+    -------
+    info: FileInfo
+    """
+    filename = str(filename)
+    ext = filename.split(".")[-1].upper()
+    if ext not in PROBE_FILE:
+        raise ValueError(
+            "Unsupported file format; supported formats are: {}".format(
+                list(PROBE_FILE)
+            )
+        )
+    info = PROBE_FILE[ext](filename, **kwargs)
+    return FileInfo(
+        filename=filename,
+        format=ext,
+        n_points=int(info["n_points"]),
+        n_faces=int(info["n_faces"]),
+        fields=info["fields"],
+        bounds=info.get("bounds"),
+    )
+
+
+def probe_directory(
+    path, pattern="*", recursive=False, max_workers=None, skip_errors=False, **kwargs
+):
+    """Probe every supported file in a directory, in parallel.
+
+    Parameters
+    ----------
+    path: str
+        Directory to be scanned.
+
+    pattern: str, optional
+        Default: "*"
+        Only file names matching this glob pattern are probed.
+
+    recursive: bool, optional
+        Default: False
+        If True, subdirectories are scanned too.
+
+    max_workers: int, optional
+        Default: None
+        Number of threads used to read the headers.
+        See concurrent.futures.ThreadPoolExecutor.
+
+    skip_errors: bool, optional
+        Default: False
+        If True, files whose header can't be read are left out of the result
+        instead of raising.
+
+    kwargs: passed to probe
+
+    Returns
+    -------
+    infos: list of FileInfo
+        Sorted by filename.
+    """
+    filenames = []
+    for root, dirs, files in os.walk(str(path)):
+        for name in files:
+            ext = name.split(".")[-1].upper()
+            if ext in PROBE_FILE and fnmatch(name, pattern):
+                filenames.append(os.path.join(root, name))
+        if not recursive:
+            break
+
+    def probe_file(filename):
+        try:
+            return probe(filename, **kwargs)
+        except Exception:
+            if skip_errors:
+                return None
+            raise
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        infos = executor.map(probe_file, sorted(filenames))
+        return [info for info in infos if info is not None]
@@ -1,15 +1,22 @@
 #       HAKUNA MATATA
 
+import zipfile
+
 import numpy as np
 import pandas as pd
 
+from ..utils.dataframe import check_columns
+
 
-def read_npz(filename, points_name="points", mesh_name="mesh"):
+def read_npz(filename, points_name="points", mesh_name="mesh", columns=None):
     """Read a .npz file and store all possible elements in pandas DataFrame
     Parameters
     ----------
     filename: str
         Path to the filename
+    columns: list of str, optional
+        Default: None
+        Fields of the points array to be kept, all if None.
     Returns
     -------
     data: dict
@@ -18,12 +25,55 @@ def read_npz(filename, points_name="points", mesh_name="mesh"):
 
     data = {}
     with np.load(filename) as npz:
-        data["points"] = pd.DataFrame(npz[points_name])
+        points = npz[points_name]
+        if columns is None:
+            data["points"] = pd.DataFrame(points)
+        else:
+            check_columns(columns, points.dtype.names or ())
+            # copy only the selected fields so the rest can be released
+            data["points"] = pd.DataFrame({name: points[name] for name in columns})
+            del points
         if mesh_name in npz:
             data["mesh"] = pd.DataFrame(npz[mesh_name])
     return data
 
 
+def read_npy_header(npz, name):
+    """Return the shape and dtype of the array name stored in an opened .npz file."""
+    with npz.open(name + ".npy") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, _, dtype = np.lib.format.read_array_header_2_0(f)
+    return shape, dtype
+
+
+def probe_npz(filename, points_name="points", mesh_name="mesh"):
+    """Read the number of points and faces of a .npz file from the array headers.
+
+    Parameters
+    ----------
+    filename: str
+        Path to the filename
+
+    Returns
+    -------
+    info: dict
+        n_points, n_faces and fields (field name to numpy dtype).
+    """
+    with zipfile.ZipFile(filename) as npz:
+        shape, dtype = read_npy_header(npz, points_name)
+        n_faces = 0
+        if mesh_name + ".npy" in npz.namelist():
+            n_faces = read_npy_header(npz, mesh_name)[0][0]
+    if dtype.names is not None:
+        fields = {name: dtype[name] for name in dtype.names}
+    else:
+        fields = {i: dtype for i in range(shape[1] if len(shape) > 1 else 1)}
+    return {"n_points": shape[0], "n_faces": n_faces, "fields": fields}
+
+
 def write_npz(filename, **kwargs):
     """
     Parameters
@@ -1,12 +1,133 @@
 #       HAKUNA MATATA
 
-import re
+import numpy as np
 import pandas as pd
 
 
+def classify_lines(data):
+    """Find the lines of each element of an obj file.
+
+    Parameters
+    ----------
+    data: bytes
+        Content of the file.
+
+    Returns
+    -------
+    starts: (N + 1,) int ndarray
+        Offset of each line in data, followed by len(data).
+    tags: dict
+        Boolean mask over the lines for each of "v", "vn", "vt" and "f".
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    starts = np.concatenate([[0], np.flatnonzero(buf == ord("\n")) + 1])
+    if starts[-1] != len(data):
+        starts = np.append(starts, len(data))
+    # first three characters of each line, padded for the last lines
+    padded = np.frombuffer(data + b"\n\n\n", dtype=np.uint8)
+    line_starts = starts[:-1]
+    c0, c1, c2 = (padded[line_starts + i] for i in range(3))
+
+    def is_space(c):
+        return (c == ord(" ")) | (c == ord("\t"))
+
+    tags = {
+        "v": (c0 == ord("v")) & is_space(c1),
+        "vn": (c0 == ord("v")) & (c1 == ord("n")) & is_space(c2),
+        "vt": (c0 == ord("v")) & (c1 == ord("t")) & is_space(c2),
+        "f": (c0 == ord("f")) & is_space(c1),
+    }
+    return starts, tags
+
+
+def element_bytes(data, starts, mask, tag):
+    """Concatenate the lines selected by mask, with their tag blanked out."""
+    lines = np.flatnonzero(mask)
+    # copy consecutive lines of the element at once
+    breaks = np.flatnonzero(np.diff(lines) != 1) + 1
+    firsts = lines[np.concatenate([[0], breaks])]
+    lasts = lines[np.concatenate([breaks - 1, [len(lines) - 1]])]
+    chunk = b"".join(
+        data[starts[first] : starts[last + 1]] for first, last in zip(firsts, lasts)
+    )
+    return strip_comments(chunk).replace(tag.encode(), b" " * len(tag))
+
+
+def strip_comments(chunk):
+    """Blank out everything from a # to the end of its line."""
+    if b"#" not in chunk:
+        return chunk
+    buf = np.frombuffer(chunk, dtype=np.uint8).copy()
+    is_newline = buf == ord("\n")
+    n_hashes = np.cumsum(buf == ord("#"))
+    # number of # before the start of each position's line
+    last_newline = np.maximum.accumulate(np.where(is_newline, np.arange(len(buf)), -1))
+    before_line = np.where(last_newline >= 0, n_hashes[last_newline], 0)
+    buf[(n_hashes > before_line) & ~is_newline] = ord(" ")
+    return buf.tobytes()
+
+
+def first_line_n_cols(data, starts, mask):
+    """Number of values, after the tag, in the first line selected by mask."""
+    first = np.argmax(mask)
+    return len(strip_comments(data[starts[first] : starts[first + 1]]).split()) - 1
+
+
+def parse_numbers(chunk, dtype, n_cols, n_lines):
+    """Parse n_lines holding n_cols numbers each with numpy's C parser."""
+    if np.any(count_tokens(chunk, n_lines) != n_cols):
+        raise ValueError(
+            "All the lines of an element must have {} values".format(n_cols)
+        )
+    values = np.fromstring(chunk, dtype=dtype, sep=" ")
+    return values.reshape(-1, n_cols)
+
+
+def count_tokens(chunk, n_lines):
+    """Number of whitespace separated tokens in each of the n_lines of chunk."""
+    buf = np.frombuffer(chunk, dtype=np.uint8)
+    is_newline = buf == ord("\n")
+    is_space = (buf <= ord(" ")) | is_newline
+    starts = ~is_space
+    starts[1:] &= is_space[:-1]
+    line_id = np.cumsum(is_newline)
+    return np.bincount(line_id[starts], minlength=n_lines)[:n_lines]
+
+
+def fan_triangulate(counts):
+    """Indices of the vertices of each triangle of faces with counts vertices.
+
+    Faces are split in a fan around their first vertex.
+
+    Parameters
+    ----------
+    counts: (N,) int ndarray
+        Number of vertices of each face.
+
+    Returns
+    -------
+    triangles: (T, 3) int ndarray
+        Positions, in the flattened vertices of all faces, of each triangle.
+    """
+    first = np.cumsum(counts) - counts
+    n_triangles = counts - 2
+    face = np.repeat(np.arange(len(counts)), n_triangles)
+    # position of each triangle within its face
+    local = np.arange(len(face)) - np.repeat(
+        np.cumsum(n_triangles) - n_triangles, n_triangles
+    )
+    a = first[face]
+    b = a + local + 1
+    return np.stack([a, b, b + 1], axis=1)
+
+
 def read_obj(filename):
     """Reads and obj file and return the elements as pandas Dataframes.
 
+    Lines are classified in bulk and the lines of each element are parsed at
+    once with numpy's C parser. Faces with more than 3 vertices are
+    fan-triangulated.
+
     Parameters
     ----------
     filename: str
@@ -17,66 +138,68 @@ def read_obj(filename):
     Each obj element found as pandas Dataframe.
 
     """
-    v = []
-    vn = []
-    vt = []
-    f = []
+    with open(filename, "rb") as obj:
+        content = obj.read()
 
-    with open(filename) as obj:
-        for line in obj:
-            if line.startswith("v "):
-                v.append(line.strip()[1:].split())
+    starts, tags = classify_lines(content)
 
-            elif line.startswith("vn"):
-                vn.append(line.strip()[2:].split())
-
-            elif line.startswith("vt"):
-                vt.append(line.strip()[2:].split())
-
-            elif line.startswith("f"):
-                f.append(line.strip()[1:].lstrip())
-
-    points = pd.DataFrame(v, dtype="f4", columns=["x", "y", "z", "w"][: len(v[0])])
-
-    if len(vn) > 0:
-        points = points.join(pd.DataFrame(vn, dtype="f4", columns=["nx", "ny", "nz"]))
+    n_cols = first_line_n_cols(content, starts, tags["v"])
+    v = element_bytes(content, starts, tags["v"], "v")
+    points = pd.DataFrame(
+        parse_numbers(v, "f4", n_cols, int(tags["v"].sum())),
+        columns=["x", "y", "z", "w"][:n_cols],
+    )
 
-    if len(vt) > 0:
-        points = points.join(pd.DataFrame(vt, dtype="f4", columns=["u", "v"]))
+    for tag, columns in [("vn", ["nx", "ny", "nz"]), ("vt", ["u", "v", "w"])]:
+        if tags[tag].any():
+            n_cols = first_line_n_cols(content, starts, tags[tag])
+            values = parse_numbers(
+                element_bytes(content, starts, tags[tag], tag),
+                "f4",
+                n_cols,
+                int(tags[tag].sum()),
+            )
+            points = points.join(pd.DataFrame(values, columns=columns[:n_cols]))
 
     data = {"points": points}
 
-    if len(f) < 1:
+    n_faces = int(tags["f"].sum())
+    if n_faces < 1:
         return data
 
-    mesh_columns = []
-    if f[0].count("//") > 0:
+    first_f = np.argmax(tags["f"])
+    first_vertex = strip_comments(
+        content[starts[first_f] : starts[first_f + 1]]
+    ).split()[1]
+    if b"//" in first_vertex:
         # wikipedia.org/wiki/Wavefront_.obj_file#Vertex_normal_indices_without_texture_coordinate_indices
-        for i in range(f[0].count("//")):
-            mesh_columns.append("v{}".format(i + 1))
-            mesh_columns.append("vn{}".format(i + 1))
-    elif f[0].count("/") > 0:
-        if len(vn) > 0:
-            # wikipedia.org/wiki/Wavefront_.obj_file#Vertex_normal_indices
-            for i in range(f[0].count("/") // 2):
-                mesh_columns.append("v{}".format(i + 1))
-                mesh_columns.append("vt{}".format(i + 1))
-                mesh_columns.append("vn{}".format(i + 1))
-        else:
-            # wikipedia.org/wiki/Wavefront_.obj_file#Vertex_texture_coordinate_indices
-            for i in range(f[0].count("/")):
-                mesh_columns.append("v{}".format(i + 1))
-                mesh_columns.append("vt{}".format(i + 1))
+        names = ["v", "vn"]
+    elif first_vertex.count(b"/") == 2:
+        # wikipedia.org/wiki/Wavefront_.obj_file#Vertex_normal_indices
+        names = ["v", "vt", "vn"]
+    elif first_vertex.count(b"/") == 1:
+        # wikipedia.org/wiki/Wavefront_.obj_file#Vertex_texture_coordinate_indices
+        names = ["v", "vt"]
     else:
         # wikipedia.org/wiki/Wavefront_.obj_file#Vertex_indices
-        for i in range(sum(c.isdigit() for c in f[0].split(" "))):
-            mesh_columns.append("v{}".format(i + 1))
+        names = ["v"]
 
-    # trying to coerce type to integer throws error, casted after passes tests
-    mesh = pd.DataFrame([re.split(r"\D+", x) for x in f], columns=mesh_columns).astype(
-        "i4"
+    f = element_bytes(content, starts, tags["f"], "f")
+    # every face vertex becomes len(names) integers once the slashes are removed
+    indices = np.fromstring(f.replace(b"/", b" "), dtype=np.int64, sep=" ").reshape(
+        -1, len(names)
     )
-    mesh -= 1  # index starts with 1 in obj file
+
+    # faces have at least 3 vertices, so this only holds when all are triangles
+    if len(indices) == 3 * n_faces:
+        triangles = indices.reshape(n_faces, -1)
+    else:
+        counts = count_tokens(f, n_faces)
+        triangles = indices[fan_triangulate(counts)].reshape(-1, 3 * len(names))
+
+    mesh_columns = ["{}{}".format(name, i + 1) for i in range(3) for name in names]
+    # index starts with 1 in obj file
+    mesh = pd.DataFrame(triangles.astype("i4") - 1, columns=mesh_columns)
 
     data["mesh"] = mesh
 
@@ -2,39 +2,60 @@ import pandas as pd
 import numpy as np
 
 
+def read_off_header(off):
+    """Parse the header of an opened .off file.
+
+    The file is left positioned after the counts line.
+
+    Returns
+    -------
+    color: bool
+    n_points: int
+    n_faces: int
+    count: int
+        Number of header lines.
+    """
+    first_line = off.readline()
+    if "OFF" not in first_line:
+        raise ValueError("The file does not start with the word OFF")
+    color = True if "C" in first_line else False
+
+    n_points = 0
+    n_faces = 0
+
+    count = 1
+    for line in off:
+        count += 1
+        if line.startswith("#"):
+            continue
+        line = line.strip().split()
+        if len(line) > 1:
+            n_points = int(line[0])
+            n_faces = int(line[1])
+            break
+
+    return color, n_points, n_faces, count
+
+
+def point_dtypes(color):
+    point_types = {"x": np.float32, "y": np.float32, "z": np.float32}
+    if color:
+        point_types = dict(
+            point_types, **{"red": np.uint8, "green": np.uint8, "blue": np.uint8}
+        )
+    return point_types
+
+
 def read_off(filename):
     with open(filename) as off:
-        first_line = off.readline()
-        if "OFF" not in first_line:
-            raise ValueError("The file does not start with the word OFF")
-        color = True if "C" in first_line else False
-
-        n_points = 0
-        n_faces = 0
-
-        count = 1
-        for line in off:
-            count += 1
-            if line.startswith("#"):
-                continue
-            line = line.strip().split()
-            if len(line) > 1:
-                n_points = int(line[0])
-                n_faces = int(line[1])
-                break
+        color, n_points, n_faces, count = read_off_header(off)
 
         if n_points == 0:
             raise ValueError("The file has no points")
 
         data = {}
-        point_names = ["x", "y", "z"]
-        point_types = {"x": np.float32, "y": np.float32, "z": np.float32}
-
-        if color:
-            point_names.extend(["red", "green", "blue"])
-            point_types = dict(
-                point_types, **{"red": np.uint8, "green": np.uint8, "blue": np.uint8}
-            )
+        point_types = point_dtypes(color)
+        point_names = list(point_types)
 
         data["points"] = pd.read_csv(
             off,
@@ -60,3 +81,14 @@ def read_off(filename):
             comment="#",
         )
         return data
+
+
+def probe_off(filename):
+    """Read the point and face counts of a .off file from its header."""
+    with open(filename) as off:
+        color, n_points, n_faces, _ = read_off_header(off)
+    return {
+        "n_points": n_points,
+        "n_faces": n_faces,
+        "fields": {name: np.dtype(dt) for name, dt in point_dtypes(color).items()},
+    }
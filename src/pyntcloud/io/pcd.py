@@ -1,9 +1,22 @@
 import re
+import struct
 import warnings
 
 import numpy as np
 import pandas as pd
 
+from ..utils.dataframe import check_columns
+from ..utils.lzf import HASH_SIZE, lzf_compress_runs
+
+try:
+    from ..utils.numba import lzf_compress, lzf_decompress
+
+    is_numba_avaliable = True
+except ImportError:
+    from ..utils.lzf import lzf_compress, lzf_decompress
+
+    is_numba_avaliable = False
+
 numpy_pcd_type_mappings = [
     (np.dtype("float32"), ("F", 4)),
     (np.dtype("float64"), ("F", 8)),
@@ -11,6 +24,7 @@ numpy_pcd_type_mappings = [
     (np.dtype("uint16"), ("U", 2)),
     (np.dtype("uint32"), ("U", 4)),
     (np.dtype("uint64"), ("U", 8)),
+    (np.dtype("int8"), ("I", 1)),
     (np.dtype("int16"), ("I", 2)),
     (np.dtype("int32"), ("I", 4)),
     (np.dtype("int64"), ("I", 8)),
@@ -34,11 +48,11 @@ def parse_header(lines):
         elif key in ("fields", "type"):
             metadata[key] = value.split()
         elif key in ("size", "count"):
-            metadata[key] = map(int, value.split())
+            metadata[key] = [int(x) for x in value.split()]
         elif key in ("width", "height", "points"):
             metadata[key] = int(value)
         elif key == "viewpoint":
-            metadata[key] = map(float, value.split())
+            metadata[key] = [float(x) for x in value.split()]
         elif key == "data":
             metadata[key] = value.strip().lower()
         # TODO apparently count is not required?
@@ -63,7 +77,7 @@ def build_dtype(metadata):
     for f, c, t, s in zip(
         metadata["fields"], metadata["count"], metadata["type"], metadata["size"]
     ):
-        np_type = pcd_type_to_numpy_type[(t, s)]
+        np_type = pcd_type_to_numpy_type[(t, s)].newbyteorder("<")
         if c == 1:
             fieldnames.append(f)
             typenames.append(np_type)
@@ -75,13 +89,119 @@ def build_dtype(metadata):
     return dtype
 
 
-def read_pcd(filename):
+def read_header(f):
+    """Read the header of a pcd file opened in binary mode.
+
+    The file is left positioned at the start of the data block.
+    """
+    header = []
+    while True:
+        ln = f.readline().strip().decode()
+        header.append(ln)
+        if ln.startswith("DATA"):
+            return parse_header(header)
+
+
+def unpack_rgb(df):
+    """Replace the packed 'rgb' column of df, if any, by red, green and blue."""
+    # check if dataframe contains color info
+    col = "rgb"
+    if col in df.columns:
+        # get the 'rgb' column from dataframe
+        packed_rgb = np.ascontiguousarray(df.rgb.values)
+        # 'rgb' values are usually stored as float
+        # treat them as int
+        if packed_rgb.dtype.kind == "f":
+            packed_rgb = packed_rgb.astype(np.float32).view(np.uint32)
+        else:
+            packed_rgb = packed_rgb.astype(np.uint32)
+        # unpack 'rgb' into 'red', 'green' and 'blue' channel
+        df["red"] = np.asarray((packed_rgb >> 16) & 255, dtype=np.uint8)
+        df["green"] = np.asarray((packed_rgb >> 8) & 255, dtype=np.uint8)
+        df["blue"] = np.asarray(packed_rgb & 255, dtype=np.uint8)
+        # remove packed rgb since we don't need it anymore
+        df.drop(col, axis=1, inplace=True)
+    return df
+
+
+def decompress(buf, size):
+    """Decompress the LZF compressed buf, with an uncompressed size of size bytes."""
+    if is_numba_avaliable:
+        src = np.frombuffer(buf, dtype=np.uint8)
+        dst = np.empty(size, dtype=np.uint8)
+    else:
+        src = buf
+        dst = bytearray(size)
+    if lzf_decompress(src, dst) != size:
+        raise ValueError("Corrupted lzf data in pcd file.")
+    return dst
+
+
+def compress(buf):
+    """LZF compress buf, returning the compressed bytes.
+
+    Without numba, only runs of repeated bytes are compressed, since the
+    python loop of lzf_compress is too slow.
+    """
+    if not is_numba_avaliable:
+        return lzf_compress_runs(buf).tobytes()
+    # big enough for the worst case expansion of incompressible data
+    size = len(buf) + len(buf) // 16 + 64
+    src = np.frombuffer(buf, dtype=np.uint8)
+    dst = np.empty(size, dtype=np.uint8)
+    htab = np.full(HASH_SIZE, -1, dtype=np.int64)
+    n = lzf_compress(src, dst, htab)
+    return bytes(dst[:n])
+
+
+def read_binary_compressed(f, metadata, dtype, fields=None):
+    """Read the data block of a binary_compressed pcd file.
+
+    The block holds the compressed and uncompressed sizes followed by the
+    LZF compressed fields, stored one after another (column-major).
+    Only the fields of dtype in fields are extracted, all if None.
+    """
+    compressed_size, uncompressed_size = struct.unpack("<II", f.read(8))
+    n_points = metadata["points"]
+    if uncompressed_size != n_points * dtype.itemsize:
+        raise ValueError(
+            "Uncompressed size {} does not match {} points of {} bytes.".format(
+                uncompressed_size, n_points, dtype.itemsize
+            )
+        )
+    buf = decompress(f.read(compressed_size), uncompressed_size)
+
+    if fields is None:
+        fields = dtype.names
+    pc_data = np.empty(n_points, dtype=dtype[list(fields)])
+    offset = 0
+    names = iter(dtype.names)
+    for c in metadata["count"]:
+        field_names = [next(names) for _ in range(c)]
+        field_dtype = dtype[field_names[0]]
+        field = np.frombuffer(
+            buf, dtype=field_dtype, count=n_points * c, offset=offset
+        ).reshape(n_points, c)
+        for i, name in enumerate(field_names):
+            if name in fields:
+                pc_data[name] = field[:, i]
+        offset += field.nbytes
+    return pc_data
+
+
+def read_pcd(filename, columns=None):
     """Reads and pcd file and return the elements as pandas Dataframes.
 
     Parameters
     ----------
     filename: str
         Path to the pcd file.
+    columns: list of str, optional
+        Default: None
+        Fields to be read, all if None. A packed 'rgb' field is available as
+        red, green and blue columns.
+        For binary files the other fields are skipped through strided access
+        to the data block, so they are never copied.
 
     Returns
     -------
@@ -90,45 +210,224 @@ def read_pcd(filename):
     """
     data = {}
     with open(filename, "rb") as f:
-        header = []
-        while True:
-            ln = f.readline().strip().decode()
-            header.append(ln)
-            if ln.startswith("DATA"):
-                metadata = parse_header(header)
-                dtype = build_dtype(metadata)
-                break
+        metadata = read_header(f)
+        dtype = build_dtype(metadata)
+
+        fields = None
+        if columns is not None:
+            available = [name for name in dtype.names if name != "rgb"]
+            if "rgb" in dtype.names:
+                available += ["red", "green", "blue"]
+            check_columns(columns, available)
+            fields = [
+                name
+                for name in dtype.names
+                if name in columns
+                or (name == "rgb" and {"red", "green", "blue"} & set(columns))
+            ]
 
         if metadata["data"] == "ascii":
-            pc_data = np.loadtxt(f, dtype=dtype, delimiter=" ")
+            if fields is None:
+                pc_data = np.loadtxt(f, dtype=dtype, delimiter=" ")
+            else:
+                pc_data = np.loadtxt(
+                    f,
+                    dtype=[(name, dtype[name]) for name in fields],
+                    delimiter=" ",
+                    usecols=[dtype.names.index(name) for name in fields],
+                )
 
         elif metadata["data"] == "binary":
-            rowstep = metadata["points"] * dtype.itemsize
-            # for some reason pcl adds empty space at the end of files
-            buf = f.read(rowstep)
+            if fields is None:
+                rowstep = metadata["points"] * dtype.itemsize
+                # for some reason pcl adds empty space at the end of files
+                buf = f.read(rowstep)
 
-            pc_data = np.fromstring(buf, dtype=dtype)
+                pc_data = np.frombuffer(buf, dtype=dtype)
+            else:
+                pc_np = np.memmap(
+                    f,
+                    dtype=dtype,
+                    mode="r",
+                    offset=f.tell(),
+                    shape=(metadata["points"],),
+                )
+                # copy only the selected fields
+                pc_data = {
+                    name: np.array(pc_np[name], dtype=dtype[name].newbyteorder("="))
+                    for name in fields
+                }
+                del pc_np
 
         elif metadata["data"] == "binary_compressed":
-            raise NotImplementedError("lzf compression not supported.")
+            pc_data = read_binary_compressed(f, metadata, dtype, fields)
 
-    df = pd.DataFrame(pc_data)
-
-    # check if dataframe contains color info
-    col = "rgb"
-    if col in df.columns:
-        # get the 'rgb' column from dataframe
-        packed_rgb = df.rgb.values
-        # 'rgb' values are stored as float
-        # treat them as int
-        packed_rgb = packed_rgb.astype(np.float32).tostring()
-        packed_rgb = np.frombuffer(packed_rgb, dtype=np.int32)
-        # unpack 'rgb' into 'red', 'green' and 'blue' channel
-        df["red"] = np.asarray((packed_rgb >> 16) & 255, dtype=np.uint8)
-        df["green"] = np.asarray((packed_rgb >> 8) & 255, dtype=np.uint8)
-        df["blue"] = np.asarray(packed_rgb & 255, dtype=np.uint8)
-        # remove packed rgb since we don't need it anymore
-        df.drop(col, axis=1, inplace=True)
+        else:
+            raise ValueError("Unknown pcd DATA type: {}".format(metadata["data"]))
 
-    data["points"] = df
+    points = unpack_rgb(pd.DataFrame(pc_data))
+    if columns is not None:
+        points = points[columns]
+    data["points"] = points
     return data
+
+
+def probe_pcd(filename):
+    """Read the number of points and the fields of a pcd file from its header.
+
+    Parameters
+    ----------
+    filename: str
+        Path to the pcd file.
+
+    Returns
+    -------
+    info: dict
+        n_points, n_faces and fields (field name to numpy dtype).
+        A packed 'rgb' field is reported as the red, green and blue columns
+        returned by read_pcd.
+    """
+    with open(filename, "rb") as f:
+        metadata = read_header(f)
+    dtype = build_dtype(metadata)
+    fields = {name: dtype[name] for name in dtype.names if name != "rgb"}
+    if "rgb" in dtype.names:
+        fields.update((name, np.dtype(np.uint8)) for name in ("red", "green", "blue"))
+    return {"n_points": metadata["points"], "n_faces": 0, "fields": fields}
+
+
+def iter_pcd(filename, chunk_size=1000000):
+    """Iterate over the points of a binary pcd file in chunks.
+
+    Parameters
+    ----------
+    filename: str
+        Path to the pcd file.
+    chunk_size: int, optional
+        Default: 1000000
+        Maximum number of points in each chunk.
+
+    Yields
+    ------
+    points: pandas DataFrame
+        Up to chunk_size points, indexed by their position in the file.
+    """
+    with open(filename, "rb") as f:
+        metadata = read_header(f)
+        if metadata["data"] != "binary":
+            raise NotImplementedError(
+                "Only binary pcd files can be read in chunks, got {}.".format(
+                    metadata["data"]
+                )
+            )
+        dtype = build_dtype(metadata)
+        for start in range(0, metadata["points"], chunk_size):
+            count = min(chunk_size, metadata["points"] - start)
+            points = unpack_rgb(pd.DataFrame(np.fromfile(f, dtype=dtype, count=count)))
+            points.index = pd.RangeIndex(start, start + count)
+            yield points
+
+
+def write_pcd(filename, points, data="binary"):
+    """Write the points to a pcd file.
+
+    Parameters
+    ----------
+    filename: str
+        Path to the output file.
+    points: pandas DataFrame
+        red, green and blue columns, if present, are packed into a single
+        float 'rgb' field as expected by PCL.
+    data: {"ascii", "binary", "binary_compressed"}, optional
+        Default: "binary"
+        Storage of the data block. "binary_compressed" uses LZF compression.
+
+    Returns
+    -------
+    boolean
+        True if no problems
+    """
+    if data not in ("ascii", "binary", "binary_compressed"):
+        raise ValueError(
+            "data must be 'ascii', 'binary' or 'binary_compressed', got {}".format(data)
+        )
+
+    columns = {}
+    for name in points.columns:
+        if name in ("red", "green", "blue"):
+            continue
+        values = points[name].values
+        if values.dtype == bool:
+            values = values.astype(np.uint8)
+        columns[name] = values
+    if all(c in points.columns for c in ("red", "green", "blue")):
+        packed_rgb = (
+            (points["red"].values.astype(np.uint32) << 16)
+            | (points["green"].values.astype(np.uint32) << 8)
+            | points["blue"].values.astype(np.uint32)
+        )
+        columns["rgb"] = packed_rgb.view(np.float32)
+    else:
+        for name in ("red", "green", "blue"):
+            if name in points.columns:
+                columns[name] = points[name].values
+
+    dtype = np.dtype(
+        [(name, values.dtype.newbyteorder("<")) for name, values in columns.items()]
+    )
+    pcd_types = []
+    for name in dtype.names:
+        try:
+            pcd_types.append(numpy_type_to_pcd_type[dtype[name].newbyteorder("=")])
+        except KeyError:
+            raise ValueError(
+                "Column {} has an unsupported dtype: {}".format(name, dtype[name])
+            )
+
+    n_points = len(points)
+    header = [
+        "# .PCD v0.7 - Point Cloud Data file format",
+        "VERSION 0.7",
+        "FIELDS " + " ".join(dtype.names),
+        "SIZE " + " ".join(str(s) for _, s in pcd_types),
+        "TYPE " + " ".join(t for t, _ in pcd_types),
+        "COUNT " + " ".join("1" for _ in pcd_types),
+        "WIDTH {}".format(n_points),
+        "HEIGHT 1",
+        "VIEWPOINT 0 0 0 1 0 0 0",
+        "POINTS {}".format(n_points),
+        "DATA {}".format(data),
+    ]
+
+    with open(filename, "wb") as f:
+        f.write(("\n".join(header) + "\n").encode("ascii"))
+
+        if data == "ascii":
+            float_format = "%.9g"
+            if any(dtype[name].itemsize == 8 for name in dtype.names):
+                float_format = "%.17g"
+            pd.DataFrame(columns, copy=False).to_csv(
+                f,
+                sep=" ",
+                header=False,
+                index=False,
+                float_format=float_format,
+                lineterminator="\n",
+            )
+
+        elif data == "binary":
+            pc_data = np.empty(n_points, dtype=dtype)
+            for name, values in columns.items():
+                pc_data[name] = values
+            f.write(pc_data.tobytes())
+
+        else:
+            buf = b"".join(
+                np.ascontiguousarray(values, dtype=dtype[name]).tobytes()
+                for name, values in columns.items()
+            )
+            compressed = compress(buf)
+            f.write(struct.pack("<II", len(compressed), len(buf)))
+            f.write(compressed)
+
+    return True
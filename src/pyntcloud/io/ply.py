@@ -5,6 +5,8 @@ import numpy as np
 import pandas as pd
 from collections import defaultdict
 
+from ..utils.dataframe import check_columns, structured_to_dataframe
+
 sys_byteorder = (">", "<")[sys.byteorder == "little"]
 
 ply_dtypes = dict(
@@ -29,10 +31,177 @@ ply_dtypes = dict(
     ]
 )
 
+# 64 bit integers are written as 32 bit
+numpy_to_ply_types = {
+    ("f", 4): "float",
+    ("f", 8): "double",
+    ("u", 1): "uchar",
+    ("u", 2): "ushort",
+    ("u", 4): "uint",
+    ("i", 1): "char",
+    ("i", 2): "short",
+    ("i", 4): "int",
+}
+
 valid_formats = {"ascii": "", "binary_big_endian": ">", "binary_little_endian": "<"}
 
 
-def read_ply(filename, allow_bool=False):
+def parse_header(ply, allow_bool=False):
+    """Parse the header of a .ply file.
+
+    Parameters
+    ----------
+    ply: file object
+        File opened in binary mode, positioned at the start of the file.
+        After parsing, it is positioned at the start of the data blocks.
+    allow_bool: bool
+        flag to allow bool as a valid PLY dtype.
+
+    Returns
+    -------
+    header: dict
+        Format, numpy dtypes of each element, element sizes and comments.
+    """
+    property_dtypes = ply_dtypes
+    if allow_bool:
+        property_dtypes = dict(ply_dtypes)
+        property_dtypes[b"bool"] = "?"
+
+    if b"ply" not in ply.readline():
+        raise ValueError("The file does not start with the word ply")
+    # get binary_little/big or ascii
+    fmt = ply.readline().split()[1].decode()
+    # get extension for building the numpy dtypes
+    ext = valid_formats[fmt]
+
+    line = []
+    dtypes = defaultdict(list)
+    count = 2
+    points_size = None
+    mesh_size = None
+    has_texture = False
+    comments = []
+    while b"end_header" not in line and line != b"":
+        line = ply.readline()
+
+        if b"element" in line:
+            line = line.split()
+            name = line[1].decode()
+            size = int(line[2])
+            if name == "vertex":
+                points_size = size
+            elif name == "face":
+                mesh_size = size
+
+        elif b"property" in line:
+            line = line.split()
+            # element mesh
+            if b"list" in line:
+                if b"vertex_indices" in line[-1] or b"vertex_index" in line[-1]:
+                    mesh_names = ["n_points", "v1", "v2", "v3"]
+                else:
+                    has_texture = True
+                    mesh_names = ["n_coords"] + [
+                        "v1_u",
+                        "v1_v",
+                        "v2_u",
+                        "v2_v",
+                        "v3_u",
+                        "v3_v",
+                    ]
+
+                if fmt == "ascii":
+                    # the first number has different dtype than the list
+                    dtypes[name].append((mesh_names[0], property_dtypes[line[2]]))
+                    # rest of the numbers have the same dtype
+                    dt = property_dtypes[line[3]]
+                else:
+                    # the first number has different dtype than the list
+                    dtypes[name].append((mesh_names[0], ext + property_dtypes[line[2]]))
+                    # rest of the numbers have the same dtype
+                    dt = ext + property_dtypes[line[3]]
+
+                for j in range(1, len(mesh_names)):
+                    dtypes[name].append((mesh_names[j], dt))
+            else:
+                if fmt == "ascii":
+                    dtypes[name].append((line[2].decode(), property_dtypes[line[1]]))
+                else:
+                    dtypes[name].append(
+                        (line[2].decode(), ext + property_dtypes[line[1]])
+                    )
+
+        elif b"comment" in line:
+            line = line.split(b" ", 1)
+            comment = line[1].decode().rstrip()
+            comments.append(comment)
+
+        count += 1
+
+    return {
+        "format": fmt,
+        "ext": ext,
+        "dtypes": dtypes,
+        "points_size": points_size,
+        "mesh_size": mesh_size,
+        "has_texture": has_texture,
+        "comments": comments,
+        # number of header lines, for ascii
+        "count": count,
+        # for bin
+        "end_header": ply.tell(),
+    }
+
+
+def read_ascii_element(filename, dtype, skiprows, nrows, usecols=None):
+    """Read nrows lines of an ascii .ply element with the pandas C parser.
+
+    Parameters
+    ----------
+    filename: str
+        Path to the filename
+    dtype: list of (name, numpy dtype)
+        Names and types of the columns to be read.
+    skiprows: int
+        Number of lines before the element.
+    nrows: int
+        Number of lines of the element.
+    usecols: list of int, optional
+        Default: None
+        Position in each line of the columns described by dtype.
+        If None, the first len(dtype) values of each line are used.
+
+    Returns
+    -------
+    element: pandas DataFrame
+    """
+    names = [x[0] for x in dtype]
+    if usecols is None:
+        usecols = list(range(len(names)))
+    # bool columns are stored as 0/1, parse them as integers first
+    parse_dtypes = {name: ("u1" if dt == "?" else dt) for name, dt in dtype}
+
+    element = pd.read_csv(
+        filename,
+        sep=r"\s+",
+        header=None,
+        engine="c",
+        skiprows=skiprows,
+        nrows=nrows,
+        usecols=usecols,
+        names=names,
+        dtype=parse_dtypes,
+        index_col=False,
+    )
+
+    for name, dt in dtype:
+        if dt == "?":
+            element[name] = element[name].astype(bool)
+
+    return element
+
+
+def read_ply(filename, allow_bool=False, mmap=False, columns=None):
     """Read a .ply (binary or ascii) file and store the elements in pandas DataFrame.
 
     Parameters
@@ -41,89 +210,41 @@ def read_ply(filename, allow_bool=False):
         Path to the filename
     allow_bool: bool
         flag to allow bool as a valid PLY dtype. False by default to mirror original PLY specification.
+    mmap: bool, optional
+        Default: False
+        If True, the vertex and face blocks of a binary file are memory mapped
+        (copy-on-write) instead of read. The DataFrame columns are views over the
+        mapping, so data is only paged in when it is accessed.
+        Only files stored with the native byte order can be memory mapped.
+    columns: list of str, optional
+        Default: None
+        Vertex properties to be read. All properties if None.
+        For binary files the other properties are skipped through strided
+        access to the vertex block, so they are never copied.
 
     Returns
     -------
     data: dict
         Elements as pandas DataFrames; comments and ob_info as list of string
     """
-    if allow_bool:
-        ply_dtypes[b"bool"] = "?"
-
     with open(filename, "rb") as ply:
-        if b"ply" not in ply.readline():
-            raise ValueError("The file does not start with the word ply")
-        # get binary_little/big or ascii
-        fmt = ply.readline().split()[1].decode()
-        # get extension for building the numpy dtypes
-        ext = valid_formats[fmt]
-
-        line = []
-        dtypes = defaultdict(list)
-        count = 2
-        points_size = None
-        mesh_size = None
-        has_texture = False
-        comments = []
-        while b"end_header" not in line and line != b"":
-            line = ply.readline()
-
-            if b"element" in line:
-                line = line.split()
-                name = line[1].decode()
-                size = int(line[2])
-                if name == "vertex":
-                    points_size = size
-                elif name == "face":
-                    mesh_size = size
-
-            elif b"property" in line:
-                line = line.split()
-                # element mesh
-                if b"list" in line:
-                    if b"vertex_indices" in line[-1] or b"vertex_index" in line[-1]:
-                        mesh_names = ["n_points", "v1", "v2", "v3"]
-                    else:
-                        has_texture = True
-                        mesh_names = ["n_coords"] + [
-                            "v1_u",
-                            "v1_v",
-                            "v2_u",
-                            "v2_v",
-                            "v3_u",
-                            "v3_v",
-                        ]
-
-                    if fmt == "ascii":
-                        # the first number has different dtype than the list
-                        dtypes[name].append((mesh_names[0], ply_dtypes[line[2]]))
-                        # rest of the numbers have the same dtype
-                        dt = ply_dtypes[line[3]]
-                    else:
-                        # the first number has different dtype than the list
-                        dtypes[name].append((mesh_names[0], ext + ply_dtypes[line[2]]))
-                        # rest of the numbers have the same dtype
-                        dt = ext + ply_dtypes[line[3]]
-
-                    for j in range(1, len(mesh_names)):
-                        dtypes[name].append((mesh_names[j], dt))
-                else:
-                    if fmt == "ascii":
-                        dtypes[name].append((line[2].decode(), ply_dtypes[line[1]]))
-                    else:
-                        dtypes[name].append(
-                            (line[2].decode(), ext + ply_dtypes[line[1]])
-                        )
+        header = parse_header(ply, allow_bool=allow_bool)
 
-            elif b"comment" in line:
-                line = line.split(b" ", 1)
-                comment = line[1].decode().rstrip()
-                comments.append(comment)
+    fmt = header["format"]
+    ext = header["ext"]
+    dtypes = header["dtypes"]
+    points_size = header["points_size"]
+    mesh_size = header["mesh_size"]
+    has_texture = header["has_texture"]
+    comments = header["comments"]
+    count = header["count"]
+    end_header = header["end_header"]
 
-            count += 1
+    if mmap and fmt == "ascii":
+        raise ValueError("mmap is only supported for binary files")
 
-        # for bin
-        end_header = ply.tell()
+    if columns is not None:
+        check_columns(columns, [name for name, _ in dtypes["vertex"]])
 
     data = {}
 
@@ -131,74 +252,183 @@ def read_ply(filename, allow_bool=False):
         data["comments"] = comments
 
     if fmt == "ascii":
-        top = count
-        bottom = 0 if mesh_size is None else mesh_size
-
-        names = [x[0] for x in dtypes["vertex"]]
-
-        data["points"] = pd.read_csv(
-            filename,
-            sep=" ",
-            header=None,
-            engine="python",
-            skiprows=top,
-            skipfooter=bottom,
-            usecols=names,
-            names=names,
-        )
-
-        for n, col in enumerate(data["points"].columns):
-            data["points"][col] = data["points"][col].astype(dtypes["vertex"][n][1])
+        if columns is None:
+            data["points"] = read_ascii_element(
+                filename, dtypes["vertex"], skiprows=count, nrows=points_size
+            )
+        else:
+            names = [name for name, _ in dtypes["vertex"]]
+            usecols = sorted(names.index(name) for name in columns)
+            data["points"] = read_ascii_element(
+                filename,
+                [dtypes["vertex"][i] for i in usecols],
+                skiprows=count,
+                nrows=points_size,
+                usecols=usecols,
+            )[columns]
 
         if mesh_size:
-            top = count + points_size
-
-            names = np.array([x[0] for x in dtypes["face"]])
             usecols = [1, 2, 3, 5, 6, 7, 8, 9, 10] if has_texture else [1, 2, 3]
-            names = names[usecols]
-
-            data["mesh"] = pd.read_csv(
+            data["mesh"] = read_ascii_element(
                 filename,
-                sep=" ",
-                header=None,
-                engine="python",
-                skiprows=top,
+                [dtypes["face"][i] for i in usecols],
+                skiprows=count + points_size,
+                nrows=mesh_size,
                 usecols=usecols,
-                names=names,
             )
 
-            for n, col in enumerate(data["mesh"].columns):
-                data["mesh"][col] = data["mesh"][col].astype(dtypes["face"][n + 1][1])
+        return data
+
+    if mmap and ext != sys_byteorder:
+        raise ValueError(
+            "mmap is only supported for binary files with native byte order"
+        )
+
+    vertex_dtype = np.dtype(dtypes["vertex"])
+    mesh_offset = end_header + points_size * vertex_dtype.itemsize
+
+    if mmap:
+        points_np = np.memmap(
+            filename,
+            dtype=vertex_dtype,
+            mode="c",
+            offset=end_header,
+            shape=(points_size,),
+        )
+        data["points"] = structured_to_dataframe(points_np, columns)
+
+    elif columns is not None:
+        points_np = np.memmap(
+            filename,
+            dtype=vertex_dtype,
+            mode="r",
+            offset=end_header,
+            shape=(points_size,),
+        )
+        # copy only the selected fields, in native byte order
+        data["points"] = pd.DataFrame(
+            {
+                name: np.array(
+                    points_np[name], dtype=vertex_dtype[name].newbyteorder("=")
+                )
+                for name in columns
+            }
+        )
+        del points_np
 
     else:
         with open(filename, "rb") as ply:
             ply.seek(end_header)
-            points_np = np.fromfile(ply, dtype=dtypes["vertex"], count=points_size)
-            if ext != sys_byteorder:
-                points_np = points_np.byteswap().newbyteorder()
-            data["points"] = pd.DataFrame(points_np)
-            if mesh_size:
+            points_np = np.fromfile(ply, dtype=vertex_dtype, count=points_size)
+        if ext != sys_byteorder:
+            points_np = points_np.byteswap().view(points_np.dtype.newbyteorder())
+        data["points"] = pd.DataFrame(points_np)
+
+    if mesh_size:
+        if mmap:
+            mesh_np = np.memmap(
+                filename,
+                dtype=dtypes["face"],
+                mode="c",
+                offset=mesh_offset,
+                shape=(mesh_size,),
+            )
+            data["mesh"] = structured_to_dataframe(
+                mesh_np, [x for x in mesh_np.dtype.names if x != "n_points"]
+            )
+        else:
+            with open(filename, "rb") as ply:
+                ply.seek(mesh_offset)
                 mesh_np = np.fromfile(ply, dtype=dtypes["face"], count=mesh_size)
-                if ext != sys_byteorder:
-                    mesh_np = mesh_np.byteswap().newbyteorder()
-                data["mesh"] = pd.DataFrame(mesh_np)
-                data["mesh"].drop("n_points", axis=1, inplace=True)
+            if ext != sys_byteorder:
+                mesh_np = mesh_np.byteswap().view(mesh_np.dtype.newbyteorder())
+            data["mesh"] = pd.DataFrame(mesh_np)
+            data["mesh"].drop("n_points", axis=1, inplace=True)
 
     return data
 
 
-def write_ply(filename, points=None, mesh=None, as_text=False, comments=None):
-    """Write a PLY file populated with the given fields.
+def iter_ply(filename, chunk_size=1000000, allow_bool=False):
+    """Iterate over the vertices of a binary .ply file in chunks.
+
+    Parameters
+    ----------
+    filename: str
+        Path to the filename
+    chunk_size: int, optional
+        Default: 1000000
+        Maximum number of points in each chunk.
+    allow_bool: bool
+        flag to allow bool as a valid PLY dtype.
+
+    Yields
+    ------
+    points: pandas DataFrame
+        Up to chunk_size points, indexed by their position in the file.
+    """
+    with open(filename, "rb") as ply:
+        header = parse_header(ply, allow_bool=allow_bool)
+        if header["format"] == "ascii":
+            raise NotImplementedError("Only binary PLY files can be read in chunks.")
+
+        dtype = np.dtype(header["dtypes"]["vertex"])
+        swap = header["ext"] != sys_byteorder
+        points_size = header["points_size"] or 0
+        for start in range(0, points_size, chunk_size):
+            count = min(chunk_size, points_size - start)
+            points_np = np.fromfile(ply, dtype=dtype, count=count)
+            if swap:
+                points_np = points_np.byteswap().view(dtype.newbyteorder())
+            points = pd.DataFrame(points_np)
+            points.index = pd.RangeIndex(start, start + count)
+            yield points
+
+
+def probe_ply(filename, allow_bool=True):
+    """Read the element sizes and vertex properties of a .ply file from its header.
 
     Parameters
     ----------
     filename: str
-        The created file will be named with this
-    points: ndarray
-    mesh: ndarray
+        Path to the filename
+    allow_bool: bool
+        Default: True
+        flag to allow bool as a valid PLY dtype.
+
+    Returns
+    -------
+    info: dict
+        n_points, n_faces and fields (vertex property name to numpy dtype).
+    """
+    with open(filename, "rb") as ply:
+        header = parse_header(ply, allow_bool=allow_bool)
+    return {
+        "n_points": header["points_size"] or 0,
+        "n_faces": header["mesh_size"] or 0,
+        "fields": {name: np.dtype(dt) for name, dt in header["dtypes"]["vertex"]},
+    }
+
+
+def write_ply(
+    filename, points=None, mesh=None, as_text=False, comments=None, chunk_size=1000000
+):
+    """Write a PLY file populated with the given fields.
+
+    Parameters
+    ----------
+    filename: str or file object
+        The created file will be named with this.
+        A file object must be opened in binary mode.
+    points: pandas DataFrame
+    mesh: pandas DataFrame
+        Only the v1, v2 and v3 columns are written.
     as_text: boolean
         Set the write mode of the file. Default: binary
     comments: list of string
+    chunk_size: int, optional
+        Default: 1000000
+        Number of rows written at once. Columns are interleaved into a buffer
+        of this many rows, so memory usage doesn't grow with the cloud size.
 
     Returns
     -------
@@ -206,11 +436,16 @@ def write_ply(filename, points=None, mesh=None, as_text=False, comments=None):
         True if no problems
 
     """
-    if not filename.endswith("ply"):
-        filename += ".ply"
+    if hasattr(filename, "write"):
+        ply = filename
+        close = False
+    else:
+        if not filename.endswith("ply"):
+            filename += ".ply"
+        ply = open(filename, "wb")
+        close = True
 
-    # open in text mode to write the header
-    with open(filename, "w") as ply:
+    try:
         header = ["ply"]
 
         if as_text:
@@ -225,36 +460,76 @@ def write_ply(filename, points=None, mesh=None, as_text=False, comments=None):
         if points is not None:
             header.extend(describe_element("vertex", points))
         if mesh is not None:
-            mesh = mesh.copy()
-            mesh.insert(loc=0, column="n_points", value=3)
-            mesh["n_points"] = mesh["n_points"].astype("u1")
             header.extend(describe_element("face", mesh))
 
         header.append("end_header")
 
-        for line in header:
-            ply.write("%s\n" % line)
+        ply.write("".join("%s\n" % line for line in header).encode("ascii"))
 
-    if as_text:
         if points is not None:
-            points.to_csv(
-                filename, sep=" ", index=False, header=False, mode="a", encoding="ascii"
+            # bool is stored as a single 0/1 byte
+            dtype = np.dtype(
+                [
+                    (name, ply_dtypes.get(property_type.encode(), "u1"))
+                    for name, property_type in zip(
+                        points.columns, property_types(points)
+                    )
+                ]
             )
+            write_element(ply, points, dtype, as_text, chunk_size)
         if mesh is not None:
-            mesh.to_csv(
-                filename, sep=" ", index=False, header=False, mode="a", encoding="ascii"
+            dtype = np.dtype(
+                [("n_points", "u1"), ("v1", "i4"), ("v2", "i4"), ("v3", "i4")]
             )
-
-    else:
-        with open(filename, "ab") as ply:
-            if points is not None:
-                points.to_records(index=False).tofile(ply)
-            if mesh is not None:
-                mesh.to_records(index=False).tofile(ply)
+            write_element(ply, mesh, dtype, as_text, chunk_size)
+    finally:
+        if close:
+            ply.close()
 
     return True
 
 
+def write_element(ply, df, dtype, as_text, chunk_size):
+    """Write the columns of df described by dtype, chunk_size rows at a time.
+
+    A n_points field in dtype, not present in df, is filled with 3.
+    """
+    n_rows = len(df)
+    buffer = np.empty(min(chunk_size, n_rows), dtype=dtype)
+    columns = {
+        name: (df[name].to_numpy() if name in df.columns else None)
+        for name in dtype.names
+    }
+    for start in range(0, n_rows, chunk_size):
+        end = min(start + chunk_size, n_rows)
+        chunk = buffer[: end - start]
+        for name, values in columns.items():
+            chunk[name] = 3 if values is None else values[start:end]
+        if as_text:
+            pd.DataFrame(chunk).to_csv(
+                ply, sep=" ", index=False, header=False, lineterminator="\n"
+            )
+        else:
+            ply.write(chunk.data)
+
+
+def property_types(df):
+    """PLY type of each column of df."""
+    types = []
+    for name, dtype in df.dtypes.items():
+        if getattr(dtype, "kind", None) == "b":
+            types.append("bool")
+            continue
+        try:
+            itemsize = dtype.itemsize if dtype.kind == "f" else min(dtype.itemsize, 4)
+            types.append(numpy_to_ply_types[(dtype.kind, itemsize)])
+        except (KeyError, AttributeError):
+            raise ValueError(
+                "Column {} has an unsupported dtype for PLY: {}".format(name, dtype)
+            )
+    return types
+
+
 def describe_element(name, df):
     """Takes the columns of the dataframe and builds a ply-like description
 
@@ -267,16 +542,13 @@ def describe_element(name, df):
     -------
     element: list[str]
     """
-    property_formats = {"f": "float", "u": "uchar", "i": "int", "b": "bool"}
     element = ["element " + name + " " + str(len(df))]
 
     if name == "face":
         element.append("property list uchar int vertex_indices")
 
     else:
-        for i in range(len(df.columns)):
-            # get first letter of dtype to infer format
-            f = property_formats[str(df.dtypes[i])[0]]
-            element.append("property " + f + " " + df.columns.values[i])
+        for column, property_type in zip(df.columns, property_types(df)):
+            element.append("property " + property_type + " " + column)
 
     return element
@@ -0,0 +1,152 @@
+import json
+import os
+
+import numpy as np
+
+from ..structures import ALL_STRUCTURES
+from ..utils.array import hash_points
+
+MANIFEST = "structures.json"
+
+
+def write_structures(path, xyz, structures, params=None):
+    """Write computed structures to a directory, without the points.
+
+    Each array of the structures state is saved as a .npy file, so it can be
+    memory mapped on read. Everything else goes to a JSON manifest, along with
+    a hash of xyz used to validate the points on read and the versions the
+    layout of each state depends on (see Structure.get_versions).
+
+    Parameters
+    ----------
+    path: str
+        Directory. Created if it doesn't exist.
+    xyz: (N, 3) ndarray
+        Points over which the structures were built.
+    structures: dict
+        Structure.id to computed Structure.
+    params: dict, optional
+        Default: None
+        Structure.id to the parameters used to build it.
+        Structure.get_params() is used for missing ids.
+
+    Returns
+    -------
+    boolean
+        True if no problems
+    """
+    params = params or {}
+    os.makedirs(path, exist_ok=True)
+    manifest = {
+        "xyz": {
+            "sha256": hash_points(xyz),
+            "shape": list(xyz.shape),
+            "dtype": str(xyz.dtype),
+        },
+        "structures": [],
+    }
+    for n, (structure_id, structure) in enumerate(structures.items()):
+        name = next(
+            name for name, cls in ALL_STRUCTURES.items() if type(structure) is cls
+        )
+        arrays, values = {}, {}
+        for key, val in structure.get_state().items():
+            if isinstance(val, np.ndarray):
+                arrays[key] = save_array(path, "{}.{}".format(n, key), val)
+            elif isinstance(val, (list, tuple)) and all(
+                isinstance(x, np.ndarray) for x in val
+            ):
+                arrays[key] = [
+                    save_array(path, "{}.{}.{}".format(n, key, i), x)
+                    for i, x in enumerate(val)
+                ]
+            else:
+                values[key] = to_json(val)
+        manifest["structures"].append(
+            {
+                "id": structure_id,
+                "name": name,
+                "params": params.get(structure_id, structure.get_params()),
+                "versions": structure.get_versions(),
+                "arrays": arrays,
+                "values": values,
+            }
+        )
+
+    with open(os.path.join(path, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return True
+
+
+def to_json(val):
+    if isinstance(val, np.generic):
+        return val.item()
+    if isinstance(val, (list, tuple)):
+        return [to_json(x) for x in val]
+    return val
+
+
+def save_array(path, name, array):
+    filename = "{}.npy".format(name)
+    np.save(os.path.join(path, filename), array, allow_pickle=False)
+    return filename
+
+
+def read_structures(path, cloud, mmap_mode="r"):
+    """Read the structures written by write_structures, without computing them.
+
+    Parameters
+    ----------
+    path: str
+        Directory written by write_structures.
+    cloud: PyntCloud
+        Only its points and xyz are used. xyz must be equal to the one the
+        structures were written with.
+    mmap_mode: {None, "r", "r+", "c"}, optional
+        Default: "r"
+        See numpy.load. With "r" the arrays are memory mapped read-only and
+        only paged in when accessed.
+
+    Returns
+    -------
+    structures: list of (Structure, dict)
+        Each restored structure with the parameters used to build it.
+        Structures written with versions other than the current
+        Structure.get_versions() are computed again from xyz instead.
+    """
+    with open(os.path.join(path, MANIFEST)) as f:
+        manifest = json.load(f)
+
+    xyz = cloud.xyz
+    expected = manifest["xyz"]
+    if (
+        list(xyz.shape) != expected["shape"]
+        or str(xyz.dtype) != expected["dtype"]
+        or hash_points(xyz) != expected["sha256"]
+    ):
+        raise ValueError(
+            "Structures in {} were built over different points".format(path)
+        )
+
+    structures = []
+    for spec in manifest["structures"]:
+        cls = ALL_STRUCTURES[spec["name"]]
+        structure = cls(**cls.extract_info(cloud), **spec["params"])
+        if spec.get("versions", {}) != cls.get_versions():
+            structure.compute()
+            structure.id = spec["id"]
+            structures.append((structure, spec["params"]))
+            continue
+        state = dict(spec["values"])
+        for key, filenames in spec["arrays"].items():
+            if isinstance(filenames, list):
+                state[key] = [load_array(path, x, mmap_mode) for x in filenames]
+            else:
+                state[key] = load_array(path, filenames, mmap_mode)
+        structure.set_state(state)
+        structures.append((structure, spec["params"]))
+    return structures
+
+
+def load_array(path, filename, mmap_mode):
+    return np.load(os.path.join(path, filename), mmap_mode=mmap_mode)
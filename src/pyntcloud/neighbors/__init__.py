@@ -1,5 +1,6 @@
 from .k_neighbors import k_neighbors
+from .kr_neighbors import kr_neighbors
 from .r_neighbors import r_neighbors
 
 
-__all__ = [k_neighbors, r_neighbors]
+__all__ = [k_neighbors, kr_neighbors, r_neighbors]
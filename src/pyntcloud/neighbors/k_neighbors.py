@@ -1,4 +1,17 @@
-def k_neighbors(kdtree, k):
+import numpy as np
+
+from ..utils.array import index_dtype
+
+
+def k_neighbors(
+    kdtree,
+    k,
+    chunk_size=100000,
+    out=None,
+    return_indices=True,
+    return_distances=False,
+    distances_out=None,
+):
     """Get indices of K neartest neighbors for each point
 
     Parameters
@@ -9,11 +22,56 @@ def k_neighbors(kdtree, k):
     k: int
         Number of neighbors to find
 
+    chunk_size: int, optional
+        Default: 100000
+        Number of points queried at once. Temporary memory is proportional to
+        chunk_size * k instead of N * k.
+
+    out: (N, k) int ndarray, optional
+        Default: None
+        Where the indices are written, for example a numpy.memmap.
+        If None, a new int32 array (int64 if N doesn't fit in int32) is used.
+
+    return_indices: bool, optional
+        Default: True
+
+    return_distances: bool, optional
+        Default: False
+
+    distances_out: (N, k) float ndarray, optional
+        Default: None
+        Where the distances are written. If None, a new float32 array is used.
+
     Returns
     -------
     k_neighbors: (N, k) array
         Where N = kdtree.data.shape[0]
+        If return_indices is True.
+    distances: (N, k) array
+        If return_distances is True. If both are True, (distances, k_neighbors)
+        is returned.
     """
-    # [1] to select indices and ignore distances
-    # [:,1:] to discard self-neighbor
-    return kdtree.query(kdtree.data, k=k + 1, workers=-1)[1][:, 1:]
+    if not (return_indices or return_distances):
+        raise ValueError("return_indices and return_distances can't both be False")
+
+    points = kdtree.data
+    n = len(points)
+    if return_indices and out is None:
+        out = np.empty((n, k), dtype=index_dtype(n))
+    if return_distances and distances_out is None:
+        distances_out = np.empty((n, k), dtype=np.float32)
+
+    for start in range(0, n, chunk_size):
+        end = start + chunk_size
+        # k + 1 and [:, 1:] to discard self-neighbor
+        distances, indices = kdtree.query(points[start:end], k=k + 1, workers=-1)
+        if return_indices:
+            out[start:end] = indices.reshape(-1, k + 1)[:, 1:]
+        if return_distances:
+            distances_out[start:end] = distances.reshape(-1, k + 1)[:, 1:]
+
+    if return_indices and return_distances:
+        return distances_out, out
+    elif return_distances:
+        return distances_out
+    return out
@@ -0,0 +1,65 @@
+import numpy as np
+
+from ..utils.array import index_dtype
+
+
+def kr_neighbors(kdtree, k, r, return_distances=False, chunk_size=100000):
+    """Get indices of up to k nearest neighbors with a distance <= r for each point
+
+    Parameters
+    ----------
+    kdtree: pyntcloud.structrues.KDTree
+        The KDTree built on top of the points in point cloud
+
+    k: int
+        Maximum number of neighbors, not counting the point itself
+
+    r: float
+        Maximum distance to consider a neighbor. Points exactly at r are
+        included, as in r_neighbors.
+
+    return_distances: bool, optional
+        Default: False
+        If True, also return the distance to each neighbor.
+
+    chunk_size: int, optional
+        Default: 100000
+        Number of points queried at once. Temporary memory is proportional to
+        chunk_size * k.
+
+    Returns
+    -------
+    indptr, indices: (N + 1,) int64 ndarray, (M,) int ndarray
+        The neighbors of point i are indices[indptr[i]:indptr[i + 1]], sorted
+        by distance. Each point is included first in its own neighborhood,
+        so each has between 1 and k + 1 indices.
+        indices are int32 unless N doesn't fit in it.
+    distances: (M,) float ndarray
+        If return_distances is True. Aligned with indices.
+    """
+    points = kdtree.data
+    n = len(points)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    indices, distances = [], []
+    for start in range(0, n, chunk_size):
+        chunk_distances, chunk_indices = kdtree.query(
+            points[start : start + chunk_size],
+            k=k + 1,
+            # the bound is exclusive
+            distance_upper_bound=np.nextafter(r, np.inf),
+            workers=-1,
+        )
+        chunk_indices = chunk_indices.reshape(-1, k + 1)
+        # missing neighbors are reported with index n, after the found ones
+        found = chunk_indices < n
+        indptr[start + 1 : start + 1 + len(chunk_indices)] = found.sum(1)
+        indices.append(chunk_indices[found].astype(index_dtype(n)))
+        if return_distances:
+            distances.append(chunk_distances.reshape(-1, k + 1)[found])
+    np.cumsum(indptr, out=indptr)
+    indices = np.concatenate(indices) if indices else np.empty(0, index_dtype(n))
+
+    if return_distances:
+        distances = np.concatenate(distances) if distances else np.empty(0)
+        return indptr, indices, distances
+    return indptr, indices
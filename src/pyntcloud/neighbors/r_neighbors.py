@@ -1,8 +1,11 @@
 import numpy as np
+from scipy.spatial import cKDTree
 
+from ..utils.array import index_dtype
 
-def r_neighbors(kdtree, r):
-    """Get indices of all neartest neighbors with a distance < r for each point
+
+def r_neighbors(kdtree, r, format="lists", return_distances=False, chunk_size=100000):
+    """Get indices of all neartest neighbors with a distance <= r for each point
 
     Parameters
     ----------
@@ -10,12 +13,65 @@ def r_neighbors(kdtree, r):
         The KDTree built on top of the points in point cloud
 
     r: float
-        Maximum distance to consider a neighbor
+        Maximum distance to consider a neighbor. Points exactly at r are
+        included, in both formats.
+
+    format: {"lists", "csr"}, optional
+        Default: "lists"
+        Format of the returned neighbors. See Returns.
+
+    return_distances: bool, optional
+        Default: False
+        Only for format="csr". If True, also return the distance to each neighbor.
+
+    chunk_size: int, optional
+        Default: 100000
+        Only for format="csr". Number of points queried at once, which bounds
+        the temporary memory used.
 
     Returns
     -------
     r_neighbors: (N, X) ndarray of lists
+        If format="lists".
         Where N = kdtree.data.shape[0]
         len(X) varies for each point
+    indptr, indices: (N + 1,) int64 ndarray, (M,) int ndarray
+        If format="csr".
+        The neighbors of point i are indices[indptr[i]:indptr[i + 1]], in no
+        particular order. Each point is included in its own neighborhood.
+        indices are int32 unless N doesn't fit in it.
+    distances: (M,) float ndarray
+        If format="csr" and return_distances is True. Aligned with indices.
     """
-    return np.array(kdtree.query_ball_tree(kdtree, r))
+    if format == "lists":
+        neighbors = kdtree.query_ball_tree(kdtree, r)
+        # fill an object array, so it isn't 2D when all lists have equal length
+        lists = np.empty(len(neighbors), dtype=object)
+        lists[:] = neighbors
+        return lists
+    elif format != "csr":
+        raise ValueError("Unsupported format: {}".format(format))
+
+    points = kdtree.data
+    n = len(points)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    indices, distances = [], []
+    for start in range(0, n, chunk_size):
+        chunk = points[start : start + chunk_size]
+        # pairs (i, j, distance) come in a single structured array, without
+        # python lists. Sort them by i to get rows.
+        pairs = cKDTree(chunk).sparse_distance_matrix(kdtree, r, output_type="ndarray")
+        order = np.argsort(pairs["i"], kind="stable")
+        indptr[start + 1 : start + 1 + len(chunk)] = np.bincount(
+            pairs["i"], minlength=len(chunk)
+        )
+        indices.append(pairs["j"][order].astype(index_dtype(n)))
+        if return_distances:
+            distances.append(pairs["v"][order])
+    np.cumsum(indptr, out=indptr)
+    indices = np.concatenate(indices) if indices else np.empty(0, index_dtype(n))
+
+    if return_distances:
+        distances = np.concatenate(distances) if distances else np.empty(0)
+        return indptr, indices, distances
+    return indptr, indices
@@ -127,7 +127,7 @@ def plot_voxelgrid_with_pythreejs(voxel_centers, voxel_colors, width, height, **
 def plot_voxelgrid(
     voxelgrid, d=3, mode="binary", backend="pythreejs", cmap="Oranges", **kwargs
 ):
-    feature_vector = voxelgrid.get_feature_vector(mode)
+    feature_vector = voxelgrid.get_feature_vector(mode, sparse=False)
 
     # Plot 2D
     if d == 2:
@@ -149,7 +149,7 @@ def plot_voxelgrid(
         voxel_colors = np.full((voxelgrid.n_voxels, 3), 200, dtype=np.int)
 
     # Plot 3D
-    feature_vector = voxelgrid.get_feature_vector(mode)
+    feature_vector = voxelgrid.get_feature_vector(mode, sparse=False)
     scaled_shape = np.asarray(voxelgrid.shape) / min(voxelgrid.shape)
     voxel_centers = (np.argwhere(feature_vector) * scaled_shape).astype(np.float32)
 
@@ -4,6 +4,11 @@ HAKUNA MATATA
 
 from .points import RandomPointsSampler, FarthestPointsSampler
 from .mesh import RandomMeshSampler
+from .octree import (
+    OctreeCentersSampler,
+    OctreeCentroidsSampler,
+    OctreeNearestSampler,
+)
 from .voxelgrid import (
     VoxelgridCentersSampler,
     VoxelgridCentroidsSampler,
@@ -22,4 +27,8 @@ ALL_SAMPLERS = {
     "voxelgrid_centroids": VoxelgridCentroidsSampler,
     "voxelgrid_nearest": VoxelgridNearestSampler,
     "voxelgrid_highest": VoxelgridHighestSampler,
+    # Octree
+    "octree_centers": OctreeCentersSampler,
+    "octree_centroids": OctreeCentroidsSampler,
+    "octree_nearest": OctreeNearestSampler,
 }
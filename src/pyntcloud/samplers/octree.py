@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from .base import Sampler
+
+
+class OctreeSampler(Sampler):
+    def __init__(self, *, pyntcloud, octree_id, level=None):
+        """
+        Parameters
+        ----------
+        pyntcloud: pyntcloud.PyntCloud
+        octree_id: pyntcloud.structures.Octree.id
+            Usually returned from PyntCloud.add_structure("octree"):
+            octree_id = my_cloud.add_structure("octree")
+        level: int, optional
+            Default: None
+            Octree level of the nodes used to sample. Octree.max_level if None.
+        """
+        super().__init__(pyntcloud=pyntcloud)
+        self.octree_id = octree_id
+        self.level = level
+
+    def extract_info(self):
+        self.octree = self.pyntcloud.structures[self.octree_id]
+        if self.level is None:
+            self.level = self.octree.max_level
+
+
+class OctreeCentersSampler(OctreeSampler):
+    """Returns the center of each occupied node."""
+
+    def compute(self):
+        return pd.DataFrame(
+            self.octree.get_level_centers(self.level), columns=["x", "y", "z"]
+        )
+
+
+class OctreeCentroidsSampler(OctreeSampler):
+    """Returns the centroid of the points inside each occupied node."""
+
+    def compute(self):
+        level_n = self.octree.get_level_n(self.level)
+        counts = np.bincount(level_n)
+        centroids = {
+            axis: np.bincount(level_n, weights=self.pyntcloud.points[axis]) / counts
+            for axis in ["x", "y", "z"]
+        }
+        return pd.DataFrame(centroids)
+
+
+class OctreeNearestSampler(OctreeSampler):
+    """Returns the point closest to the center of each occupied node.
+
+    Coarser levels give a sparser level of detail of the point cloud.
+    """
+
+    def compute(self):
+        nearests = self.octree.get_level_of_detail(self.level)
+        return self.pyntcloud.points.iloc[nearests].reset_index(drop=True)
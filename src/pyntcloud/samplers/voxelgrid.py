@@ -1,4 +1,3 @@
-import numpy as np
 import pandas as pd
 
 from scipy.spatial.distance import cdist
@@ -20,7 +19,7 @@ class VoxelgridCentersSampler(VoxelgridSampler):
 
     def compute(self):
         return pd.DataFrame(
-            self.voxelgrid.voxel_centers[np.unique(self.voxelgrid.voxel_n)],
+            self.voxelgrid.centers_of(self.voxelgrid.occupied_voxels),
             columns=["x", "y", "z"],
         )
 
@@ -48,8 +47,8 @@ class VoxelgridNearestSampler(VoxelgridSampler):
         nearests = []
         for voxel_n, x in self.pyntcloud.points.groupby(voxel_n_id, sort=False):
             xyz = x.loc[:, ["x", "y", "z"]].values
-            center = self.voxelgrid.voxel_centers[voxel_n]
-            voxel_nearest = cdist([center], xyz)[0].argsort()[: self.n]
+            center = self.voxelgrid.centers_of(voxel_n)
+            voxel_nearest = cdist(center, xyz)[0].argsort()[: self.n]
             nearests.extend(x.index.values[voxel_nearest])
         return self.pyntcloud.points.iloc[nearests].reset_index(drop=True)
 
@@ -11,6 +11,8 @@ from .eigenvalues import (
 from .k_neighbors import (
     EigenDecomposition,
     EigenValues,
+    GeometricFeatures,
+    MultiScaleEigenValues,
     UnorientedNormals,
 )
 from .normals import (
@@ -42,6 +44,8 @@ ALL_SF = {
     # Kneighbors
     "eigen_decomposition": EigenDecomposition,
     "eigen_values": EigenValues,
+    "geometric_features": GeometricFeatures,
+    "multiscale_eigen_values": MultiScaleEigenValues,
     "normals": UnorientedNormals,
     # Normals
     "inclination_degrees": InclinationDegrees,
@@ -10,10 +10,8 @@ class ScalarField(ABC):
         self.to_be_added = OrderedDict()
 
     def get_and_set(self):
-        sf_added = []
-        for k, v in self.to_be_added.items():
-            sf_added.append(k)
-            self.pyntcloud.points[k] = v
+        sf_added = list(self.to_be_added)
+        self.pyntcloud._add_columns(self.to_be_added)
 
         if len(sf_added) == 1:
             return sf_added[0]
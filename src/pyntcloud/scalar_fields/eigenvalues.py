@@ -2,6 +2,54 @@ import numpy as np
 from .base import ScalarField
 
 
+def anisotropy(ev):
+    return np.nan_to_num((ev[:, 0] - ev[:, 2]) / ev[:, 0])
+
+
+def curvature(ev):
+    return np.nan_to_num(ev[:, 2] / (ev[:, 0] + ev[:, 1] + ev[:, 2]))
+
+
+def eigenentropy(ev):
+    result = np.zeros(ev.shape[0])
+    for i in range(3):
+        result += ev[:, i] * np.log(ev[:, i])
+    return np.nan_to_num(-result)
+
+
+def eigen_sum(ev):
+    return ev[:, 0] + ev[:, 1] + ev[:, 2]
+
+
+def linearity(ev):
+    return np.nan_to_num((ev[:, 0] - ev[:, 1]) / ev[:, 0])
+
+
+def omnivariance(ev):
+    return np.nan_to_num((ev[:, 0] * ev[:, 1] * ev[:, 2]) ** (1 / 3))
+
+
+def planarity(ev):
+    return np.nan_to_num((ev[:, 1] - ev[:, 2]) / ev[:, 0])
+
+
+def sphericity(ev):
+    return np.nan_to_num(ev[:, 2] / ev[:, 0])
+
+
+#: Features computed from (N, 3) eigenvalues in descending order.
+EIGEN_FEATURES = {
+    "anisotropy": anisotropy,
+    "curvature": curvature,
+    "eigenentropy": eigenentropy,
+    "eigen_sum": eigen_sum,
+    "linearity": linearity,
+    "omnivariance": omnivariance,
+    "planarity": planarity,
+    "sphericity": sphericity,
+}
+
+
 class EigenValuesScalarField(ScalarField):
     """
     Parameters
@@ -12,6 +60,9 @@ class EigenValuesScalarField(ScalarField):
             ev = self.add_scalar_field("eigen_values", ...)
     """
 
+    #: Key of EIGEN_FEATURES.
+    feature = None
+
     def __init__(self, *, pyntcloud, ev):
         super().__init__(pyntcloud=pyntcloud)
         self.k = ev[0].split("e1")[1]
@@ -20,80 +71,54 @@ class EigenValuesScalarField(ScalarField):
     def extract_info(self):
         self.ev = self.pyntcloud.points[self.ev].values
 
+    def compute(self):
+        name = "{}{}".format(self.feature, self.k)
+        self.to_be_added[name] = EIGEN_FEATURES[self.feature](self.ev)
+
 
 class Anisotropy(EigenValuesScalarField):
     """ """
 
-    def compute(self):
-        name = "anisotropy{}".format(self.k)
-        ev = self.ev
-        self.to_be_added[name] = np.nan_to_num((ev[:, 0] - ev[:, 2]) / ev[:, 0])
+    feature = "anisotropy"
 
 
 class Curvature(EigenValuesScalarField):
     """ """
 
-    def compute(self):
-        name = "curvature{}".format(self.k)
-        ev = self.ev
-        self.to_be_added[name] = np.nan_to_num(
-            ev[:, 2] / (ev[:, 0] + ev[:, 1] + ev[:, 2])
-        )
+    feature = "curvature"
 
 
 class Eigenentropy(EigenValuesScalarField):
     """ """
 
-    def compute(self):
-        name = "eigenentropy{}".format(self.k)
-        ev = self.ev
-        result = np.zeros(ev.shape[0])
-        for i in range(3):
-            result += ev[:, i] * np.log(ev[:, i])
-        self.to_be_added[name] = np.nan_to_num(-result)
+    feature = "eigenentropy"
 
 
 class EigenSum(EigenValuesScalarField):
     """ """
 
-    def compute(self):
-        name = "eigen_sum{}".format(self.k)
-        self.to_be_added[name] = self.ev[:, 0] + self.ev[:, 1] + self.ev[:, 2]
+    feature = "eigen_sum"
 
 
 class Linearity(EigenValuesScalarField):
     """ """
 
-    def compute(self):
-        name = "linearity{}".format(self.k)
-        ev = self.ev
-        self.to_be_added[name] = np.nan_to_num((ev[:, 0] - ev[:, 1]) / ev[:, 0])
+    feature = "linearity"
 
 
 class Omnivariance(EigenValuesScalarField):
     """ """
 
-    def compute(self):
-        name = "omnivariance{}".format(self.k)
-        ev = self.ev
-        self.to_be_added[name] = np.nan_to_num(
-            (ev[:, 0] * ev[:, 1] * ev[:, 2]) ** (1 / 3)
-        )
+    feature = "omnivariance"
 
 
 class Planarity(EigenValuesScalarField):
     """ """
 
-    def compute(self):
-        name = "planarity{}".format(self.k)
-        ev = self.ev
-        self.to_be_added[name] = np.nan_to_num((ev[:, 1] - ev[:, 2]) / ev[:, 0])
+    feature = "planarity"
 
 
 class Sphericity(EigenValuesScalarField):
     """ """
 
-    def compute(self):
-        name = "sphericity{}".format(self.k)
-        ev = self.ev
-        self.to_be_added[name] = np.nan_to_num(ev[:, 2] / ev[:, 0])
+    feature = "sphericity"
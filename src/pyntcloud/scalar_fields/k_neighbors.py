@@ -1,94 +1,297 @@
+from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
 from .base import ScalarField
-from ..utils.array import cov3D
+from .eigenvalues import EIGEN_FEATURES
+from ..utils.array import cov3D, eigh3x3, segment_cov3D
 
 
 class KNeighborsScalarField(ScalarField):
     """
     Parameters
     ----------
-    k_neighbors: ndarray
-        (N, k, 3) The k neighbours associated to each of the N points.
+    k_neighbors: ndarray, optional
+        (N, k) Indices of the k neighbours of each of the N points.
+    r_neighbors: tuple of ndarray, optional
+        (indptr, indices) Neighbourhoods of variable size in CSR format,
+        as returned by PyntCloud.get_neighbors(r=r, format="csr") or
+        PyntCloud.get_neighbors(k=k, r=r). Each neighbourhood is used as is,
+        so it must include its point. Used instead of k_neighbors.
+    r: float, optional
+        Default: None
+        Only used to name the columns computed from r_neighbors,
+        for example e1(r=0.5). e1(r) if None.
+    chunk_size: int, optional
+        Default: 100000
+        Number of neighbourhoods processed at once. Memory used is
+        proportional to chunk_size * k instead of N * k.
+    max_workers: int, optional
+        Default: 1
+        Number of threads processing chunks. See
+        concurrent.futures.ThreadPoolExecutor.
     """
 
-    def __init__(self, *, pyntcloud, k_neighbors):
+    def __init__(
+        self,
+        *,
+        pyntcloud,
+        k_neighbors=None,
+        r_neighbors=None,
+        r=None,
+        chunk_size=100000,
+        max_workers=1,
+    ):
         super().__init__(pyntcloud=pyntcloud)
-        # add each point to its neighborhood
-        self.k_neighbors_idx = np.c_[range(len(k_neighbors)), k_neighbors]
+        if (k_neighbors is None) == (r_neighbors is None):
+            raise ValueError("Exactly one of k_neighbors and r_neighbors is required")
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        if k_neighbors is not None:
+            self.neighbors = np.asarray(k_neighbors)
+            self.indptr = self.indices = None
+            # each point is added to its neighbourhood
+            self.k = self.neighbors.shape[1] + 1
+        else:
+            self.neighbors = None
+            self.indptr, self.indices = (np.asarray(x) for x in r_neighbors)
+            self.k = "r" if r is None else "r={}".format(r)
 
     def extract_info(self):
-        self.k_neighbors = self.pyntcloud.xyz[self.k_neighbors_idx]
+        self.xyz = self.pyntcloud.xyz
 
+    @property
+    def k_neighbors_idx(self):
+        """(N, k + 1) indices of each neighbourhood, including its point."""
+        return self.get_neighborhood_idx(0, len(self.neighbors))
 
-class EigenValues(KNeighborsScalarField):
-    """Compute the eigen values of each point's neighbourhood."""
+    @property
+    def k_neighbors(self):
+        """(N, k + 1, 3) coordinates of each neighbourhood. Not used by compute."""
+        return self.xyz[self.k_neighbors_idx]
+
+    def get_neighborhood_idx(self, start, end):
+        idx = np.empty((end - start, self.k), dtype=self.neighbors.dtype)
+        idx[:, 0] = np.arange(start, end)
+        idx[:, 1:] = self.neighbors[start:end]
+        return idx
+
+    def get_cov(self, start, end):
+        """(end - start, 3, 3) covariances of the neighbourhoods of those points."""
+        if self.neighbors is not None:
+            return cov3D(self.xyz[self.get_neighborhood_idx(start, end)])
+        indptr = self.indptr[start : end + 1]
+        indices = self.indices[indptr[0] : indptr[-1]]
+        return segment_cov3D(self.xyz[indices], indptr)
+
+    @property
+    @abstractmethod
+    def columns(self):
+        """Names of the columns added, one per value returned by compute_chunk."""
+        pass
+
+    @abstractmethod
+    def compute_chunk(self, cov):
+        """Compute the (n, len(self.columns)) values of n neighbourhood covariances."""
+        pass
 
     def compute(self):
-        cov = cov3D(self.k_neighbors)
-        eigenvalues = np.linalg.eigvals(cov)
-        sort = eigenvalues.argsort()
+        if self.neighbors is not None:
+            n = len(self.neighbors)
+        else:
+            n = len(self.indptr) - 1
+        values = np.empty((n, len(self.columns)))
+
+        def compute_chunk(start):
+            end = min(start + self.chunk_size, n)
+            values[start:end] = self.compute_chunk(self.get_cov(start, end))
 
-        # range from 0-shape[0] to allow indexing along axis 1 and 2
-        idx_trick = range(eigenvalues.shape[0])
+        starts = range(0, n, self.chunk_size)
+        if self.max_workers == 1:
+            for start in starts:
+                compute_chunk(start)
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                list(executor.map(compute_chunk, starts))
 
-        e1 = eigenvalues[idx_trick, sort[:, 2]]
-        e2 = eigenvalues[idx_trick, sort[:, 1]]
-        e3 = eigenvalues[idx_trick, sort[:, 0]]
+        for i, column in enumerate(self.columns):
+            self.to_be_added[column] = values[:, i]
 
-        k = self.k_neighbors.shape[1]
-        self.to_be_added["e1({})".format(k)] = e1
-        self.to_be_added["e2({})".format(k)] = e2
-        self.to_be_added["e3({})".format(k)] = e3
+
+class EigenValues(KNeighborsScalarField):
+    """Compute the eigen values of each point's neighbourhood."""
+
+    @property
+    def columns(self):
+        return ["e{}({})".format(i, self.k) for i in (1, 2, 3)]
+
+    def compute_chunk(self, cov):
+        return eigh3x3(cov, eigenvectors=False)
 
 
 class EigenDecomposition(KNeighborsScalarField):
     """Compute the eigen decomposition of each point's neighbourhood."""
 
-    def compute(self):
-        cov = cov3D(self.k_neighbors)
-        eigenvalues, eigenvectors = np.linalg.eig(cov)
-        sort = eigenvalues.argsort()
+    @property
+    def columns(self):
+        columns = ["e{}({})".format(i, self.k) for i in (1, 2, 3)]
+        for i in (1, 2, 3):
+            for axis in "xyz":
+                columns.append("ev{}_{}({})".format(i, axis, self.k))
+        return columns
 
-        # range from 0-shape[0] to allow indexing along axis 1 and 2
-        idx_trick = range(eigenvalues.shape[0])
+    def compute_chunk(self, cov):
+        eigenvalues, eigenvectors = eigh3x3(cov)
+        # ev1, ev2 and ev3 are the columns of eigenvectors
+        return np.hstack(
+            [eigenvalues, eigenvectors.transpose(0, 2, 1).reshape(len(cov), 9)]
+        )
 
-        e1 = eigenvalues[idx_trick, sort[:, 2]]
-        e2 = eigenvalues[idx_trick, sort[:, 1]]
-        e3 = eigenvalues[idx_trick, sort[:, 0]]
 
-        k = self.k_neighbors.shape[1]
-        self.to_be_added["e1({})".format(k)] = e1
-        self.to_be_added["e2({})".format(k)] = e2
-        self.to_be_added["e3({})".format(k)] = e3
+class GeometricFeatures(KNeighborsScalarField):
+    """Compute eigenvalue based features of each point's neighbourhood in one pass.
 
-        ev1 = eigenvectors[idx_trick, :, sort[:, 2]]
-        ev2 = eigenvectors[idx_trick, :, sort[:, 1]]
-        ev3 = eigenvectors[idx_trick, :, sort[:, 0]]
+    Equivalent to adding eigen_values followed by each of the features, without
+    storing the eigenvalues as columns.
 
-        self.to_be_added["ev1_x({})".format(k)] = ev1[:, 0]
-        self.to_be_added["ev1_y({})".format(k)] = ev1[:, 1]
-        self.to_be_added["ev1_z({})".format(k)] = ev1[:, 2]
+    Parameters
+    ----------
+    features: list of str, optional
+        Default: None
+        Keys of EIGEN_FEATURES. All of them if None.
+    """
 
-        self.to_be_added["ev2_x({})".format(k)] = ev2[:, 0]
-        self.to_be_added["ev2_y({})".format(k)] = ev2[:, 1]
-        self.to_be_added["ev2_z({})".format(k)] = ev2[:, 2]
+    def __init__(
+        self,
+        *,
+        pyntcloud,
+        k_neighbors=None,
+        r_neighbors=None,
+        r=None,
+        features=None,
+        chunk_size=100000,
+        max_workers=1,
+    ):
+        super().__init__(
+            pyntcloud=pyntcloud,
+            k_neighbors=k_neighbors,
+            r_neighbors=r_neighbors,
+            r=r,
+            chunk_size=chunk_size,
+            max_workers=max_workers,
+        )
+        if features is None:
+            features = list(EIGEN_FEATURES)
+        unknown = set(features) - set(EIGEN_FEATURES)
+        if unknown:
+            raise ValueError("Unsupported features: {}".format(sorted(unknown)))
+        self.features = list(features)
 
-        self.to_be_added["ev3_x({})".format(k)] = ev3[:, 0]
-        self.to_be_added["ev3_y({})".format(k)] = ev3[:, 1]
-        self.to_be_added["ev3_z({})".format(k)] = ev3[:, 2]
+    @property
+    def columns(self):
+        return ["{}({})".format(feature, self.k) for feature in self.features]
 
+    def compute_chunk(self, cov):
+        ev = eigh3x3(cov, eigenvectors=False)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.column_stack(
+                [EIGEN_FEATURES[feature](ev) for feature in self.features]
+            )
 
-class UnorientedNormals(KNeighborsScalarField):
-    """Compute normals using SVD."""
 
-    def compute(self):
-        cov = cov3D(self.k_neighbors)
-        u, s, v = np.linalg.svd(cov)
+class MultiScaleEigenValues(KNeighborsScalarField):
+    """Compute eigen values of nested neighbourhoods from a single neighbor query.
+
+    The neighbourhood at scale k is each point and its first k neighbors, so
+    k_neighbors must be sorted by distance, as returned by
+    PyntCloud.get_neighbors(k=max(scales)). Sums of x and x * x.T are
+    accumulated once over the neighbors, and read at each scale to get its
+    covariance.
+
+    Parameters
+    ----------
+    scales: list of int
+        Number of neighbors of each scale. At most k_neighbors.shape[1].
+        Columns are named like those of eigen_values with
+        k_neighbors[:, :scale], for example e1(11) for scale 10.
+    features: list of str, optional
+        Default: None
+        Keys of EIGEN_FEATURES computed at each scale instead of the
+        eigen values. See geometric_features.
+    """
+
+    def __init__(
+        self,
+        *,
+        pyntcloud,
+        k_neighbors,
+        scales,
+        features=None,
+        chunk_size=100000,
+        max_workers=1,
+    ):
+        super().__init__(
+            pyntcloud=pyntcloud,
+            k_neighbors=k_neighbors,
+            chunk_size=chunk_size,
+            max_workers=max_workers,
+        )
+        self.scales = sorted(set(scales))
+        if self.scales[0] < 1 or self.scales[-1] > self.neighbors.shape[1]:
+            raise ValueError(
+                "scales must be between 1 and {}".format(self.neighbors.shape[1])
+            )
+        if features is not None:
+            unknown = set(features) - set(EIGEN_FEATURES)
+            if unknown:
+                raise ValueError("Unsupported features: {}".format(sorted(unknown)))
+            features = list(features)
+        self.features = features
+
+    @property
+    def columns(self):
+        names = ["e1", "e2", "e3"] if self.features is None else self.features
+        return [
+            "{}({})".format(name, scale + 1) for scale in self.scales for name in names
+        ]
+
+    def get_cov(self, start, end):
+        """(end - start, len(self.scales), 3, 3) covariances at each scale."""
+        neighborhoods = self.xyz[self.get_neighborhood_idx(start, end)]
+        # centered on each point, for precision
+        diffs = (neighborhoods - neighborhoods[:, :1]).astype(np.float64)
+        n = len(diffs)
+        first = np.zeros((n, 3))
+        second = np.zeros((n, 3, 3))
+        cov = np.empty((n, len(self.scales), 3, 3))
+        previous = 0
+        for i, scale in enumerate(self.scales):
+            block = diffs[:, previous : scale + 1]
+            first += block.sum(1)
+            second += block.transpose(0, 2, 1) @ block
+            mean = first / (scale + 1)
+            cov[:, i] = second / (scale + 1) - mean[:, :, None] * mean[:, None, :]
+            previous = scale + 1
+        return cov
+
+    def compute_chunk(self, cov):
+        n = len(cov)
+        ev = eigh3x3(cov.reshape(-1, 3, 3), eigenvectors=False)
+        if self.features is not None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ev = np.column_stack(
+                    [EIGEN_FEATURES[feature](ev) for feature in self.features]
+                )
+        return ev.reshape(n, -1)
+
+
+class UnorientedNormals(KNeighborsScalarField):
+    """Compute normals as the eigenvector of the smallest eigenvalue."""
 
-        normals = u[:, :, -1]
+    @property
+    def columns(self):
+        return ["n{}({})".format(axis, self.k) for axis in "xyz"]
 
-        k = self.k_neighbors.shape[1]
-        self.to_be_added["nx({})".format(k)] = normals[:, 0]
-        self.to_be_added["ny({})".format(k)] = normals[:, 1]
-        self.to_be_added["nz({})".format(k)] = normals[:, 2]
+    def compute_chunk(self, cov):
+        return eigh3x3(cov)[1][:, :, 2]
@@ -1,4 +1,7 @@
 import numpy as np
+
+from scipy.sparse.csgraph import connected_components
+
 from .base import ScalarField
 
 
@@ -47,29 +50,33 @@ class VoxelN(VoxelgridScalarField):
 
 
 class EuclideanClusters(VoxelgridScalarField):
-    """Assing corresponding cluster to each point inside each voxel."""
+    """Assing corresponding cluster to each point inside each voxel.
 
-    def compute(self):
-        name = "{}({})".format("clusters", self.voxelgrid_id)
+    Clusters are the connected components of the occupied voxels, where each
+    voxel is connected to its 26 neighbors.
 
-        to_be_processed = np.zeros(self.voxelgrid.n_voxels, dtype=bool)
-        to_be_processed[np.unique(self.voxelgrid.voxel_n)] = True
+    Parameters
+    ----------
+    min_cluster_size: int, optional
+        Default: 1
+        Points of clusters with less points than this are labeled as -1.
+    """
 
-        clusters = np.zeros(self.voxelgrid.voxel_n.shape[0])
+    def __init__(self, *, pyntcloud, voxelgrid_id, min_cluster_size=1):
+        super().__init__(pyntcloud=pyntcloud, voxelgrid_id=voxelgrid_id)
+        self.min_cluster_size = min_cluster_size
+
+    def compute(self):
+        name = "{}({})".format("clusters", self.voxelgrid_id)
 
-        C = 0
-        while np.any(to_be_processed):
-            Q = []
-            Q.append(np.random.choice(np.where(to_be_processed)[0]))
+        _, voxel_index, voxel_counts = self.voxelgrid.get_occupied()
+        _, voxel_clusters = connected_components(
+            self.voxelgrid.get_adjacency(), directed=False
+        )
 
-            for voxel in Q:
-                clusters[np.where(self.voxelgrid.voxel_n == voxel)[0]] = C
-                to_be_processed[voxel] = False
-                neighbors = self.voxelgrid.get_voxel_neighbors(voxel)
-                for neighbor in neighbors:
-                    if to_be_processed[neighbor]:
-                        Q.append(neighbor)
-                        to_be_processed[neighbor] = False
-            C += 1
+        cluster_counts = np.bincount(voxel_clusters, weights=voxel_counts)
+        keep = cluster_counts >= self.min_cluster_size
+        # number the kept clusters consecutively
+        new_labels = np.where(keep, np.cumsum(keep) - 1, -1)
 
-        self.to_be_added[name] = clusters
+        self.to_be_added[name] = new_labels[voxel_clusters][voxel_index]
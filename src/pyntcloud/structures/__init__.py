@@ -5,11 +5,14 @@ HAKUNA MATATA
 from .convex_hull import ConvexHull
 from .delaunay import Delaunay3D
 from .kdtree import KDTree
+from .octree import Octree
 from .voxelgrid import VoxelGrid
+from .voxelgrid import VoxelGridSpec as VoxelGridSpec
 
 ALL_STRUCTURES = {
     "convex_hull": ConvexHull,
     "delaunay3D": Delaunay3D,
     "kdtree": KDTree,
+    "octree": Octree,
     "voxelgrid": VoxelGrid,
 }
@@ -1,15 +1,69 @@
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+import numpy as np
+
+from ..utils.array import hash_points
 
 
 class Structure(ABC):
     """Base class for structures."""
 
+    #: Attributes set by compute. See get_state.
+    _state = ("id",)
+
     def __init__(self, *, points):
         self._points = points
 
-    def get_and_set(self, pyntcloud):
-        pyntcloud.structures[self.id] = self
-        return self.id
+    def get_and_set(self, pyntcloud, params=None, fingerprint=None):
+        if params is not None and fingerprint is None:
+            fingerprint = points_fingerprint(pyntcloud.xyz)
+        return pyntcloud.structures.add(self, params=params, fingerprint=fingerprint)
+
+    def get_params(self):
+        """Keyword arguments, besides the extracted info, used to build the structure."""
+        return {}
+
+    def get_state(self):
+        """Attributes set by compute, used to restore the structure without computing it.
+
+        Values are numpy arrays, lists of numpy arrays or JSON serializable.
+        """
+        return {name: getattr(self, name) for name in self._state}
+
+    def set_state(self, state):
+        """Restore the output of get_state, as an alternative to compute."""
+        for name, val in state.items():
+            setattr(self, name, val)
+
+    @classmethod
+    def get_versions(cls):
+        """Versions the layout of get_state depends on.
+
+        States written with other versions are not restored, the structure is
+        computed again instead.
+        """
+        return {}
+
+    def get_nbytes(self):
+        """Approximate memory used by the structure, without the shared points."""
+        nbytes = 0
+        for key, val in vars(self).items():
+            if key == "_points":
+                continue
+            if isinstance(val, dict):
+                val = list(val.values())
+            if not isinstance(val, (list, tuple)):
+                val = [val]
+            for item in val:
+                if isinstance(item, np.ndarray):
+                    nbytes += item.nbytes
+                elif hasattr(item, "data") and isinstance(item.data, np.ndarray):
+                    # scipy.sparse matrices
+                    nbytes += (
+                        item.data.nbytes + item.indices.nbytes + item.indptr.nbytes
+                    )
+        return nbytes
 
     @classmethod
     def extract_info(cls, pyntcloud):
@@ -24,29 +78,157 @@ class Structure(ABC):
         pass
 
 
+def points_fingerprint(points):
+    """Shape, dtype and hash of the points, to detect when they change."""
+    return (points.shape, points.dtype.str, hash_points(points))
+
+
 class StructuresDict(dict):
-    """Custom class to restrict PyntCloud.structures assigment."""
+    """Custom class to restrict PyntCloud.structures assigment.
+
+    Structures are iterated in insertion order. Their use is tracked
+    separately, so reading does not reorder the dict. If max_structures or
+    max_nbytes are not None, the least recently used structures are evicted
+    when a new one exceeds the limits.
+    """
 
-    def __init__(self, *args):
+    def __init__(self, *args, max_structures=None, max_nbytes=None):
         self.n_voxelgrids = 0
         self.n_kdtrees = 0
         self.n_delaunays = 0
         self.n_convex_hulls = 0
-        super().__init__(*args)
-
-    def __setitem__(self, key, val):
-        if not issubclass(val.__class__, Structure):
-            raise TypeError("{} must be base.Structure subclass".format(key))
+        self.n_octrees = 0
+        self.max_structures = max_structures
+        self.max_nbytes = max_nbytes
+        # structure.id -> (structure class, params used to build it,
+        # fingerprint of the points it was built over)
+        self._signatures = {}
+        # structure.id -> None, from least to most recently used
+        self._recency = OrderedDict()
+        super().__init__()
+        for key, val in dict(*args).items():
+            self[key] = val
 
+    @staticmethod
+    def _counter(key):
         # TODO better structure.id check
         if key.startswith("V"):
-            self.n_voxelgrids += 1
+            return "n_voxelgrids"
         elif key.startswith("K"):
-            self.n_kdtrees += 1
+            return "n_kdtrees"
         elif key.startswith("D"):
-            self.n_delaunays += 1
+            return "n_delaunays"
         elif key.startswith("CH"):
-            self.n_convex_hulls += 1
-        else:
-            raise ValueError("{} is not a valid structure.id".format(key))
+            return "n_convex_hulls"
+        elif key.startswith("O"):
+            return "n_octrees"
+        raise ValueError("{} is not a valid structure.id".format(key))
+
+    def __setitem__(self, key, val):
+        if not issubclass(val.__class__, Structure):
+            raise TypeError("{} must be base.Structure subclass".format(key))
+
+        counter = self._counter(key)
+        if key in self:
+            del self[key]
+        setattr(self, counter, getattr(self, counter) + 1)
         super().__setitem__(key, val)
+        self._recency[key] = None
+        self.evict(keep=key)
+
+    def __getitem__(self, key):
+        val = super().__getitem__(key)
+        # mark as most recently used
+        self._recency.move_to_end(key)
+        return val
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        counter = self._counter(key)
+        setattr(self, counter, getattr(self, counter) - 1)
+        self._signatures.pop(key, None)
+        self._recency.pop(key, None)
+
+    def add(self, structure, params=None, fingerprint=None):
+        """Add a computed structure, remembering the params used to build it.
+
+        Parameters
+        ----------
+        structure: base.Structure
+            Computed structure.
+        params: dict, optional
+            Default: None
+            Output of structure.get_params() before calling compute().
+            If None, the structure will not be reused by find.
+        fingerprint: tuple, optional
+            Default: None
+            points_fingerprint of the points the structure was built over.
+
+        Returns
+        -------
+        structure.id: str
+        """
+        self[structure.id] = structure
+        if params is not None:
+            self._signatures[structure.id] = (structure.__class__, params, fingerprint)
+        return structure.id
+
+    def find(self, structure, fingerprint=None):
+        """Find a stored structure equivalent to the given, not computed, one.
+
+        Equivalent structures share class, params and the fingerprint of the
+        points they were built over, so structures built over points that
+        changed since, in place or not, are not reused. Only structures added
+        with params are considered.
+
+        Parameters
+        ----------
+        structure: base.Structure
+            Not computed structure.
+        fingerprint: tuple, optional
+            Default: None
+            points_fingerprint of the current points.
+
+        Returns
+        -------
+        structure.id: str or None
+            None if no equivalent structure is stored.
+        """
+        signature = (structure.__class__, structure.get_params(), fingerprint)
+        for key in super().keys():
+            if self._signatures.get(key) == signature:
+                # mark as most recently used
+                self._recency.move_to_end(key)
+                return key
+        return None
+
+    def get_params(self, key):
+        """Params used to build the structure, as given to add."""
+        signature = self._signatures.get(key)
+        if signature is None:
+            return self[key].get_params()
+        return signature[1]
+
+    def get_nbytes(self):
+        """Approximate memory used by all the stored structures."""
+        return sum(val.get_nbytes() for val in self.values())
+
+    def evict(self, keep=None):
+        """Remove least recently used structures until the limits are met.
+
+        Parameters
+        ----------
+        keep: str, optional
+            structure.id that is never evicted. Usually the one just added.
+        """
+        while True:
+            over_count = (
+                self.max_structures is not None and len(self) > self.max_structures
+            )
+            over_nbytes = (
+                self.max_nbytes is not None and self.get_nbytes() > self.max_nbytes
+            )
+            candidates = [key for key in self._recency if key != keep]
+            if not (over_count or over_nbytes) or not candidates:
+                break
+            del self[candidates[0]]
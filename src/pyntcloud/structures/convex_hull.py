@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from scipy.spatial import ConvexHull as scipy_ConvexHull
 
@@ -6,11 +7,33 @@ from .base import Structure
 
 
 class ConvexHull(scipy_ConvexHull, Structure):
+    _state = (
+        "id",
+        "simplices",
+        "neighbors",
+        "equations",
+        "coplanar",
+        "good",
+        "volume",
+        "area",
+        "nsimplex",
+        "ndim",
+        "npoints",
+        "min_bound",
+        "max_bound",
+    )
+
     def __init__(self, points, incremental=False, qhull_options=None):
         Structure.__init__(self, points=points)
         self._incremental = incremental
         self._qhull_options = qhull_options
 
+    def get_params(self):
+        return {
+            "incremental": self._incremental,
+            "qhull_options": self._qhull_options,
+        }
+
     def compute(self):
         """ABC API"""
         self.id = "CH({})".format(self._qhull_options)
@@ -18,6 +41,16 @@ class ConvexHull(scipy_ConvexHull, Structure):
             self, self._points, self._incremental, self._qhull_options
         )
 
+    def set_state(self, state):
+        """Restore the hull without running Qhull.
+
+        The restored structure can't add points incrementally.
+        """
+        super().set_state(state)
+        self._points = np.ascontiguousarray(self._points, dtype=np.float64)
+        self._qhull = None
+        self._vertices = None
+
     def get_mesh(self):
         """
         Use convex hull simplices to build mesh.
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from scipy.spatial import Delaunay
 from itertools import combinations
@@ -6,6 +7,23 @@ from .base import Structure
 
 
 class Delaunay3D(Delaunay, Structure):
+    _state = (
+        "id",
+        "paraboloid_scale",
+        "paraboloid_shift",
+        "simplices",
+        "neighbors",
+        "equations",
+        "coplanar",
+        "good",
+        "nsimplex",
+        "ndim",
+        "npoints",
+        "min_bound",
+        "max_bound",
+        "furthest_site",
+    )
+
     def __init__(
         self, points, furthest_site=False, incremental=False, qhull_options=None
     ):
@@ -14,6 +32,13 @@ class Delaunay3D(Delaunay, Structure):
         self._incremental = incremental
         self._qhull_options = qhull_options
 
+    def get_params(self):
+        return {
+            "furthest_site": self._furthest_site,
+            "incremental": self._incremental,
+            "qhull_options": self._qhull_options,
+        }
+
     def compute(self):
         """ABC API"""
         self.id = "D({},{})".format(self._furthest_site, self._qhull_options)
@@ -25,6 +50,18 @@ class Delaunay3D(Delaunay, Structure):
             self._qhull_options,
         )
 
+    def set_state(self, state):
+        """Restore the triangulation without running Qhull.
+
+        The restored structure can't add points incrementally.
+        """
+        super().set_state(state)
+        self._points = np.ascontiguousarray(self._points, dtype=np.float64)
+        self._qhull = None
+        self._transform = None
+        self._vertex_to_simplex = None
+        self._vertex_neighbor_vertices = None
+
     def get_mesh(self):
         """
         Decompose the tetrahedrons into triangles to build mesh.
@@ -1,8 +1,26 @@
+import numpy as np
+import scipy
 from scipy.spatial import KDTree as sKDTree
 
 from .base import Structure
 
 
+# names of the items of cKDTree.__getstate__, a private layout that may change
+# between SciPy versions
+CKDTREE_STATE = (
+    "tree",
+    "data",
+    "n",
+    "m",
+    "leafsize",
+    "maxes",
+    "mins",
+    "indices",
+    "boxsize",
+    "boxsize_data",
+)
+
+
 class KDTree(sKDTree, Structure):
     def __init__(
         self, *, points, leafsize=16, compact_nodes=False, balanced_tree=False
@@ -12,6 +30,47 @@ class KDTree(sKDTree, Structure):
         self._compact_nodes = compact_nodes
         self._balanced_tree = balanced_tree
 
+    def get_params(self):
+        return {
+            "leafsize": self._leafsize,
+            "compact_nodes": self._compact_nodes,
+            "balanced_tree": self._balanced_tree,
+        }
+
+    def get_nbytes(self):
+        # the tree nodes live in C memory, count the index array as estimation
+        return self.indices.nbytes
+
+    def get_state(self):
+        values = self.__getstate__()
+        if len(values) != len(CKDTREE_STATE):
+            raise ValueError(
+                "cKDTree state has {} items, expected {}".format(
+                    len(values), len(CKDTREE_STATE)
+                )
+            )
+        state = dict(zip(CKDTREE_STATE, values))
+        # data is a float64 view or copy of the points
+        del state["data"]
+        state["id"] = self.id
+        return state
+
+    def set_state(self, state):
+        state = dict(state)
+        self.id = state.pop("id")
+        state["data"] = np.ascontiguousarray(self._points, dtype=np.float64)
+        if set(state) != set(CKDTREE_STATE):
+            raise ValueError(
+                "cKDTree state has items {}, expected {}".format(
+                    sorted(state), sorted(CKDTREE_STATE)
+                )
+            )
+        self.__setstate__(tuple(state[name] for name in CKDTREE_STATE))
+
+    @classmethod
+    def get_versions(cls):
+        return {"scipy": scipy.__version__, "state_length": len(CKDTREE_STATE)}
+
     def compute(self):
         self.id = "K({},{},{})".format(
             self._leafsize, self._compact_nodes, self._balanced_tree
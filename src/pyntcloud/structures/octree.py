@@ -0,0 +1,395 @@
+import numpy as np
+
+from .base import Structure
+
+# 3 bits per level must fit in the uint64 Morton codes
+MAX_LEVEL = 21
+
+SPREAD_MASKS = [
+    (32, 0x1F00000000FFFF),
+    (16, 0x1F0000FF0000FF),
+    (8, 0x100F00F00F00F00F),
+    (4, 0x10C30C30C30C30C3),
+    (2, 0x1249249249249249),
+]
+
+
+def spread_bits(v):
+    """Insert two zero bits between each of the 21 lower bits of v."""
+    v = v.astype(np.uint64) & np.uint64(0x1FFFFF)
+    for shift, mask in SPREAD_MASKS:
+        v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+    return v
+
+
+def compact_bits(v):
+    """Inverse of spread_bits."""
+    v = v.astype(np.uint64) & np.uint64(SPREAD_MASKS[-1][1])
+    masks = [mask for _, mask in SPREAD_MASKS[:-1]][::-1] + [0x1FFFFF]
+    for (shift, _), mask in zip(SPREAD_MASKS[::-1], masks):
+        v = (v ^ (v >> np.uint64(shift))) & np.uint64(mask)
+    return v
+
+
+def morton_encode(ijk):
+    """Interleave the bits of (N, 3) non negative ints (< 2**21) into (N,) uint64.
+
+    x takes the most significant bit of each group of 3, so the octant of a
+    child inside its parent is 4 * x_bit + 2 * y_bit + z_bit.
+    """
+    ijk = np.asarray(ijk)
+    codes = spread_bits(ijk[:, 0]) << np.uint64(2)
+    codes |= spread_bits(ijk[:, 1]) << np.uint64(1)
+    codes |= spread_bits(ijk[:, 2])
+    return codes
+
+
+def morton_decode(codes):
+    """Inverse of morton_encode, returning (N, 3) uint64."""
+    codes = np.asarray(codes, dtype=np.uint64)
+    return np.stack(
+        [compact_bits(codes >> np.uint64(2 - axis)) for axis in range(3)], axis=1
+    )
+
+
+def expand_ranges(starts, ends):
+    """Concatenate np.arange(start, end) for each range."""
+    lengths = ends - starts
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return np.arange(lengths.sum()) + offsets
+
+
+class Octree(Structure):
+    _state = ("id", "xyzmin", "size", "codes", "order", "leaf_n")
+
+    def __init__(self, *, points, max_level=10, max_points=None):
+        """Octree built from the Morton sorted points.
+
+        Only occupied nodes exist: each node is a contiguous range of the
+        sorted Morton codes, so memory grows with the number of points and
+        not with the volume of the bounding box.
+
+        Parameters
+        ----------
+        points: (N, 3) numpy.array
+        max_level: int, optional
+            Default: 10
+            Depth of the deepest nodes, up to 21. At level l each axis of the
+            bounding cube is divided into 2 ** l segments.
+        max_points: int, optional
+            Default: None
+            If not None, nodes with max_points or less points are leaves and
+            queries don't descend into them. Otherwise, leaves are at max_level.
+        """
+        super().__init__(points=points)
+        if not 0 < max_level <= MAX_LEVEL:
+            raise ValueError("max_level must be between 1 and {}".format(MAX_LEVEL))
+        self.max_level = max_level
+        self.max_points = max_points
+
+        self.id = None
+        self.xyzmin = None
+        self.size = None
+        self.codes = None
+        self.order = None
+        self.leaf_n = None
+
+    def get_params(self):
+        return {"max_level": self.max_level, "max_points": self.max_points}
+
+    def compute(self):
+        self.id = "O({},{})".format(self.max_level, self.max_points)
+
+        points = np.asarray(self._points, dtype=np.float64)
+        self.xyzmin = points.min(0)
+        # the octree splits a cube
+        self.size = (points.max(0) - self.xyzmin).max() or 1.0
+
+        codes = morton_encode(self.quantize(points))
+        self.order = np.argsort(codes, kind="stable")
+        self.codes = codes[self.order]
+
+        leaf_starts = []
+        level, keys = 0, np.zeros(1, dtype=np.uint64)
+        starts, ends = np.zeros(1, dtype=np.int64), np.full(1, len(codes))
+        while len(keys):
+            is_leaf = self.is_leaf(level, starts, ends)
+            leaf_starts.append(starts[is_leaf])
+            level, keys, starts, ends, _ = self.children(
+                level, keys[~is_leaf], starts[~is_leaf], ends[~is_leaf]
+            )
+        leaf_starts = np.sort(np.concatenate(leaf_starts))
+        sorted_leaf_n = np.zeros(len(codes), dtype=np.int64)
+        sorted_leaf_n[leaf_starts[1:]] = 1
+        self.leaf_n = np.empty_like(sorted_leaf_n)
+        self.leaf_n[self.order] = np.cumsum(sorted_leaf_n)
+
+    @property
+    def n_leaves(self):
+        return int(self.leaf_n.max()) + 1
+
+    def quantize(self, points):
+        """Integer coordinates of the max_level nodes containing the points.
+
+        Points outside of the bounding cube are clipped to its border.
+        """
+        n = 2**self.max_level
+        ijk = np.floor((points - self.xyzmin) * (n / self.size))
+        return np.clip(ijk, 0, n - 1).astype(np.uint64)
+
+    def is_leaf(self, level, starts, ends):
+        if level == self.max_level:
+            return np.ones(len(starts), dtype=bool)
+        if self.max_points is None:
+            return np.zeros(len(starts), dtype=bool)
+        return ends - starts <= self.max_points
+
+    def children(self, level, keys, starts, ends):
+        """Non empty children of the given nodes.
+
+        Returns
+        -------
+        level: int
+        keys, starts, ends: (M,) ndarray
+            Morton code of each child at level and its range in self.codes.
+        parent: (M,) ndarray
+            Index of the parent of each child.
+        """
+        # no children below max_level, keys is empty there
+        shift = np.uint64(3 * max(self.max_level - level - 1, 0))
+        child_keys = keys[:, None] * np.uint64(8) + np.arange(9, dtype=np.uint64)
+        bounds = np.searchsorted(self.codes, (child_keys << shift).ravel())
+        bounds = bounds.reshape(-1, 9)
+        child_starts = bounds[:, :-1].ravel()
+        child_ends = bounds[:, 1:].ravel()
+        not_empty = child_ends > child_starts
+        return (
+            level + 1,
+            child_keys[:, :-1].ravel()[not_empty],
+            child_starts[not_empty],
+            child_ends[not_empty],
+            np.repeat(np.arange(len(keys)), 8)[not_empty],
+        )
+
+    def node_bounds(self, level, keys):
+        """Lower and upper corners of the given nodes at level."""
+        node_size = self.size / 2**level
+        lower = self.xyzmin + morton_decode(keys) * node_size
+        return lower, lower + node_size
+
+    def get_level(self, level):
+        """Occupied nodes at level.
+
+        Returns
+        -------
+        keys: (M,) uint64 ndarray
+            Morton code of each node at level, sorted.
+        counts: (M,) int ndarray
+            Number of points inside each node.
+        """
+        node_codes = self.codes >> np.uint64(3 * (self.max_level - level))
+        starts = np.flatnonzero(np.r_[True, node_codes[1:] != node_codes[:-1]])
+        return node_codes[starts], np.diff(np.r_[starts, len(node_codes)])
+
+    def get_occupancy(self, level):
+        """Fraction of the nodes at level that hold any point."""
+        return len(self.get_level(level)[0]) / 8.0**level
+
+    def get_level_n(self, level):
+        """Index, in get_level(level), of the node containing each point."""
+        node_codes = self.codes >> np.uint64(3 * (self.max_level - level))
+        sorted_level_n = np.cumsum(np.r_[False, node_codes[1:] != node_codes[:-1]])
+        level_n = np.empty(len(node_codes), dtype=np.int64)
+        level_n[self.order] = sorted_level_n
+        return level_n
+
+    def get_level_centers(self, level):
+        """Centers of the occupied nodes at level."""
+        lower, upper = self.node_bounds(level, self.get_level(level)[0])
+        return (lower + upper) / 2
+
+    def get_level_of_detail(self, level):
+        """Indices of the points closest to the center of each occupied node at level.
+
+        Selecting a coarser level gives a sparser, evenly distributed subset.
+        """
+        level_n = self.get_level_n(level)
+        centers = self.get_level_centers(level)
+        distances = np.linalg.norm(self._points - centers[level_n], axis=1)
+        order = np.lexsort((distances, level_n))
+        first = np.r_[True, level_n[order][1:] != level_n[order][:-1]]
+        return order[first]
+
+    def traverse(self, classify, n_queries=1):
+        """Walk down the octree keeping the nodes accepted by classify.
+
+        Parameters
+        ----------
+        classify: callable
+            classify(query_n, lower, upper) returns, for each node and query,
+            0 if the node can be discarded, 2 if all its points are accepted
+            and 1 if its points have to be checked one by one.
+        n_queries: int, optional
+            Default: 1
+
+        Returns
+        -------
+        query_n, starts, ends, accepted: (M,) ndarray
+            Ranges of self.codes to be checked for each query. Ranges where
+            accepted is True don't need to be checked.
+        """
+        query_n = np.arange(n_queries)
+        keys = np.zeros(n_queries, dtype=np.uint64)
+        starts = np.zeros(n_queries, dtype=np.int64)
+        ends = np.full(n_queries, len(self.codes))
+        level = 0
+        found = []
+        while len(query_n):
+            result = classify(query_n, *self.node_bounds(level, keys))
+            inside = result == 2
+            found.append(
+                (query_n[inside], starts[inside], ends[inside], inside[inside])
+            )
+            check = result == 1
+            done = check & self.is_leaf(level, starts, ends)
+            found.append((query_n[done], starts[done], ends[done], ~done[done]))
+            descend = check & ~done
+
+            level, keys, starts, ends, parent = self.children(
+                level, keys[descend], starts[descend], ends[descend]
+            )
+            query_n = query_n[descend][parent]
+
+        return tuple(np.concatenate(x) for x in zip(*found))
+
+    def query_box(self, lower, upper):
+        """Indices of the points inside the box [lower, upper].
+
+        Parameters
+        ----------
+        lower, upper: (3,) array-like
+            Opposite corners of the box.
+
+        Returns
+        -------
+        indices: (M,) int ndarray
+            Sorted.
+        """
+        lower = np.asarray(lower, dtype=np.float64)
+        upper = np.asarray(upper, dtype=np.float64)
+
+        def classify(query_n, node_lower, node_upper):
+            outside = np.any((node_lower > upper) | (node_upper < lower), axis=1)
+            inside = np.all((node_lower >= lower) & (node_upper <= upper), axis=1)
+            return np.where(outside, 0, np.where(inside, 2, 1))
+
+        _, starts, ends, accepted = self.traverse(classify)
+        indices = self.order[expand_ranges(starts, ends)]
+        points = self._points[indices]
+        keep = np.repeat(accepted, ends - starts) | np.all(
+            (points >= lower) & (points <= upper), axis=1
+        )
+        return np.sort(indices[keep])
+
+    def ball_pairs(self, x, r):
+        """(query, point, distance) triplets of the points within r of each x."""
+        x = np.asarray(x, dtype=np.float64)
+        r = np.broadcast_to(np.asarray(r, dtype=np.float64), (len(x),))
+
+        def classify(query_n, node_lower, node_upper):
+            center = x[query_n]
+            nearest = np.clip(center, node_lower, node_upper)
+            near = np.linalg.norm(center - nearest, axis=1)
+            far = np.linalg.norm(
+                np.maximum(np.abs(center - node_lower), np.abs(center - node_upper)),
+                axis=1,
+            )
+            return np.where(near > r[query_n], 0, np.where(far <= r[query_n], 2, 1))
+
+        query_n, starts, ends, _ = self.traverse(classify, len(x))
+        lengths = ends - starts
+        query_n = np.repeat(query_n, lengths)
+        indices = self.order[expand_ranges(starts, ends)]
+        distances = np.linalg.norm(self._points[indices] - x[query_n], axis=1)
+        keep = distances <= r[query_n]
+        return query_n[keep], indices[keep], distances[keep]
+
+    def query_ball_point(self, x, r):
+        """Indices of the points within distance r of x.
+
+        Parameters
+        ----------
+        x: (3,) or (M, 3) array-like
+        r: float or (M,) array-like
+
+        Returns
+        -------
+        indices: int ndarray or list of int ndarray
+            Sorted indices for each point in x.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        single = x.ndim == 1
+        x = np.atleast_2d(x)
+        query_n, indices, _ = self.ball_pairs(x, r)
+        order = np.lexsort((indices, query_n))
+        counts = np.bincount(query_n, minlength=len(x))
+        result = np.split(indices[order], np.cumsum(counts)[:-1])
+        return result[0] if single else result
+
+    def query(self, x, k=1):
+        """Distances and indices of the k nearest neighbors of x.
+
+        Parameters
+        ----------
+        x: (3,) or (M, 3) array-like
+        k: int, optional
+            Default: 1
+
+        Returns
+        -------
+        distances, indices: ndarray
+            Same shapes as scipy.spatial.KDTree.query.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        single = x.ndim == 1
+        x = np.atleast_2d(x)
+        if not 0 < k <= len(self.codes):
+            raise ValueError("k must be between 1 and the number of points")
+
+        # the k-th closest point of the deepest node holding k points around x
+        # bounds the search radius
+        codes = morton_encode(self.quantize(x))
+        starts = np.zeros(len(x), dtype=np.int64)
+        ends = np.full(len(x), len(self.codes))
+        for level in range(self.max_level, 0, -1):
+            missing = np.flatnonzero(ends - starts == len(self.codes))
+            if not len(missing):
+                break
+            shift = np.uint64(3 * (self.max_level - level))
+            keys = codes[missing] >> shift
+            node_starts = np.searchsorted(self.codes, keys << shift)
+            node_ends = np.searchsorted(self.codes, (keys + np.uint64(1)) << shift)
+            found = node_ends - node_starts >= k
+            starts[missing[found]] = node_starts[found]
+            ends[missing[found]] = node_ends[found]
+        query_n = np.repeat(np.arange(len(x)), ends - starts)
+        indices = self.order[expand_ranges(starts, ends)]
+        distances = np.linalg.norm(self._points[indices] - x[query_n], axis=1)
+        order = np.lexsort((distances, query_n))
+        radius = distances[order][
+            np.searchsorted(query_n[order], np.arange(len(x))) + k - 1
+        ]
+
+        query_n, indices, distances = self.ball_pairs(x, radius * (1 + 1e-9))
+        order = np.lexsort((distances, query_n))
+        query_n, indices, distances = query_n[order], indices[order], distances[order]
+        group_starts = np.searchsorted(query_n, np.arange(len(x)))
+        take = (group_starts[:, None] + np.arange(k)).ravel()
+        distances = distances[take].reshape(-1, k)
+        indices = indices[take].reshape(-1, k)
+
+        if k == 1:
+            distances, indices = distances[:, 0], indices[:, 0]
+        if single:
+            distances, indices = distances[0], indices[0]
+        return distances, indices
@@ -1,20 +1,197 @@
 import numpy as np
 
+from scipy.sparse import coo_matrix
 from scipy.spatial import KDTree
 
 from .base import Structure
 from ..plot.voxelgrid import plot_voxelgrid
-from ..utils.array import cartesian
+from ..utils.array import cartesian, index_dtype
 
 try:
     from ..utils.numba import groupby_max, groupby_count, groupby_sum
+    from ..utils.numba import voxelize as voxelize_numba
 
     is_numba_avaliable = True
 except ImportError:
     is_numba_avaliable = False
 
 
+def voxelize(segments, x_y_z, points):
+    """Index of the voxel containing each point, along each axis and raveled.
+
+    Segments are uniform, so indices are computed arithmetically in a single
+    pass (with numba, if available) instead of searching the segments.
+
+    Parameters
+    ----------
+    segments: list of 3 ndarray
+        Limits of the voxels along each axis. See VoxelGrid.segments.
+    x_y_z: (3,) array-like of int
+        Number of voxels along each axis.
+    points: (N, 3) ndarray
+
+    Returns
+    -------
+    voxel_x, voxel_y, voxel_z: (N,) int32 ndarray
+    voxel_n: (N,) int32 or int64 ndarray
+        Voxel indices in 3D array using 'C' order. int64 only if n_voxels
+        doesn't fit in int32.
+    """
+    x_y_z = [int(n) for n in x_y_z]
+    inv_steps = np.array(
+        [n / (s[-1] - s[0]) if s[-1] > s[0] else 0.0 for n, s in zip(x_y_z, segments)]
+    )
+    n_points = len(points)
+    voxel_x, voxel_y, voxel_z = (np.empty(n_points, dtype=np.int32) for _ in range(3))
+    voxel_n = np.empty(n_points, dtype=index_dtype(np.prod(x_y_z, dtype=np.int64)))
+
+    if is_numba_avaliable:
+        voxelize_numba(
+            points,
+            *(np.asarray(s, dtype=np.float64) for s in segments),
+            inv_steps,
+            voxel_x,
+            voxel_y,
+            voxel_z,
+            voxel_n,
+        )
+        return voxel_x, voxel_y, voxel_z, voxel_n
+
+    for axis, out in enumerate([voxel_x, voxel_y, voxel_z]):
+        s = segments[axis]
+        n = x_y_z[axis]
+        values = points[:, axis]
+        index = np.ceil((values - s[0]) * inv_steps[axis])
+        np.clip(index - 1, 0, n - 1, out=index)
+        out[:] = index
+        # same result as np.searchsorted(s, values) - 1, despite rounding errors
+        out -= (out > 0) & (values <= s[out])
+        out += (out < n - 1) & (values > s[out + 1])
+
+    np.multiply(voxel_x, x_y_z[1], out=voxel_n)
+    voxel_n += voxel_y
+    voxel_n *= x_y_z[2]
+    voxel_n += voxel_z
+    return voxel_x, voxel_y, voxel_z, voxel_n
+
+
+def query_voxelgrid(segments, x_y_z, points):
+    """Index of the voxel containing each point.
+
+    Only the segments and x_y_z of a VoxelGrid are needed, so points can be
+    queried without keeping the VoxelGrid around.
+
+    Parameters
+    ----------
+    segments: list of 3 ndarray
+        See VoxelGrid.segments.
+    x_y_z: (3,) array-like of int
+        See VoxelGrid.x_y_z.
+    points: (N, 3) ndarray
+
+    Returns
+    -------
+    voxel_n: (N,) int ndarray
+        Voxel indices in 3D array using 'C' order. Points outside of the
+        voxel grid get the index of the closest voxel on its border.
+    """
+    return voxelize(segments, x_y_z, points)[3]
+
+
+def voxel_centers(segments, x_y_z, voxel_n):
+    """Centers of the given voxels.
+
+    Parameters
+    ----------
+    segments: list of 3 ndarray
+        See VoxelGrid.segments.
+    x_y_z: (3,) array-like of int
+        See VoxelGrid.x_y_z.
+    voxel_n: int or (M,) int ndarray
+        Voxel indices in 3D array using 'C' order.
+
+    Returns
+    -------
+    centers: (M, 3) float32 ndarray
+    """
+    voxel_xyz = np.unravel_index(np.atleast_1d(voxel_n), x_y_z)
+    centers = np.empty((len(voxel_xyz[0]), 3), dtype=np.float32)
+    for i in range(3):
+        s = segments[i]
+        centers[:, i] = (s[voxel_xyz[i] + 1] + s[voxel_xyz[i]]) / 2
+    return centers
+
+
+class VoxelGridSpec(object):
+    def __init__(self, xyzmin, xyzmax, x_y_z):
+        """Bounds and number of voxels of a grid, without per point or per voxel arrays.
+
+        Enough to query new points and get voxel centers against a fixed grid,
+        and pickled in a few hundred bytes, so it can be sent to worker
+        processes. Usually obtained with VoxelGrid.get_spec.
+
+        Parameters
+        ----------
+        xyzmin, xyzmax: (3,) array-like of float
+            Bounding box of the grid.
+        x_y_z: (3,) array-like of int
+            Number of voxels along each axis.
+        """
+        self.xyzmin = np.asarray(xyzmin)
+        self.xyzmax = np.asarray(xyzmax)
+        self.x_y_z = np.asarray(x_y_z)
+
+    @classmethod
+    def from_bounds(cls, xyzmin, xyzmax, sizes):
+        """Grid with voxels of the given sizes covering xyzmin to xyzmax.
+
+        xyzmax is extended when the range along an axis is not a multiple of
+        the voxel size.
+        """
+        xyzmin = np.asarray(xyzmin, dtype=np.float64)
+        sizes = np.asarray(sizes, dtype=np.float64)
+        x_y_z = np.maximum(np.ceil((np.asarray(xyzmax) - xyzmin) / sizes), 1)
+        x_y_z = x_y_z.astype(np.int64)
+        return cls(xyzmin, xyzmin + x_y_z * sizes, x_y_z)
+
+    @property
+    def segments(self):
+        """Limits of the voxels along each axis, same as VoxelGrid.segments."""
+        return [
+            np.linspace(self.xyzmin[i], self.xyzmax[i], num=(self.x_y_z[i] + 1))
+            for i in range(3)
+        ]
+
+    @property
+    def n_voxels(self):
+        return np.prod(self.x_y_z)
+
+    def query(self, points):
+        """See query_voxelgrid."""
+        return query_voxelgrid(self.segments, self.x_y_z, points)
+
+    def centers_of(self, voxel_n):
+        """See voxel_centers."""
+        return voxel_centers(self.segments, self.x_y_z, voxel_n)
+
+
 class VoxelGrid(Structure):
+    _state = (
+        "id",
+        "x_y_z",
+        "xyzmin",
+        "xyzmax",
+        "segments",
+        "shape",
+        "n_voxels",
+        "voxel_x",
+        "voxel_y",
+        "voxel_z",
+        "voxel_n",
+        "voxel_centers",
+        "voxel_colors",
+    )
+
     def __init__(
         self,
         *,
@@ -27,6 +204,7 @@ class VoxelGrid(Structure):
         size_y=None,
         size_z=None,
         regular_bounding_box=True,
+        sparse=False,
     ):
         """Grid of voxels with support for different build methods.
 
@@ -48,12 +226,19 @@ class VoxelGrid(Structure):
             Default: True
             If True, the bounding box of the point cloud will be adjusted
             in order to have all the dimensions of equal length.
+        sparse : bool, optional
+            Default: False
+            If True, only the occupied voxels are stored: voxel_centers only
+            holds the centers of occupied_voxels and feature vectors are
+            returned as (occupied_voxels, values) pairs, so memory scales with
+            the number of occupied voxels instead of n_voxels.
         """
         super().__init__(points=points)
         self.colors = colors
         self.x_y_z = np.asarray([n_x, n_y, n_z])
         self.sizes = np.asarray([size_x, size_y, size_z])
         self.regular_bounding_box = regular_bounding_box
+        self.sparse = sparse
 
         self.id = None
         self.xyzmin, self.xyzmax = None, None
@@ -64,6 +249,17 @@ class VoxelGrid(Structure):
         self.voxel_n = None
         self.voxel_centers = None
         self.voxel_colors = None
+        self._occupied = None
+        self._adjacency = {}
+
+    def get_params(self):
+        params = {}
+        for axis, n, size in zip("xyz", self.x_y_z, self.sizes):
+            params["n_" + axis] = int(n)
+            params["size_" + axis] = None if size is None else float(size)
+        params["regular_bounding_box"] = bool(self.regular_bounding_box)
+        params["sparse"] = bool(self.sparse)
+        return params
 
     @classmethod
     def extract_info(cls, pyntcloud):
@@ -119,27 +315,25 @@ class VoxelGrid(Structure):
         self.id = "V({},{},{})".format(
             self.x_y_z, self.sizes, self.regular_bounding_box
         )
+        if self.sparse:
+            self.id = self.id[:-1] + ",sparse)"
 
         # find where each point lies in corresponding segmented axis
-        # -1 so index are 0-based; clip for edge cases
-        self.voxel_x = np.clip(
-            np.searchsorted(self.segments[0], self._points[:, 0]) - 1, 0, self.x_y_z[0]
-        )
-        self.voxel_y = np.clip(
-            np.searchsorted(self.segments[1], self._points[:, 1]) - 1, 0, self.x_y_z[1]
-        )
-        self.voxel_z = np.clip(
-            np.searchsorted(self.segments[2], self._points[:, 2]) - 1, 0, self.x_y_z[2]
-        )
-        self.voxel_n = np.ravel_multi_index(
-            [self.voxel_x, self.voxel_y, self.voxel_z], self.x_y_z
+        self.voxel_x, self.voxel_y, self.voxel_z, self.voxel_n = voxelize(
+            self.segments, self.x_y_z, self._points
         )
 
+        self._occupied = None
+        self._adjacency = {}
+
         # compute center of each voxel
-        midsegments = [
-            (self.segments[i][1:] + self.segments[i][:-1]) / 2 for i in range(3)
-        ]
-        self.voxel_centers = cartesian(midsegments).astype(np.float32)
+        if self.sparse:
+            self.voxel_centers = self.centers_of(self.occupied_voxels)
+        else:
+            midsegments = [
+                (self.segments[i][1:] + self.segments[i][:-1]) / 2 for i in range(3)
+            ]
+            self.voxel_centers = cartesian(midsegments).astype(np.float32)
 
         # compute voxel colors
         if self.colors is not None:
@@ -154,37 +348,73 @@ class VoxelGrid(Structure):
             averaged_colors = np.sqrt(summed_colors / repeated_counts)
             self.voxel_colors = np.rint(averaged_colors).astype(np.uint8)
 
+    @property
+    def occupied_voxels(self):
+        """Sorted voxel_n of the voxels with at least one point."""
+        return self.get_occupied()[0]
+
+    def get_occupied(self):
+        """Occupied voxels, with the voxel of each point and their counts.
+
+        Returns
+        -------
+        occupied_voxels: (V,) int ndarray
+            Sorted voxel_n of the voxels with at least one point.
+        voxel_index: (N,) int ndarray
+            Index of the voxel of each point in occupied_voxels.
+        counts: (V,) int ndarray
+            Number of points inside each occupied voxel.
+        """
+        if self._occupied is None:
+            self._occupied = np.unique(
+                self.voxel_n, return_inverse=True, return_counts=True
+            )
+        return self._occupied
+
+    def centers_of(self, voxel_n):
+        """Return the centers of the given voxels.
+
+        Parameters
+        ----------
+        voxel_n: int or (M,) int ndarray
+            Voxel indices in 3D array using 'C' order.
+
+        Returns
+        -------
+        centers: (M, 3) float32 ndarray
+        """
+        return voxel_centers(self.segments, self.x_y_z, voxel_n)
+
     def query(self, points):
         """ABC API. Query structure.
 
-        TODO Make query_voxelgrid an independent function, and add a light
-        save mode where only segments and x_y_z are saved.
+        See query_voxelgrid.
         """
-        voxel_x = np.clip(
-            np.searchsorted(self.segments[0], points[:, 0]) - 1, 0, self.x_y_z[0]
-        )
-        voxel_y = np.clip(
-            np.searchsorted(self.segments[1], points[:, 1]) - 1, 0, self.x_y_z[1]
-        )
-        voxel_z = np.clip(
-            np.searchsorted(self.segments[2], points[:, 2]) - 1, 0, self.x_y_z[2]
-        )
-        voxel_n = np.ravel_multi_index([voxel_x, voxel_y, voxel_z], self.x_y_z)
+        return query_voxelgrid(self.segments, self.x_y_z, points)
 
-        return voxel_n
+    def get_spec(self):
+        """Return a VoxelGridSpec of this grid, to query points without keeping it."""
+        return VoxelGridSpec(self.xyzmin, self.xyzmax, self.x_y_z.copy())
 
-    def get_feature_vector(self, mode="binary"):
+    def get_feature_vector(self, mode="binary", sparse=None):
         """Return a vector of size self.n_voxels. See mode options below.
 
         Parameters
         ----------
         mode: str in available modes. See Notes
             Default "binary"
+        sparse: bool, optional
+            Default: None
+            If True, only the values of the occupied voxels are computed.
+            If None, self.sparse is used.
 
         Returns
         -------
         feature_vector: [n_x, n_y, n_z] ndarray
             See Notes.
+            If sparse, a (voxel_n, values) pair instead, with the sorted
+            occupied voxels and their value. For TDF, only the distance of the
+            occupied voxels is given.
 
         Notes
         -----
@@ -207,6 +437,11 @@ class VoxelGrid(Structure):
         x_mean, y_mean, z_mean
             Mean coordinate value of points inside each voxel.
         """
+        if sparse is None:
+            sparse = self.sparse
+        if sparse:
+            return self._get_sparse_feature_vector(mode)
+
         vector = np.zeros(self.n_voxels)
 
         if mode == "binary":
@@ -220,7 +455,12 @@ class VoxelGrid(Structure):
         elif mode == "TDF":
             # truncation = np.linalg.norm(self.shape)
             kdt = KDTree(self._points)
-            vector, i = kdt.query(self.voxel_centers, workers=-1)
+            if self.sparse:
+                # voxel_centers only holds the occupied voxels
+                centers = self.centers_of(np.arange(self.n_voxels))
+            else:
+                centers = self.voxel_centers
+            vector, i = kdt.query(centers, workers=-1)
 
         elif mode.endswith("_max"):
             if not is_numba_avaliable:
@@ -247,6 +487,121 @@ class VoxelGrid(Structure):
 
         return vector.reshape(self.x_y_z)
 
+    def _get_sparse_feature_vector(self, mode):
+        occupied, inverse, counts = self.get_occupied()
+
+        if mode == "binary":
+            values = np.ones(len(occupied))
+
+        elif mode == "density":
+            values = counts / len(self.voxel_n)
+
+        elif mode == "TDF":
+            kdt = KDTree(self._points)
+            values, i = kdt.query(self.centers_of(occupied), workers=-1)
+
+        elif mode in ("x_max", "y_max", "z_max"):
+            axis = {"x_max": 0, "y_max": 1, "z_max": 2}
+            order = np.argsort(inverse, kind="stable")
+            breaks = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            values = np.maximum.reduceat(
+                self._points[order, axis[mode]].astype(np.float64), breaks
+            )
+
+        elif mode in ("x_mean", "y_mean", "z_mean"):
+            axis = {"x_mean": 0, "y_mean": 1, "z_mean": 2}
+            values = np.bincount(inverse, weights=self._points[:, axis[mode]]) / counts
+
+        else:
+            raise NotImplementedError(
+                "{} is not a supported feature vector mode".format(mode)
+            )
+
+        return occupied, values
+
+    def get_adjacency(self, connectivity=26):
+        """Adjacency matrix of the occupied voxels.
+
+        Built once for each connectivity and cached.
+
+        Parameters
+        ----------
+        connectivity: {6, 18, 26}, optional
+            Default: 26
+            Voxels sharing a face (6), a face or an edge (18) or a face, an
+            edge or a corner (26) are neighbors.
+
+        Returns
+        -------
+        adjacency: (V, V) scipy.sparse.csr_matrix of bool
+            Symmetric. Row/column i corresponds to self.occupied_voxels[i].
+        """
+        if connectivity not in (6, 18, 26):
+            raise ValueError("connectivity must be 6, 18 or 26")
+        if connectivity in self._adjacency:
+            return self._adjacency[connectivity]
+
+        occupied = self.occupied_voxels
+        voxel_xyz = np.stack(np.unravel_index(occupied, self.x_y_z), axis=1)
+        # half of the offsets, the other half gives the same pairs
+        offsets = cartesian([[-1, 0, 1]] * 3)[14:]
+        offsets = offsets[np.abs(offsets).sum(1) <= {6: 1, 18: 2, 26: 3}[connectivity]]
+
+        rows, cols = [], []
+        for offset in offsets:
+            neighbor_xyz = voxel_xyz + offset
+            valid = np.all((neighbor_xyz >= 0) & (neighbor_xyz < self.x_y_z), axis=1)
+            neighbor_n = np.ravel_multi_index(neighbor_xyz[valid].T, self.x_y_z)
+            position = np.searchsorted(occupied, neighbor_n)
+            found = position < len(occupied)
+            found[found] = occupied[position[found]] == neighbor_n[found]
+            rows.append(np.flatnonzero(valid)[found])
+            cols.append(position[found])
+
+        rows = np.concatenate(rows)
+        cols = np.concatenate(cols)
+        adjacency = coo_matrix(
+            (
+                np.ones(2 * len(rows), dtype=bool),
+                (np.r_[rows, cols], np.r_[cols, rows]),
+            ),
+            shape=(len(occupied), len(occupied)),
+        ).tocsr()
+        adjacency.sort_indices()
+        self._adjacency[connectivity] = adjacency
+        return adjacency
+
+    def get_voxel_neighbors_batch(self, voxels=None, connectivity=26):
+        """Get the non-empty neighbors of many occupied voxels at once.
+
+        Parameters
+        ----------
+        voxels: (M,) int array-like, optional
+            Default: None
+            Occupied voxel_n. All the occupied voxels, sorted, if None.
+        connectivity: {6, 18, 26}, optional
+            Default: 26
+            See get_adjacency.
+
+        Returns
+        -------
+        indptr: (M + 1,) int ndarray
+        neighbors: int ndarray
+            voxel_n of the neighbors of voxels[i], excluding itself, are
+            neighbors[indptr[i]:indptr[i + 1]], sorted.
+        """
+        adjacency = self.get_adjacency(connectivity)
+        occupied = self.occupied_voxels
+        if voxels is not None:
+            voxels = np.asarray(voxels)
+            rows = np.searchsorted(occupied, voxels)
+            if np.any(rows >= len(occupied)) or np.any(
+                occupied[np.minimum(rows, len(occupied) - 1)] != voxels
+            ):
+                raise ValueError("voxels must be occupied voxels")
+            adjacency = adjacency[rows]
+        return adjacency.indptr, occupied[adjacency.indices]
+
     def get_voxel_neighbors(self, voxel):
         """Get valid, non-empty 26 neighbors of voxel.
 
@@ -294,7 +649,7 @@ class VoxelGrid(Structure):
             self.x_y_z,
         )
 
-        return [x for x in ravel_indices if x in np.unique(self.voxel_n)]
+        return list(ravel_indices[np.isin(ravel_indices, self.occupied_voxels)])
 
     def plot(
         self,
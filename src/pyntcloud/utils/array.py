@@ -1,5 +1,19 @@
+import hashlib
+
 import numpy as np
 
+try:
+    from .numba import eigh3x3 as eigh3x3_numba
+
+    is_numba_avaliable = True
+except ImportError:
+    is_numba_avaliable = False
+
+
+def hash_points(xyz):
+    """SHA-256 of the raw bytes of the xyz array."""
+    return hashlib.sha256(np.ascontiguousarray(xyz)).hexdigest()
+
 
 def cartesian(arrays, out=None):
     """Generate a cartesian product of input arrays.
@@ -50,6 +64,11 @@ def cartesian(arrays, out=None):
     return out
 
 
+def index_dtype(n):
+    """Smallest of int32/int64 that holds n."""
+    return np.int32 if n <= np.iinfo(np.int32).max else np.int64
+
+
 def PCA(data, correlation=False, sort=True):
     """Applies Principal Component Analysis to the data
 
@@ -120,4 +139,175 @@ def point_in_array_2D(point, array_2D):
 def cov3D(k_neighbors):
     """(N,K,3)"""
     diffs = k_neighbors - k_neighbors.mean(1, keepdims=True)
-    return np.einsum("ijk,ijl->ikl", diffs, diffs) / k_neighbors.shape[1]
+    # batched matmul is several times faster than the equivalent einsum
+    return diffs.transpose(0, 2, 1) @ diffs / k_neighbors.shape[1]
+
+
+def segment_cov3D(neighbors, indptr):
+    """Covariance of variable size neighbourhoods, stored as contiguous segments.
+
+    Sums of x and x * x.T are reduced per segment with np.add.reduceat, so no
+    padding to the largest neighbourhood is needed.
+
+    Parameters
+    ----------
+    neighbors: (M, 3) ndarray
+        Coordinates of the neighbourhoods, one after another.
+    indptr: (N + 1,) int ndarray
+        Neighbourhood i is neighbors[indptr[i]:indptr[i + 1]].
+
+    Returns
+    -------
+    cov: (N, 3, 3) float64 ndarray
+        Same normalization as cov3D. Zero for empty neighbourhoods.
+    """
+    indptr = np.asarray(indptr) - indptr[0]
+    counts = np.diff(indptr)
+    cov = np.zeros((len(counts), 3, 3))
+    nonempty = counts > 0
+    if not nonempty.any():
+        return cov
+    starts, counts = indptr[:-1][nonempty], counts[nonempty]
+    # centered on the first point of each segment, for precision
+    diffs = neighbors - np.repeat(neighbors[starts], counts, axis=0)
+    diffs = diffs.astype(np.float64, copy=False)
+    mean = np.add.reduceat(diffs, starts, axis=0) / counts[:, None]
+    outer = (diffs[:, :, None] * diffs[:, None, :]).reshape(-1, 9)
+    second = np.add.reduceat(outer, starts, axis=0).reshape(-1, 3, 3)
+    cov[nonempty] = second / counts[:, None, None] - mean[:, :, None] * mean[:, None, :]
+    return cov
+
+
+def eigh3x3(cov, eigenvectors=True):
+    """Eigenvalues and eigenvectors of a batch of symmetric 3x3 matrices.
+
+    Eigenvalues are computed in closed form (trigonometric solution of the
+    characteristic cubic). The eigenvector of the eigenvalue furthest from the
+    other two is a cross product of the rows of cov - e * I, and the remaining
+    pair is solved as a 2x2 problem on its orthogonal complement. This stays
+    accurate for repeated eigenvalues without calling np.linalg.eigh.
+    Uses numba, if available.
+
+    Parameters
+    ----------
+    cov: (N, 3, 3) ndarray
+        Symmetric matrices. Only the upper triangle is read.
+    eigenvectors: bool, optional
+        Default: True
+        If False, eigenvectors are not returned.
+
+    Returns
+    -------
+    eigenvalues: (N, 3) float64 ndarray
+        In descending order.
+    eigenvectors: (N, 3, 3) float64 ndarray
+        If eigenvectors is True. eigenvectors[:, :, i] is the unit eigenvector
+        of eigenvalues[:, i].
+    """
+    cov = np.asarray(cov, dtype=np.float64)
+    n = len(cov)
+    values = np.empty((n, 3))
+    vectors = np.empty((n, 3, 3))
+
+    if is_numba_avaliable:
+        eigh3x3_numba(cov, values, vectors)
+    else:
+        eigh3x3_numpy(cov, values, vectors)
+
+    if eigenvectors:
+        return values, vectors
+    return values
+
+
+def eigh3x3_numpy(cov, values, vectors):
+    """Vectorized eigh3x3, see it for details."""
+    # symmetric copy of the upper triangle
+    a = np.triu(cov) + np.triu(cov, 1).transpose(0, 2, 1)
+    a00, a11, a22 = a[:, 0, 0], a[:, 1, 1], a[:, 2, 2]
+    a01, a02, a12 = a[:, 0, 1], a[:, 0, 2], a[:, 1, 2]
+
+    q = (a00 + a11 + a22) / 3
+    b00, b11, b22 = a00 - q, a11 - q, a22 - q
+    p = np.sqrt((b00**2 + b11**2 + b22**2 + 2 * (a01**2 + a02**2 + a12**2)) / 6)
+    # det(B) / 2 with B = (A - q * I) / p
+    det = (
+        b00 * (b11 * b22 - a12**2)
+        - a01 * (a01 * b22 - a12 * a02)
+        + a02 * (a01 * a12 - b11 * a02)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.clip(det / (2 * p**3), -1, 1)
+    r[p == 0] = 0
+    phi = np.arccos(r) / 3
+
+    # r >= 0: the largest eigenvalue is the furthest from the others
+    largest = r >= 0
+    e = np.where(
+        largest, q + 2 * p * np.cos(phi), q + 2 * p * np.cos(phi + 2 * np.pi / 3)
+    )
+    v = null_vector(a, e)
+    # Rayleigh quotient, exact for structured zeros
+    e = np.einsum("ni,nij,nj->n", v, a, v)
+
+    # orthonormal basis (u, w) of the plane orthogonal to v
+    axis = np.eye(3)[np.abs(v).argmin(1)]
+    u = np.cross(v, axis)
+    u /= np.linalg.norm(u, axis=1, keepdims=True)
+    w = np.cross(v, u)
+    au, aw = np.einsum("nij,nj->ni", a, u), np.einsum("nij,nj->ni", a, w)
+    m00 = np.einsum("ni,ni->n", u, au)
+    m01 = np.einsum("ni,ni->n", u, aw)
+    m11 = np.einsum("ni,ni->n", w, aw)
+
+    half_trace, half_diff = (m00 + m11) / 2, (m00 - m11) / 2
+    rad = np.hypot(half_diff, m01)
+    high, low = half_trace + rad, half_trace - rad
+    # eigenvector of high in the (u, w) basis
+    c0 = np.stack([m01, high - m00], axis=1)
+    c1 = np.stack([high - m11, m01], axis=1)
+    c = np.where(
+        (np.abs(c0).sum(1) >= np.abs(c1).sum(1))[:, None],
+        c0,
+        c1,
+    )
+    norm = np.linalg.norm(c, axis=1)
+    c[norm == 0] = [1, 0]
+    norm[norm == 0] = 1
+    c /= norm[:, None]
+    x_high = c[:, :1] * u + c[:, 1:] * w
+    x_low = -c[:, 1:] * u + c[:, :1] * w
+
+    values[:] = np.where(
+        largest[:, None],
+        np.stack([e, high, low], axis=1),
+        np.stack([high, low, e], axis=1),
+    )
+    vectors[:] = np.where(
+        largest[:, None, None],
+        np.stack([v, x_high, x_low], axis=2),
+        np.stack([x_high, x_low, v], axis=2),
+    )
+
+
+def null_vector(a, e):
+    """Unit vectors orthogonal to the rows of a - e * I, i.e. eigenvectors of e.
+
+    (1, 0, 0) if a - e * I is zero.
+    """
+    rows = a - e[:, None, None] * np.eye(3)
+    crosses = np.stack(
+        [
+            np.cross(rows[:, 0], rows[:, 1]),
+            np.cross(rows[:, 0], rows[:, 2]),
+            np.cross(rows[:, 1], rows[:, 2]),
+        ],
+        axis=1,
+    )
+    norms = np.einsum("ijk,ijk->ij", crosses, crosses)
+    best = norms.argmax(1)
+    n = np.arange(len(a))
+    v = crosses[n, best]
+    norm = np.sqrt(norms[n, best])
+    v[norm == 0] = [1, 0, 0]
+    norm[norm == 0] = 1
+    return v / norm[:, None]
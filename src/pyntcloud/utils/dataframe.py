@@ -1,3 +1,7 @@
+import numpy as np
+import pandas as pd
+
+
 def convert_columns_dtype(df, old_dtype, new_dtype):
     """
     Parameters
@@ -15,3 +19,86 @@ def convert_columns_dtype(df, old_dtype, new_dtype):
             changed.append(column)
 
     return changed
+
+
+def check_columns(columns, available):
+    """Raise ValueError if any of columns is not in available.
+
+    Parameters
+    ----------
+    columns: list of str
+        Requested columns.
+
+    available: list of str
+        Columns that can be read.
+    """
+    missing = [name for name in columns if name not in available]
+    if missing:
+        raise ValueError(
+            "Columns {} not found; available columns are: {}".format(
+                missing, list(available)
+            )
+        )
+
+
+def structured_to_dataframe(array, columns=None):
+    """Build a DataFrame whose columns are views over the fields of array.
+
+    Unlike pd.DataFrame(array), no data is copied, so this can be used on top
+    of a np.memmap without reading it into memory.
+
+    Parameters
+    ----------
+    array: numpy structured array
+
+    columns: list of str, optional
+        Default: None
+        Fields of array to be used as columns. All fields if None.
+
+    Returns
+    -------
+    df: pandas.DataFrame
+    """
+    if columns is None:
+        columns = array.dtype.names
+    return pd.DataFrame({name: array[name] for name in columns}, copy=False)
+
+
+def _root_base(array):
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return array
+
+
+def get_xyz(df):
+    """Return the x, y, z columns of df as an (N, 3) ndarray.
+
+    When x, y and z are consecutive fields of the same memory map, the returned
+    array is a strided view over the mapping instead of a copy.
+
+    Parameters
+    ----------
+    df: pandas.DataFrame
+
+    Returns
+    -------
+    xyz: (N, 3) ndarray
+    """
+    x, y, z = (df[name].to_numpy() for name in ("x", "y", "z"))
+    base = _root_base(x)
+    if (
+        isinstance(base, np.memmap)
+        and _root_base(y) is base
+        and _root_base(z) is base
+        and x.dtype == y.dtype == z.dtype
+        and x.strides == y.strides == z.strides
+    ):
+        start = x.__array_interface__["data"][0]
+        if (
+            y.__array_interface__["data"][0] - start == x.itemsize
+            and z.__array_interface__["data"][0] - start == 2 * x.itemsize
+        ):
+            return np.lib.stride_tricks.as_strided(
+                x, shape=(len(x), 3), strides=(x.strides[0], x.itemsize)
+            )
+    return df[["x", "y", "z"]].values
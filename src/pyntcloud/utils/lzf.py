@@ -0,0 +1,241 @@
+"""Pure python implementation of the LZF compression format used by PCL.
+
+The loops only use indexing, so they run on bytes/bytearray and are also
+compiled by numba (see utils/numba.py) when working on uint8 ndarrays.
+lzf_compress_runs is a vectorized alternative for when numba is not available.
+"""
+
+import numpy as np
+
+# back references can point at most 8192 bytes back and copy at most 264 bytes
+MAX_OFF = 1 << 13
+MAX_REF = (1 << 8) + (1 << 3)
+MAX_LIT = 1 << 5
+HASH_SIZE = 1 << 14
+
+
+def lzf_decompress(src, dst):
+    """Decompress src into the preallocated dst.
+
+    Parameters
+    ----------
+    src: bytes-like or uint8 ndarray
+        LZF compressed data.
+    dst: bytearray or uint8 ndarray
+        Output buffer, with the size of the uncompressed data.
+
+    Returns
+    -------
+    n: int
+        Number of bytes written to dst, -1 if src is corrupted or dst too small.
+    """
+    in_len = len(src)
+    out_len = len(dst)
+    ip = 0
+    op = 0
+    while ip < in_len:
+        ctrl = int(src[ip])
+        ip += 1
+        if ctrl < MAX_LIT:
+            # literal run of ctrl + 1 bytes
+            ctrl += 1
+            if op + ctrl > out_len or ip + ctrl > in_len:
+                return -1
+            for i in range(ctrl):
+                dst[op + i] = src[ip + i]
+            ip += ctrl
+            op += ctrl
+        else:
+            # back reference
+            length = ctrl >> 5
+            ref = op - ((ctrl & 0x1F) << 8) - 1
+            if length == 7:
+                if ip >= in_len:
+                    return -1
+                length += int(src[ip])
+                ip += 1
+            if ip >= in_len:
+                return -1
+            ref -= int(src[ip])
+            ip += 1
+            length += 2
+            if op + length > out_len or ref < 0:
+                return -1
+            # byte by byte, the reference can overlap the output
+            for i in range(length):
+                dst[op + i] = dst[ref + i]
+            op += length
+    return op
+
+
+def lzf_compress(src, dst, htab):
+    """Compress src into the preallocated dst.
+
+    Parameters
+    ----------
+    src: bytes-like or uint8 ndarray
+        Data to be compressed.
+    dst: bytearray or uint8 ndarray
+        Output buffer.
+    htab: list or int ndarray of size HASH_SIZE
+        Hash table, filled with -1.
+
+    Returns
+    -------
+    n: int
+        Number of bytes written to dst, 0 if the data doesn't fit in dst.
+    """
+    in_len = len(src)
+    out_len = len(dst)
+    if in_len == 0 or out_len < 2:
+        return 0
+    ip = 0
+    # reserve the control byte of the first literal run
+    op = 1
+    lit = 0
+    while ip < in_len:
+        if ip + 2 < in_len:
+            v = (int(src[ip]) << 16) | (int(src[ip + 1]) << 8) | int(src[ip + 2])
+            h = ((v * 2654435761) & 0xFFFFFFFF) >> 18
+            ref = htab[h]
+            htab[h] = ip
+            off = ip - ref - 1
+            if (
+                ref >= 0
+                and off < MAX_OFF
+                and src[ref] == src[ip]
+                and src[ref + 1] == src[ip + 1]
+                and src[ref + 2] == src[ip + 2]
+            ):
+                length = 3
+                max_length = min(in_len - ip, MAX_REF)
+                while length < max_length and src[ref + length] == src[ip + length]:
+                    length += 1
+                # close the current literal run
+                if lit == 0:
+                    op -= 1
+                else:
+                    dst[op - lit - 1] = lit - 1
+                lit = 0
+                # back reference + control byte of the next literal run
+                if op + 4 > out_len:
+                    return 0
+                length -= 2
+                if length < 7:
+                    dst[op] = (off >> 8) + (length << 5)
+                    op += 1
+                else:
+                    dst[op] = (off >> 8) + (7 << 5)
+                    dst[op + 1] = length - 7
+                    op += 2
+                dst[op] = off & 0xFF
+                op += 2
+                ip += length + 2
+                continue
+
+        # literal byte
+        if op >= out_len:
+            return 0
+        dst[op] = src[ip]
+        op += 1
+        ip += 1
+        lit += 1
+        if lit == MAX_LIT:
+            dst[op - lit - 1] = lit - 1
+            lit = 0
+            op += 1
+
+    if lit == 0:
+        op -= 1
+    else:
+        dst[op - lit - 1] = lit - 1
+    return op
+
+
+def lzf_compress_runs(src, block_size=1 << 20):
+    """Vectorized LZF compression that only encodes runs of repeated bytes.
+
+    Used instead of lzf_compress when numba is not available, where the byte
+    loop is too slow for point clouds. Runs of a repeated byte are encoded as
+    back references to the previous byte; everything else as literals. The
+    output is valid LZF, but compresses less than lzf_compress on data
+    without runs.
+
+    Parameters
+    ----------
+    src: bytes-like or uint8 ndarray
+        Data to be compressed.
+    block_size: int, optional
+        Default: 1 << 20
+        Bytes compressed at once. The output of each block is a valid stream,
+        so they are concatenated. Temporary memory is proportional to it.
+
+    Returns
+    -------
+    dst: uint8 ndarray
+        Compressed data.
+    """
+    src = np.frombuffer(src, dtype=np.uint8)
+    return np.concatenate(
+        [np.empty(0, dtype=np.uint8)]
+        + [
+            _compress_runs(src[start : start + block_size])
+            for start in range(0, len(src), block_size)
+        ]
+    )
+
+
+def _compress_runs(src):
+    n = len(src)
+    # runs of equal bytes
+    run_starts = np.flatnonzero(np.diff(src, prepend=~src[:1]))
+    run_lengths = np.diff(np.append(run_starts, n))
+    # the first byte of each run is a literal, and the rest are copied from
+    # the previous output byte by back references of 3 to MAX_REF bytes.
+    # Remainders shorter than 3 stay literals.
+    rest = run_lengths - 1
+    remainder = rest % MAX_REF
+    covered = np.where(remainder < 3, rest - remainder, rest)
+    n_refs = -(-covered // MAX_REF)
+    ref_run = np.repeat(np.arange(len(run_starts)), n_refs)
+    ref_i = np.arange(len(ref_run)) - np.repeat(np.cumsum(n_refs) - n_refs, n_refs)
+    ref_pos = run_starts[ref_run] + 1 + ref_i * MAX_REF
+    ref_len = np.minimum(covered[ref_run] - ref_i * MAX_REF, MAX_REF)
+
+    is_literal = np.ones(n + 1, dtype=np.int64)
+    np.add.at(is_literal, ref_pos, -1)
+    np.add.at(is_literal, ref_pos + ref_len, 1)
+    is_literal = np.cumsum(is_literal[:n]) - np.arange(n) > 0
+    lit_pos = np.flatnonzero(is_literal)
+
+    # literal runs are split in chunks of at most MAX_LIT bytes
+    group_start = np.flatnonzero(np.diff(lit_pos, prepend=-2) != 1)
+    group_sizes = np.diff(np.append(group_start, len(lit_pos)))
+    in_group = np.arange(len(lit_pos)) - np.repeat(group_start, group_sizes)
+    chunk_first = np.flatnonzero(in_group % MAX_LIT == 0)
+    chunk_sizes = np.minimum(
+        np.repeat(group_sizes, -(-group_sizes // MAX_LIT)) - in_group[chunk_first],
+        MAX_LIT,
+    )
+
+    # tokens in source order: literal chunks and back references
+    token_pos = np.concatenate([lit_pos[chunk_first], ref_pos])
+    token_size = np.concatenate([chunk_sizes + 1, np.where(ref_len - 2 < 7, 2, 3)])
+    order = np.argsort(token_pos, kind="stable")
+    token_out = np.empty(len(order), dtype=np.int64)
+    token_out[order] = np.cumsum(token_size[order]) - token_size[order]
+
+    dst = np.zeros(token_size.sum(), dtype=np.uint8)
+    chunk_out = token_out[: len(chunk_first)]
+    dst[chunk_out] = chunk_sizes - 1
+    in_chunk = np.arange(len(lit_pos)) - np.repeat(chunk_first, chunk_sizes)
+    dst[np.repeat(chunk_out, chunk_sizes) + 1 + in_chunk] = src[lit_pos]
+    # offset 0: copy from the previous output byte
+    ref_out = token_out[len(chunk_first) :]
+    length = ref_len - 2
+    short = length < 7
+    dst[ref_out[short]] = length[short] << 5
+    dst[ref_out[~short]] = 7 << 5
+    dst[ref_out[~short] + 1] = length[~short] - 7
+    # the low byte of the offset, 0, is already there
+    return dst
@@ -1,5 +1,10 @@
+import numpy as np
+
 from numba import njit
 
+from .lzf import lzf_compress as _lzf_compress
+from .lzf import lzf_decompress as _lzf_decompress
+
 
 @njit
 def groupby_count(xyz, indices, out):
@@ -21,3 +26,153 @@ def groupby_max(xyz, indices, N, out):
         if xyz[i][N] > out[indices[i]]:
             out[indices[i]] = xyz[i][N]
     return out
+
+
+lzf_compress = njit(_lzf_compress)
+lzf_decompress = njit(_lzf_decompress)
+
+
+@njit
+def segment_index(value, segments, inv_step):
+    # same as np.searchsorted(segments, value) - 1, clipped to valid voxels
+    n = segments.shape[0] - 1
+    i = int(np.ceil((value - segments[0]) * inv_step)) - 1
+    i = min(max(i, 0), n - 1)
+    # fix rounding errors against the actual segments
+    if i > 0 and value <= segments[i]:
+        i -= 1
+    elif i < n - 1 and value > segments[i + 1]:
+        i += 1
+    return i
+
+
+@njit
+def voxelize(
+    points,
+    segments_x,
+    segments_y,
+    segments_z,
+    inv_steps,
+    voxel_x,
+    voxel_y,
+    voxel_z,
+    voxel_n,
+):
+    n_y = segments_y.shape[0] - 1
+    n_z = segments_z.shape[0] - 1
+    for i in range(points.shape[0]):
+        x = segment_index(points[i, 0], segments_x, inv_steps[0])
+        y = segment_index(points[i, 1], segments_y, inv_steps[1])
+        z = segment_index(points[i, 2], segments_z, inv_steps[2])
+        voxel_x[i] = x
+        voxel_y[i] = y
+        voxel_z[i] = z
+        voxel_n[i] = (x * n_y + y) * n_z + z
+
+
+@njit(nogil=True)
+def null_vector(a, e, out):
+    # largest cross product between rows of a - e * I
+    r = a.copy()
+    for i in range(3):
+        r[i, i] -= e
+    best = 0.0
+    out[0], out[1], out[2] = 1.0, 0.0, 0.0
+    for i, j in ((0, 1), (0, 2), (1, 2)):
+        cx = r[i, 1] * r[j, 2] - r[i, 2] * r[j, 1]
+        cy = r[i, 2] * r[j, 0] - r[i, 0] * r[j, 2]
+        cz = r[i, 0] * r[j, 1] - r[i, 1] * r[j, 0]
+        norm = cx * cx + cy * cy + cz * cz
+        if norm > best:
+            best = norm
+            out[0], out[1], out[2] = cx, cy, cz
+    if best > 0:
+        norm = np.sqrt(best)
+        for i in range(3):
+            out[i] /= norm
+
+
+@njit(nogil=True)
+def eigh3x3(cov, values, vectors):
+    # see pyntcloud.utils.array.eigh3x3
+    a = np.empty((3, 3))
+    v = np.empty(3)
+    u = np.empty(3)
+    w = np.empty(3)
+    au = np.empty(3)
+    aw = np.empty(3)
+    for n in range(cov.shape[0]):
+        for i in range(3):
+            for j in range(i, 3):
+                a[i, j] = cov[n, i, j]
+                a[j, i] = cov[n, i, j]
+
+        q = (a[0, 0] + a[1, 1] + a[2, 2]) / 3
+        b00, b11, b22 = a[0, 0] - q, a[1, 1] - q, a[2, 2] - q
+        p1 = a[0, 1] ** 2 + a[0, 2] ** 2 + a[1, 2] ** 2
+        p = np.sqrt((b00**2 + b11**2 + b22**2 + 2 * p1) / 6)
+        if p == 0:
+            r = 0.0
+        else:
+            det = (
+                b00 * (b11 * b22 - a[1, 2] ** 2)
+                - a[0, 1] * (a[0, 1] * b22 - a[1, 2] * a[0, 2])
+                + a[0, 2] * (a[0, 1] * a[1, 2] - b11 * a[0, 2])
+            )
+            r = min(max(det / (2 * p**3), -1.0), 1.0)
+        phi = np.arccos(r) / 3
+
+        largest = r >= 0
+        if largest:
+            e = q + 2 * p * np.cos(phi)
+        else:
+            e = q + 2 * p * np.cos(phi + 2 * np.pi / 3)
+        null_vector(a, e, v)
+        e = 0.0
+        for i in range(3):
+            for j in range(3):
+                e += v[i] * a[i, j] * v[j]
+
+        k = 0
+        for i in range(1, 3):
+            if abs(v[i]) < abs(v[k]):
+                k = i
+        # u = v x axis k
+        u[0], u[1], u[2] = 0.0, 0.0, 0.0
+        u[(k + 1) % 3] = v[(k + 2) % 3]
+        u[(k + 2) % 3] = -v[(k + 1) % 3]
+        norm = np.sqrt(u[0] ** 2 + u[1] ** 2 + u[2] ** 2)
+        for i in range(3):
+            u[i] /= norm
+        w[0] = v[1] * u[2] - v[2] * u[1]
+        w[1] = v[2] * u[0] - v[0] * u[2]
+        w[2] = v[0] * u[1] - v[1] * u[0]
+        for i in range(3):
+            au[i] = a[i, 0] * u[0] + a[i, 1] * u[1] + a[i, 2] * u[2]
+            aw[i] = a[i, 0] * w[0] + a[i, 1] * w[1] + a[i, 2] * w[2]
+        m00 = u[0] * au[0] + u[1] * au[1] + u[2] * au[2]
+        m01 = u[0] * aw[0] + u[1] * aw[1] + u[2] * aw[2]
+        m11 = w[0] * aw[0] + w[1] * aw[1] + w[2] * aw[2]
+
+        half_trace, half_diff = (m00 + m11) / 2, (m00 - m11) / 2
+        rad = np.hypot(half_diff, m01)
+        high, low = half_trace + rad, half_trace - rad
+        c0, c1 = m01, high - m00
+        if abs(c0) + abs(c1) < abs(high - m11) + abs(m01):
+            c0, c1 = high - m11, m01
+        norm = np.hypot(c0, c1)
+        if norm == 0:
+            c0, c1 = 1.0, 0.0
+        else:
+            c0, c1 = c0 / norm, c1 / norm
+
+        if largest:
+            values[n, 0], values[n, 1], values[n, 2] = e, high, low
+            first, second, third = 1, 2, 0
+        else:
+            values[n, 0], values[n, 1], values[n, 2] = high, low, e
+            first, second, third = 0, 1, 2
+        for i in range(3):
+            vectors[n, i, first] = c0 * u[i] + c1 * w[i]
+            vectors[n, i, second] = -c1 * u[i] + c0 * w[i]
+            vectors[n, i, third] = v[i]
@@ -0,0 +1,73 @@
+import pytest
+
+import numpy as np
+from pandas.testing import assert_frame_equal
+
+from pyntcloud import PyntCloud
+from pyntcloud.io import probe
+
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".feather", ".arrow"])
+def test_arrow_round_trip(tmp_path, diamond, extension):
+    filename = str(tmp_path / "diamond{}".format(extension))
+    diamond.comments = ["PyntCloud is cool"]
+    diamond.add_structure("voxelgrid", n_x=2, n_y=2, n_z=2)
+    diamond.to_file(filename, also_save=["mesh", "structures", "comments"])
+
+    cloud = PyntCloud.from_file(filename, structures=True)
+
+    assert_frame_equal(cloud.points, diamond.points)
+    assert_frame_equal(cloud.mesh, diamond.mesh)
+    assert cloud.comments == ["PyntCloud is cool"]
+    assert list(cloud.structures) == list(diamond.structures)
+    voxelgrid_id = list(diamond.structures)[0]
+    np.testing.assert_array_equal(
+        cloud.structures[voxelgrid_id].voxel_n, diamond.structures[voxelgrid_id].voxel_n
+    )
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".feather"])
+def test_arrow_columns_and_row_groups(
+    tmp_path, pyntcloud_with_rgb_and_normals, extension
+):
+    cloud = pyntcloud_with_rgb_and_normals
+    filename = str(tmp_path / "cloud{}".format(extension))
+    cloud.to_file(filename, row_group_size=300)
+
+    columns = ["x", "y", "z", "red"]
+    partial = PyntCloud.from_file(filename, columns=columns, row_groups=[1, 3])
+
+    expected = cloud.points[columns].iloc[np.r_[300:600, 900:1000]]
+    assert_frame_equal(partial.points, expected.reset_index(drop=True))
+
+    info = probe(filename)
+    assert info.n_points == len(cloud.points)
+    assert list(info.fields) == list(cloud.points.columns)
+
+
+def test_feather_memory_map_is_zero_copy(tmp_path, pyntcloud_with_rgb_and_normals):
+    filename = str(tmp_path / "cloud.feather")
+    pyntcloud_with_rgb_and_normals.to_file(filename)
+
+    cloud = PyntCloud.from_file(filename, columns=["x", "y", "z"])
+
+    assert not cloud.points["x"].values.flags.owndata
+    assert_frame_equal(
+        cloud.points, pyntcloud_with_rgb_and_normals.points[["x", "y", "z"]]
+    )
+
+
+def test_probe_feather_without_pyntcloud_metadata(
+    tmp_path, pyntcloud_with_rgb_and_normals
+):
+    points = pyntcloud_with_rgb_and_normals.points
+    filename = str(tmp_path / "cloud.arrow")
+    table = pa.Table.from_pandas(points, preserve_index=False)
+    options = pa.ipc.IpcWriteOptions(compression="zstd")
+    with pa.ipc.new_file(filename, table.schema, options=options) as writer:
+        writer.write_table(table, max_chunksize=300)
+
+    info = probe(filename)
+    assert info.n_points == len(points)
@@ -163,3 +163,216 @@ def test_has_offsets_las_issue_333(data_path):
     assert x_point_pyntcloud == x_point_laspy.astype("float32")
     assert y_point_pyntcloud == y_point_laspy.astype("float32")
     assert z_point_pyntcloud == z_point_laspy.astype("float32")
+
+
+def test_ply_mmap(data_path):
+    """Expectation: a binary PLY can be memory mapped instead of read."""
+    ply_file = str(data_path / "diamond.ply")
+    cloud = PyntCloud.from_file(ply_file, mmap=True)
+
+    assert_points_xyz(cloud)
+    assert_points_color(cloud)
+    assert_mesh(cloud)
+
+    # xyz is a view over the mapped vertex block, not a copy
+    assert np.shares_memory(cloud.xyz, cloud.points["x"].values)
+
+    expected = PyntCloud.from_file(ply_file)
+    assert cloud.points.equals(expected.points)
+    assert cloud.mesh.equals(expected.mesh)
+    np.testing.assert_array_equal(cloud.xyz, expected.xyz)
+
+
+@pytest.mark.parametrize("read_args", [{}, {"columns": ["x", "y", "z", "red"]}])
+def test_ply_big_endian(tmp_path, data_path, read_args):
+    """Expectation: a big endian binary PLY reads like its little endian copy."""
+    ply_file = str(data_path / "diamond.ply")
+    with open(ply_file, "rb") as f:
+        content = f.read()
+    header_end = content.index(b"end_header\n") + len(b"end_header\n")
+    header = content[:header_end].replace(b"binary_little_endian", b"binary_big_endian")
+    vertex_dtype = np.dtype(
+        [(name, "<f4") for name in ("x", "y", "z")]
+        + [(name, "u1") for name in ("red", "green", "blue")]
+        + [(name, "<f4") for name in ("nx", "ny", "nz")]
+    )
+    face_dtype = np.dtype([("n_points", "u1"), ("vertex_indices", "<i4", 3)])
+    vertices = np.frombuffer(content, vertex_dtype, count=6, offset=header_end)
+    faces = np.frombuffer(
+        content, face_dtype, count=8, offset=header_end + vertices.nbytes
+    )
+    big_endian_file = tmp_path / "diamond_big_endian.ply"
+    big_endian_file.write_bytes(
+        header
+        + vertices.astype(vertex_dtype.newbyteorder(">")).tobytes()
+        + faces.astype(face_dtype.newbyteorder(">")).tobytes()
+    )
+
+    cloud = PyntCloud.from_file(str(big_endian_file), **read_args)
+
+    expected = PyntCloud.from_file(ply_file, **read_args)
+    assert cloud.points.equals(expected.points)
+    if "columns" not in read_args:
+        assert cloud.mesh.equals(expected.mesh)
+    with pytest.raises(ValueError):
+        PyntCloud.from_file(str(big_endian_file), mmap=True)
+
+
+def test_ply_mmap_ascii_raises(data_path):
+    with pytest.raises(ValueError):
+        PyntCloud.from_file(str(data_path / "diamond_ascii.ply"), mmap=True)
+
+
+@pytest.mark.parametrize(
+    "extension,columns",
+    [
+        (".ply", ["x", "y", "z", "red"]),
+        ("_ascii.ply", ["red", "x", "y", "z"]),
+        (".npz", ["x", "y", "z", "blue"]),
+        (".bin", ["z", "x", "y"]),
+        (".las", ["x", "y", "z", "intensity", "red"]),
+    ],
+)
+def test_from_file_columns(data_path, extension, columns):
+    filename = str(data_path / "diamond{}".format(extension))
+    cloud = PyntCloud.from_file(filename, columns=columns)
+
+    assert list(cloud.points.columns) == columns
+    expected = PyntCloud.from_file(filename)
+    assert cloud.points.equals(expected.points[columns])
+
+
+def test_ply_mmap_columns(data_path):
+    cloud = PyntCloud.from_file(
+        str(data_path / "diamond.ply"), mmap=True, columns=["x", "y", "z"]
+    )
+
+    assert list(cloud.points.columns) == ["x", "y", "z"]
+    assert_points_xyz(cloud)
+    assert_mesh(cloud)
+
+
+@pytest.mark.parametrize("data", ["ascii", "binary", "binary_compressed"])
+def test_pcd_columns(tmp_path, diamond, data):
+    filename = str(tmp_path / "diamond.pcd")
+    diamond.to_file(filename, data=data)
+    cloud = PyntCloud.from_file(filename, columns=["x", "y", "z", "green"])
+
+    assert list(cloud.points.columns) == ["x", "y", "z", "green"]
+    assert_points_xyz(cloud)
+    assert cloud.points["green"][0] == 0
+
+
+@pytest.mark.parametrize("extension", [".ply", "_ascii.ply", ".npz", ".bin", ".las"])
+def test_from_file_missing_columns_raises(data_path, extension):
+    with pytest.raises(ValueError):
+        PyntCloud.from_file(
+            str(data_path / "diamond{}".format(extension)), columns=["x", "y", "w"]
+        )
+
+
+@pytest.mark.parametrize(
+    "bbox",
+    [
+        (636000, 849000, 638000, 852000),
+        (636000, 849000, 400, 638000, 852000, 500),
+        (0, 0, 1, 1),
+    ],
+)
+@pytest.mark.parametrize("extension", [".las", ".laz"])
+def test_las_bbox(data_path, extension, bbox):
+    filename = str(data_path / "simple{}".format(extension))
+    cloud = PyntCloud.from_file(filename, bbox=bbox)
+
+    points = PyntCloud.from_file(filename).points
+    n_dims = len(bbox) // 2
+    mask = np.ones(len(points), dtype=bool)
+    for name, lo, hi in zip("xyz", bbox[:n_dims], bbox[n_dims:]):
+        mask &= points[name].between(lo, hi).values
+    expected = points[mask].reset_index(drop=True)
+
+    assert list(cloud.points.columns) == list(points.columns)
+    assert cloud.points.equals(expected.astype(cloud.points.dtypes))
+
+
+def test_las_bbox_invalid_raises(data_path):
+    with pytest.raises(ValueError):
+        PyntCloud.from_file(str(data_path / "simple.las"), bbox=(0, 0, 1))
+
+
+@pytest.mark.parametrize(
+    "face_format,names",
+    [
+        ("{0}", ["v"]),
+        ("{0}/{0}", ["v", "vt"]),
+        ("{0}//{0}", ["v", "vn"]),
+        ("{0}/{0}/{0}", ["v", "vt", "vn"]),
+    ],
+)
+def test_obj_polygons_are_fan_triangulated(tmp_path, face_format, names):
+    lines = ["v {0} {0} 0".format(i) for i in range(6)]
+    lines += ["vt {0} {0}".format(i) for i in range(6)]
+    lines += ["vn 0 0 1" for _ in range(6)]
+    for face in ([1, 2, 3], [1, 2, 3, 4], [2, 3, 4, 5, 6]):
+        lines.append("f " + " ".join(face_format.format(i) for i in face))
+    filename = tmp_path / "polygons.obj"
+    filename.write_text("\n".join(lines) + "\n")
+
+    cloud = PyntCloud.from_file(str(filename))
+
+    expected = np.array(
+        [[0, 1, 2], [0, 1, 2], [0, 2, 3], [1, 2, 3], [1, 3, 4], [1, 4, 5]]
+    )
+    assert list(cloud.mesh.columns) == [
+        "{}{}".format(name, i + 1) for i in range(3) for name in names
+    ]
+    for name in names:
+        np.testing.assert_array_equal(
+            cloud.mesh[["{}1".format(name), "{}2".format(name), "{}3".format(name)]],
+            expected,
+        )
+
+
+def test_obj_inline_comments(tmp_path):
+    lines = [
+        "# vertices",
+        "v 0 0 0 # origin",
+        "v 1 0 0",
+        "v 0 1 0 #",
+        "vn 0 0 1 # up",
+        "vn 0 0 1",
+        "vn 0 0 1",
+        "f 1 2 3 # the only face",
+    ]
+    filename = tmp_path / "comments.obj"
+    filename.write_text("\n".join(lines) + "\n")
+
+    cloud = PyntCloud.from_file(str(filename))
+
+    np.testing.assert_array_equal(cloud.xyz, [[0, 0, 0], [1, 0, 0], [0, 1, 0]])
+    np.testing.assert_array_equal(cloud.points[["nx", "ny", "nz"]], [[0, 0, 1]] * 3)
+    np.testing.assert_array_equal(cloud.mesh, [[0, 1, 2]])
+
+
+def test_obj_vt_with_3_components(tmp_path):
+    lines = ["v {0} {0} 0".format(i) for i in range(4)]
+    lines += ["vt {0} {0} 0.5".format(i) for i in range(4)]
+    filename = tmp_path / "vt_w.obj"
+    filename.write_text("\n".join(lines) + "\n")
+
+    cloud = PyntCloud.from_file(str(filename))
+
+    np.testing.assert_array_equal(
+        cloud.points[["u", "v", "w"]], [[i, i, 0.5] for i in range(4)]
+    )
+
+
+def test_obj_inconsistent_number_of_values_raises(tmp_path):
+    lines = ["v {0} {0} 0".format(i) for i in range(4)]
+    # 9 values, which would reshape into 3 rows of 3
+    lines += ["vt 0 0 0", "vt 1 1", "vt 2 2", "vt 3 3"]
+    filename = tmp_path / "vt_mixed.obj"
+    filename.write_text("\n".join(lines) + "\n")
+
+    with pytest.raises(ValueError):
+        PyntCloud.from_file(str(filename))
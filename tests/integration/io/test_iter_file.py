@@ -0,0 +1,73 @@
+import pytest
+
+import numpy as np
+import pandas as pd
+
+from pyntcloud import PyntCloud
+
+
+@pytest.mark.parametrize("extension", [".ply", ".bin", ".las"])
+@pytest.mark.parametrize("chunk_size", [1, 4, 100])
+def test_iter_file_chunks_match_from_file(data_path, extension, chunk_size):
+    filename = str(data_path / "diamond{}".format(extension))
+    expected = PyntCloud.from_file(filename).points
+
+    chunks = list(PyntCloud.iter_file(filename, chunk_size=chunk_size))
+
+    assert all(len(chunk) <= chunk_size for chunk in chunks)
+    assert len(chunks) == -(-len(expected) // chunk_size)
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected)
+
+
+def test_iter_file_pcd(tmp_path):
+    xyz = np.random.rand(10, 3).astype(np.float32)
+    filename = tmp_path / "points.pcd"
+    header = "\n".join(
+        [
+            "VERSION .7",
+            "FIELDS x y z",
+            "SIZE 4 4 4",
+            "TYPE F F F",
+            "COUNT 1 1 1",
+            "WIDTH 10",
+            "HEIGHT 1",
+            "VIEWPOINT 0 0 0 1 0 0 0",
+            "POINTS 10",
+            "DATA binary",
+            "",
+        ]
+    )
+    with open(filename, "wb") as f:
+        f.write(header.encode())
+        xyz.tofile(f)
+
+    chunks = list(PyntCloud.iter_file(str(filename), chunk_size=4))
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    np.testing.assert_array_equal(pd.concat(chunks)[["x", "y", "z"]].values, xyz)
+
+
+def test_iter_file_unsupported_format(data_path):
+    with pytest.raises(ValueError):
+        PyntCloud.iter_file(str(data_path / "diamond.obj"))
+
+    with pytest.raises(NotImplementedError):
+        next(PyntCloud.iter_file(str(data_path / "diamond_ascii.ply")))
+
+
+def test_iter_las_scales_colors_of_every_chunk_alike(tmp_path):
+    laspy = pytest.importorskip("laspy")
+    las = laspy.create(point_format=2, file_version="1.2")
+    las.header.scales = [0.01, 0.01, 0.01]
+    las.x = las.y = las.z = np.arange(8, dtype=np.float64)
+    # only the last chunk has colors above 255
+    colors = np.array([0, 10, 100, 255, 0, 10, 100, 65535], dtype=np.uint16)
+    las.red = las.green = las.blue = colors
+    filename = str(tmp_path / "colors.las")
+    las.write(filename)
+
+    expected = PyntCloud.from_file(filename).points
+    chunks = pd.concat(PyntCloud.iter_file(filename, chunk_size=4))
+
+    pd.testing.assert_frame_equal(chunks, expected)
+    np.testing.assert_array_equal(chunks["red"], colors // 256)
@@ -0,0 +1,58 @@
+import pytest
+
+from pyntcloud import PyntCloud
+from pyntcloud.io import probe, probe_directory
+
+
+@pytest.mark.parametrize(
+    "extension,n_faces",
+    [
+        (".ply", 8),
+        ("_ascii.ply", 8),
+        (".npz", 8),
+        (".off", 8),
+        ("_color.off", 8),
+        (".bin", 0),
+        (".las", 0),
+    ],
+)
+def test_probe_matches_from_file(data_path, extension, n_faces):
+    filename = str(data_path / "diamond{}".format(extension))
+    info = probe(filename)
+    cloud = PyntCloud.from_file(filename)
+
+    assert info.n_points == len(cloud.points)
+    assert info.n_faces == n_faces
+    assert set(info.fields) >= {"x", "y", "z"}
+    if extension != ".las":
+        assert list(info.fields) == list(cloud.points.columns)
+
+
+def test_probe_las_bounds(data_path):
+    info = probe(str(data_path / "diamond.las"))
+
+    assert info.format == "LAS"
+    assert info.bounds == (0.0, 0.0, 0.0, 1.0, 1.0, 1.0)
+
+
+def test_probe_pcd(tmp_path, diamond):
+    filename = str(tmp_path / "diamond.pcd")
+    diamond.to_file(filename)
+    info = probe(filename)
+
+    assert info.n_points == len(diamond.points)
+    assert set(info.fields) == set(diamond.points.columns)
+
+
+def test_probe_unsupported_format(data_path):
+    with pytest.raises(ValueError):
+        probe(str(data_path / "diamond.obj"))
+
+
+def test_probe_directory(data_path):
+    infos = probe_directory(str(data_path), pattern="diamond*.ply")
+
+    assert [info.filename for info in infos] == sorted(
+        str(path) for path in data_path.glob("diamond*.ply")
+    )
+    assert all(info.n_points == 6 for info in infos)
@@ -0,0 +1,79 @@
+import json
+import os
+
+import pytest
+
+import numpy as np
+import pandas as pd
+
+from pyntcloud import PyntCloud
+
+
+@pytest.fixture()
+def cloud():
+    points = pd.DataFrame(np.random.rand(200, 3), columns=["x", "y", "z"])
+    return PyntCloud(points)
+
+
+def test_save_and_load_structures(tmp_path, cloud):
+    kdtree_id = cloud.add_structure("kdtree")
+    voxelgrid_id = cloud.add_structure("voxelgrid", size_x=0.1)
+    delaunay_id = cloud.add_structure("delaunay3D")
+    cloud.save_structures(str(tmp_path))
+
+    loaded = PyntCloud(cloud.points.copy())
+    assert loaded.load_structures(str(tmp_path)) == [
+        kdtree_id,
+        voxelgrid_id,
+        delaunay_id,
+    ]
+
+    queries = np.random.rand(10, 3)
+    np.testing.assert_array_equal(
+        loaded.structures[kdtree_id].query(queries, k=3)[1],
+        cloud.structures[kdtree_id].query(queries, k=3)[1],
+    )
+    np.testing.assert_array_equal(
+        loaded.structures[voxelgrid_id].voxel_n,
+        cloud.structures[voxelgrid_id].voxel_n,
+    )
+    np.testing.assert_array_equal(
+        loaded.structures[delaunay_id].find_simplex(queries),
+        cloud.structures[delaunay_id].find_simplex(queries),
+    )
+
+    # loaded structures are reused by add_structure
+    assert loaded.add_structure("voxelgrid", size_x=0.1) == voxelgrid_id
+    assert len(loaded.structures) == 3
+
+
+def test_load_structures_different_points(tmp_path, cloud):
+    cloud.add_structure("kdtree")
+    cloud.save_structures(str(tmp_path))
+
+    other = PyntCloud(cloud.points + 1)
+    with pytest.raises(ValueError):
+        other.load_structures(str(tmp_path))
+
+
+def test_load_structures_other_versions_are_computed(tmp_path, cloud):
+    kdtree_id = cloud.add_structure("kdtree")
+    cloud.save_structures(str(tmp_path))
+
+    manifest_path = os.path.join(str(tmp_path), "structures.json")
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    assert manifest["structures"][0]["versions"]["scipy"]
+    manifest["structures"][0]["versions"]["scipy"] = "0.0.0"
+    # the stored state must not be used
+    manifest["structures"][0]["values"]["n"] = -1
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+
+    loaded = PyntCloud(cloud.points.copy())
+    assert loaded.load_structures(str(tmp_path)) == [kdtree_id]
+    queries = np.random.rand(10, 3)
+    np.testing.assert_array_equal(
+        loaded.structures[kdtree_id].query(queries, k=3)[1],
+        cloud.structures[kdtree_id].query(queries, k=3)[1],
+    )
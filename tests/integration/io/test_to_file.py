@@ -1,6 +1,10 @@
+import numpy as np
 import pytest
+from pandas.testing import assert_frame_equal
 
 from pyntcloud import PyntCloud
+from pyntcloud.io import pcd
+from pyntcloud.io.ply import write_ply
 
 from test_from_file import assert_points_xyz, assert_points_color, assert_mesh
 
@@ -13,6 +17,9 @@ from test_from_file import assert_points_xyz, assert_points_color, assert_mesh
         (".npz", True, True, False),
         (".obj", False, True, False),
         (".bin", False, False, False),
+        (".pcd", True, False, False),
+        ("_ascii.pcd", True, False, False),
+        ("_compressed.pcd", True, False, False),
     ],
 )
 def test_to_file(tmpdir, diamond, extension, color, mesh, comments):
@@ -25,6 +32,10 @@ def test_to_file(tmpdir, diamond, extension, color, mesh, comments):
         extra_write_args["as_text"] = False
     if extension == "_ascii.ply":
         extra_write_args["as_text"] = True
+    if extension == "_ascii.pcd":
+        extra_write_args["data"] = "ascii"
+    if extension == "_compressed.pcd":
+        extra_write_args["data"] = "binary_compressed"
 
     diamond.to_file(str(tmpdir.join("written{}".format(extension))), **extra_write_args)
 
@@ -39,6 +50,32 @@ def test_to_file(tmpdir, diamond, extension, color, mesh, comments):
         assert written_file.comments == ["PyntCloud is cool"]
 
 
+@pytest.mark.parametrize("data", ["ascii", "binary", "binary_compressed"])
+def test_write_pcd_round_trip(tmp_path, pyntcloud_with_rgb_and_normals, data):
+    cloud = pyntcloud_with_rgb_and_normals
+    filename = str(tmp_path / "written.pcd")
+    cloud.to_file(filename, data=data)
+
+    written = PyntCloud.from_file(filename)
+    assert_frame_equal(written.points, cloud.points[written.points.columns])
+    assert set(written.points.columns) == set(cloud.points.columns)
+
+
+def test_write_pcd_binary_compressed_without_numba(
+    tmp_path, pyntcloud_with_rgb_and_normals, monkeypatch
+):
+    cloud = pyntcloud_with_rgb_and_normals
+    # long runs of repeated bytes
+    cloud.points["label"] = np.repeat(np.arange(4, dtype=np.uint32), 250)
+    filename = str(tmp_path / "written.pcd")
+    with monkeypatch.context() as m:
+        m.setattr(pcd, "is_numba_avaliable", False)
+        cloud.to_file(filename, data="binary_compressed")
+
+    written = PyntCloud.from_file(filename)
+    assert_frame_equal(written.points, cloud.points[written.points.columns])
+
+
 def test_to_bin_raises_ValueError_if_invalid_kwargs(tmpdir, diamond):
     with pytest.raises(ValueError):
         diamond.to_file(str(tmpdir.join("written.bin")), also_save=["mesh"])
@@ -68,3 +105,20 @@ def test_write_ply_with_bool(plane_pyntcloud, tmp_path):
     assert new_pyntcloud.points.equals(plane_pyntcloud.points), (
         "Re-read pyntcloud is not identical to before writing"
     )
+
+
+@pytest.mark.parametrize("as_text", [False, True])
+def test_write_ply_chunks_to_file_object(tmp_path, diamond, as_text):
+    """Expectation: chunked writes to a file object give the same cloud back."""
+    points = diamond.points.copy()
+    points["label"] = np.arange(len(points), dtype=np.int64)
+    points["height"] = points["z"].astype(np.float64)
+
+    filename = tmp_path / "written.ply"
+    with open(filename, "wb") as f:
+        write_ply(f, points=points, mesh=diamond.mesh, as_text=as_text, chunk_size=4)
+
+    written = PyntCloud.from_file(str(filename))
+    # 64 bit integers are stored as 32 bit
+    assert_frame_equal(written.points, points.astype({"label": np.int32}))
+    assert_frame_equal(written.mesh, diamond.mesh[["v1", "v2", "v3"]].astype(np.int32))
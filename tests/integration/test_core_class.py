@@ -91,3 +91,100 @@ def test_split_on(data_path):
     assert len(output) == 8
 
     rmtree("tmp_out")
+
+
+def test_add_structure_reuses_existing():
+    points = pd.DataFrame(np.random.rand(100, 3), columns=["x", "y", "z"])
+    cloud = PyntCloud(points)
+
+    kdtree_id = cloud.add_structure("kdtree")
+    kdtree = cloud.structures[kdtree_id]
+
+    assert cloud.add_structure("kdtree") == kdtree_id
+    assert cloud.structures[kdtree_id] is kdtree
+    assert cloud.structures.n_kdtrees == 1
+
+    cloud.get_neighbors(k=3)
+    assert cloud.structures[kdtree_id] is kdtree
+
+    # different params build a new structure
+    cloud.add_structure("kdtree", leafsize=8)
+    assert len(cloud.structures) == 2
+
+    cloud.add_structure("kdtree", force=True)
+    assert cloud.structures[kdtree_id] is not kdtree
+    assert cloud.structures.n_kdtrees == 2
+
+
+def test_add_structure_rebuilds_when_points_change():
+    points = pd.DataFrame(np.random.rand(100, 3), columns=["x", "y", "z"])
+    cloud = PyntCloud(points)
+
+    kdtree_id = cloud.add_structure("kdtree")
+    kdtree = cloud.structures[kdtree_id]
+
+    cloud.points = pd.DataFrame(np.random.rand(100, 3), columns=["x", "y", "z"])
+    assert cloud.add_structure("kdtree") == kdtree_id
+    assert cloud.structures[kdtree_id] is not kdtree
+    assert np.array_equal(cloud.structures[kdtree_id].data, cloud.xyz)
+
+    # changes that don't reset the structures are detected too
+    kdtree = cloud.structures[kdtree_id]
+    cloud.xyz = cloud.xyz + 1
+    cloud.add_structure("kdtree")
+    assert cloud.structures[kdtree_id] is not kdtree
+    assert np.array_equal(cloud.structures[kdtree_id].data, cloud.xyz)
+
+
+def test_structures_eviction():
+    points = pd.DataFrame(np.random.rand(100, 3), columns=["x", "y", "z"])
+    cloud = PyntCloud(points)
+    cloud.structures.max_structures = 2
+
+    first = cloud.add_structure("voxelgrid", n_x=2, n_y=2, n_z=2)
+    second = cloud.add_structure("voxelgrid", n_x=4, n_y=4, n_z=4)
+    # using first makes second the least recently used
+    cloud.add_structure("voxelgrid", n_x=2, n_y=2, n_z=2)
+    third = cloud.add_structure("kdtree")
+
+    assert list(cloud.structures) == [first, third]
+    assert second not in cloud.structures
+    assert cloud.structures.n_voxelgrids == 1
+
+    # reading doesn't change the iteration order
+    for key in cloud.structures:
+        cloud.structures[key]
+    assert list(cloud.structures) == [first, third]
+
+    cloud.structures.max_structures = None
+    cloud.structures.max_nbytes = 0
+    cloud.structures.evict()
+    assert len(cloud.structures) == 0
+
+    # limits are kept when points are re-assigned
+    cloud.points = cloud.points[:50]
+    assert cloud.structures.max_nbytes == 0
+    cloud.add_structure("kdtree")
+    assert len(cloud.structures) == 1
+
+
+def test_add_scalar_field_sets_columns_in_new_points():
+    cloud = PyntCloud(pd.DataFrame(np.random.rand(50, 3), columns=["x", "y", "z"]))
+    kdtree_id = cloud.add_structure("kdtree")
+    points = cloud.points
+    k_neighbors = cloud.get_neighbors(k=4)
+
+    ev = cloud.add_scalar_field("eigen_values", k_neighbors=k_neighbors)
+
+    assert set(ev).issubset(cloud.points.columns)
+    assert not set(ev) & set(points.columns)
+    # structures are kept
+    assert kdtree_id in cloud.structures
+
+    e1 = cloud.points[ev[0]].values.copy()
+    cloud.points[ev[0]] = 0
+    points = cloud.points
+    cloud.add_scalar_field("eigen_values", k_neighbors=k_neighbors)
+    assert list(cloud.points.columns) == list(points.columns)
+    np.testing.assert_array_equal(cloud.points[ev[0]], e1)
+    assert np.all(points[ev[0]] == 0)
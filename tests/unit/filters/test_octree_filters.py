@@ -0,0 +1,18 @@
+from numpy.testing import assert_array_equal
+
+from pyntcloud.filters.octree import OctreeBoundingBoxFilter
+
+
+def test_OctreeBoundingBoxFilter_expected_values(simple_pyntcloud):
+    octree_id = simple_pyntcloud.add_structure("octree", max_level=4)
+    filter = OctreeBoundingBoxFilter(
+        pyntcloud=simple_pyntcloud,
+        octree_id=octree_id,
+        min_x=0.1,
+        max_x=0.6,
+        max_z=0.5,
+    )
+    filter.extract_info()
+
+    result = filter.compute()
+    assert_array_equal(result, [False, True, True, True, False, False])
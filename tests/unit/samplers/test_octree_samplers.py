@@ -0,0 +1,24 @@
+import numpy as np
+
+from pyntcloud.samplers import (
+    OctreeCentersSampler,
+    OctreeCentroidsSampler,
+    OctreeNearestSampler,
+)
+
+
+def test_octree_samplers_expected_values(simple_pyntcloud):
+    octree_id = simple_pyntcloud.add_structure("octree", max_level=4)
+
+    expected = {
+        OctreeCentersSampler: [[0.25] * 3, [0.75] * 3],
+        OctreeCentroidsSampler: [[0.1] * 3, [0.8] * 3],
+        OctreeNearestSampler: [[0.2] * 3, [0.9] * 3],
+    }
+    for sampler_class, expected_points in expected.items():
+        sampler = sampler_class(
+            pyntcloud=simple_pyntcloud, octree_id=octree_id, level=1
+        )
+        sampler.extract_info()
+        sample = sampler.compute()
+        assert np.allclose(sample[["x", "y", "z"]].values, expected_points)
@@ -1,14 +1,26 @@
 import pytest
 
 import numpy as np
+import pandas as pd
 
+from pyntcloud import PyntCloud
 from pyntcloud.scalar_fields.k_neighbors import (
     EigenValues,
     EigenDecomposition,
+    GeometricFeatures,
+    KNeighborsScalarField,
+    MultiScaleEigenValues,
     UnorientedNormals,
 )
 
 
+@pytest.fixture()
+def random_pyntcloud():
+    """float64, so results don't depend on float32 rounding."""
+    xyz = np.random.default_rng(0).random((1000, 3))
+    return PyntCloud(pd.DataFrame(xyz, columns=["x", "y", "z"]))
+
+
 @pytest.mark.parametrize(
     "ScalarField", [EigenValues, EigenDecomposition, UnorientedNormals]
 )
@@ -135,3 +147,186 @@ def test_UnorientedNormals_bounds(
     for x in ["nx(4)", "ny(4)", "nz(4)"]:
         assert all(scalar_field.to_be_added[x] >= -1)
         assert all(scalar_field.to_be_added[x] <= 1)
+
+
+@pytest.mark.parametrize(
+    "ScalarField",
+    [EigenValues, EigenDecomposition, GeometricFeatures, UnorientedNormals],
+)
+@pytest.mark.usefixtures(
+    "pyntcloud_with_rgb_and_normals", "pyntcloud_with_rgb_and_normals_k_neighbors"
+)
+def test_KNeighborsScalarField_chunks_match_single_chunk(
+    pyntcloud_with_rgb_and_normals,
+    pyntcloud_with_rgb_and_normals_k_neighbors,
+    ScalarField,
+):
+    results = []
+    for chunk_size, max_workers in [(10**6, 1), (64, 1), (64, 4)]:
+        scalar_field = ScalarField(
+            pyntcloud=pyntcloud_with_rgb_and_normals,
+            k_neighbors=pyntcloud_with_rgb_and_normals_k_neighbors,
+            chunk_size=chunk_size,
+            max_workers=max_workers,
+        )
+        scalar_field.extract_info()
+        scalar_field.compute()
+        results.append(scalar_field.to_be_added)
+
+    for result in results[1:]:
+        assert list(result) == list(results[0])
+        for name, values in result.items():
+            np.testing.assert_array_equal(values, results[0][name])
+
+
+@pytest.mark.usefixtures(
+    "pyntcloud_with_rgb_and_normals", "pyntcloud_with_rgb_and_normals_k_neighbors"
+)
+def test_GeometricFeatures_match_eigenvalues_scalar_fields(
+    pyntcloud_with_rgb_and_normals, pyntcloud_with_rgb_and_normals_k_neighbors
+):
+    cloud = pyntcloud_with_rgb_and_normals
+    k_neighbors = pyntcloud_with_rgb_and_normals_k_neighbors
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ev = cloud.add_scalar_field("eigen_values", k_neighbors=k_neighbors)
+        expected = [
+            cloud.add_scalar_field(name, ev=ev)
+            for name in ["anisotropy", "planarity", "eigenentropy", "curvature"]
+        ]
+    expected_values = cloud.points[expected].values.copy()
+    columns = cloud.add_scalar_field(
+        "geometric_features",
+        k_neighbors=k_neighbors,
+        features=["anisotropy", "planarity", "eigenentropy", "curvature"],
+    )
+    assert columns == expected
+    np.testing.assert_allclose(cloud.points[columns].values, expected_values)
+    # existing columns are replaced
+    assert len(cloud.points.columns) == len(set(cloud.points.columns))
+
+
+@pytest.mark.usefixtures("plane_pyntcloud", "plane_k_neighbors")
+def test_GeometricFeatures_raises_on_unsupported_features(
+    plane_pyntcloud, plane_k_neighbors
+):
+    with pytest.raises(ValueError):
+        GeometricFeatures(
+            pyntcloud=plane_pyntcloud,
+            k_neighbors=plane_k_neighbors,
+            features=["planarity", "verticality"],
+        )
+
+
+@pytest.mark.parametrize(
+    "ScalarField",
+    [EigenValues, EigenDecomposition, GeometricFeatures, UnorientedNormals],
+)
+def test_KNeighborsScalarField_r_neighbors_match_k_neighbors(
+    random_pyntcloud, ScalarField
+):
+    k_neighbors = random_pyntcloud.get_neighbors(k=3)
+    n, k = k_neighbors.shape
+    # the same neighbourhoods, with each point first, in CSR format
+    indices = np.hstack([np.arange(n)[:, None], k_neighbors]).ravel()
+    indptr = np.arange(0, n * (k + 1) + 1, k + 1)
+
+    expected = ScalarField(pyntcloud=random_pyntcloud, k_neighbors=k_neighbors)
+    scalar_field = ScalarField(
+        pyntcloud=random_pyntcloud,
+        r_neighbors=(indptr, indices),
+        r=0.5,
+        chunk_size=64,
+    )
+    for sf in [expected, scalar_field]:
+        sf.extract_info()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sf.compute()
+
+    for (name, values), expected_values in zip(
+        scalar_field.to_be_added.items(), expected.to_be_added.values()
+    ):
+        assert name.endswith("(r=0.5)")
+        if ScalarField in (EigenDecomposition, UnorientedNormals):
+            # eigenvectors have arbitrary sign
+            values, expected_values = np.abs(values), np.abs(expected_values)
+        np.testing.assert_allclose(values, expected_values, atol=1e-9)
+
+
+@pytest.mark.usefixtures("pyntcloud_with_rgb_and_normals")
+def test_geometric_features_from_hybrid_neighbors(pyntcloud_with_rgb_and_normals):
+    cloud = pyntcloud_with_rgb_and_normals
+    neighbors = cloud.get_neighbors(k=8, r=0.5)
+
+    columns = cloud.add_scalar_field(
+        "geometric_features", r_neighbors=neighbors, r=0.5, features=["planarity"]
+    )
+
+    assert columns == "planarity(r=0.5)"
+    assert cloud.points[columns].between(0, 1).all()
+
+
+@pytest.mark.usefixtures("plane_pyntcloud", "plane_k_neighbors")
+def test_KNeighborsScalarField_requires_one_kind_of_neighbors(
+    plane_pyntcloud, plane_k_neighbors
+):
+    with pytest.raises(ValueError):
+        EigenValues(pyntcloud=plane_pyntcloud)
+    with pytest.raises(ValueError):
+        EigenValues(
+            pyntcloud=plane_pyntcloud,
+            k_neighbors=plane_k_neighbors,
+            r_neighbors=(np.zeros(1), np.zeros(0)),
+        )
+
+
+@pytest.mark.parametrize("features", [None, ["planarity", "omnivariance"]])
+def test_MultiScaleEigenValues_match_each_scale(random_pyntcloud, features):
+    cloud = random_pyntcloud
+    k_neighbors = cloud.get_neighbors(k=12)
+
+    scalar_field = MultiScaleEigenValues(
+        pyntcloud=cloud,
+        k_neighbors=k_neighbors,
+        scales=[12, 3, 6],
+        features=features,
+        chunk_size=64,
+    )
+    scalar_field.extract_info()
+    scalar_field.compute()
+
+    expected = {}
+    for scale in [3, 6, 12]:
+        if features is None:
+            single = EigenValues(pyntcloud=cloud, k_neighbors=k_neighbors[:, :scale])
+        else:
+            single = GeometricFeatures(
+                pyntcloud=cloud,
+                k_neighbors=k_neighbors[:, :scale],
+                features=features,
+            )
+        single.extract_info()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            single.compute()
+        expected.update(single.to_be_added)
+
+    assert list(scalar_field.to_be_added) == list(expected)
+    for name, values in scalar_field.to_be_added.items():
+        np.testing.assert_allclose(values, expected[name], atol=1e-9)
+
+
+@pytest.mark.usefixtures("plane_pyntcloud", "plane_k_neighbors")
+def test_MultiScaleEigenValues_raises_on_scales_out_of_range(
+    plane_pyntcloud, plane_k_neighbors
+):
+    with pytest.raises(ValueError):
+        MultiScaleEigenValues(
+            pyntcloud=plane_pyntcloud,
+            k_neighbors=plane_k_neighbors,
+            scales=[1, plane_k_neighbors.shape[1] + 1],
+        )
+
+
+@pytest.mark.usefixtures("plane_pyntcloud", "plane_k_neighbors")
+def test_KNeighborsScalarField_is_abstract(plane_pyntcloud, plane_k_neighbors):
+    with pytest.raises(TypeError):
+        KNeighborsScalarField(pyntcloud=plane_pyntcloud, k_neighbors=plane_k_neighbors)
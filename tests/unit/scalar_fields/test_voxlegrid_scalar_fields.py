@@ -1,7 +1,9 @@
 import pytest
 
 import numpy as np
+import pandas as pd
 
+from pyntcloud import PyntCloud
 from pyntcloud.scalar_fields.voxelgrid import (
     EuclideanClusters,
     VoxelgridScalarField,
@@ -65,3 +67,21 @@ def test_EuclideanClusters_values(pyntcloud_with_clusters_and_voxelgrid_id):
         scalar_field.compute()
     scalar_field_values = next(iter(scalar_field.to_be_added.values()))
     assert all(scalar_field_values[:5] != scalar_field_values[5:])
+
+
+def test_EuclideanClusters_min_cluster_size():
+    # clusters narrower than a voxel, so each spans adjacent voxels only
+    xyz = np.random.default_rng(0).random((11, 3)) * 0.4
+    xyz[:5] += 10
+    # a point far away from both clusters
+    xyz[10] = 5
+    cloud = PyntCloud(pd.DataFrame(data=xyz, columns=["x", "y", "z"]))
+    voxelgrid_id = cloud.add_structure("voxelgrid", size_x=0.5, size_y=0.5, size_z=0.5)
+    scalar_field = EuclideanClusters(
+        pyntcloud=cloud, voxelgrid_id=voxelgrid_id, min_cluster_size=2
+    )
+    scalar_field.extract_info()
+    scalar_field.compute()
+    scalar_field_values = next(iter(scalar_field.to_be_added.values()))
+    assert scalar_field_values[10] == -1
+    assert set(scalar_field_values[:10]) == {0, 1}
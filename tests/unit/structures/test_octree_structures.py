@@ -0,0 +1,66 @@
+import pytest
+
+import numpy as np
+
+from scipy.spatial import cKDTree
+
+from pyntcloud.structures import Octree
+from pyntcloud.structures.octree import morton_decode, morton_encode
+
+
+@pytest.fixture()
+def clustered_xyz():
+    rng = np.random.default_rng(0)
+    xyz = rng.random((2000, 3)).astype(np.float32)
+    # non uniform density
+    xyz[:1000] *= 0.05
+    return xyz
+
+
+def test_morton_decode_inverts_morton_encode():
+    ijk = np.random.randint(0, 2**21, size=(100, 3)).astype(np.uint64)
+    assert np.all(morton_decode(morton_encode(ijk)) == ijk)
+
+
+def test_invalid_max_level_raises(xyz):
+    with pytest.raises(ValueError):
+        Octree(points=xyz, max_level=22)
+
+
+@pytest.mark.parametrize("max_points", [None, 1, 16])
+def test_octree_queries_match_brute_force(clustered_xyz, max_points):
+    octree = Octree(points=clustered_xyz, max_level=8, max_points=max_points)
+    octree.compute()
+    kdtree = cKDTree(clustered_xyz)
+    queries = np.random.default_rng(1).random((20, 3)) * 1.2 - 0.1
+
+    lower, upper = [0.01, 0.02, 0.0], [0.5, 0.6, 0.03]
+    expected = np.flatnonzero(
+        np.all((clustered_xyz >= lower) & (clustered_xyz <= upper), axis=1)
+    )
+    assert np.all(octree.query_box(lower, upper) == expected)
+
+    for result, expected in zip(
+        octree.query_ball_point(queries, 0.1), kdtree.query_ball_point(queries, 0.1)
+    ):
+        assert np.all(result == np.sort(expected))
+
+    distances, _ = octree.query(queries, k=5)
+    assert np.allclose(distances, kdtree.query(queries, k=5)[0])
+
+    distance, index = octree.query(clustered_xyz[3])
+    assert distance == 0 and index == 3
+
+
+def test_octree_levels(simple_pyntcloud):
+    octree = Octree(points=simple_pyntcloud.xyz, max_level=2, max_points=2)
+    octree.compute()
+
+    keys, counts = octree.get_level(1)
+    assert np.all(keys == [0, 7])
+    assert np.all(counts == [3, 3])
+    assert octree.get_occupancy(1) == 2 / 8
+    assert np.all(octree.get_level_n(1) == [0, 0, 0, 1, 1, 1])
+    assert np.allclose(octree.get_level_centers(1), [[0.25] * 3, [0.75] * 3])
+    # nodes with 2 points or less aren't subdivided
+    assert octree.n_leaves == 3
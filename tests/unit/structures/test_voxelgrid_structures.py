@@ -1,10 +1,13 @@
+import pickle
+
 import pytest
 
 import numpy as np
 import pandas as pd
 
 from pyntcloud import PyntCloud
-from pyntcloud.structures import VoxelGrid
+from pyntcloud.structures import VoxelGrid, VoxelGridSpec
+from pyntcloud.structures.voxelgrid import query_voxelgrid
 
 
 def test_default_number_of_voxels_per_axis(simple_pyntcloud):
@@ -113,3 +116,129 @@ def test_output_shape_of_all_feature_vector_modes(mode, simple_pyntcloud):
     feature_vector = voxelgrid.get_feature_vector(mode=mode)
 
     assert feature_vector.shape == (2, 2, 2)
+
+
+@pytest.mark.parametrize(
+    "mode",
+    [
+        "binary",
+        "density",
+        "TDF",
+        "x_mean",
+        "y_mean",
+        "z_mean",
+        "x_max",
+        "y_max",
+        "z_max",
+    ],
+)
+def test_sparse_feature_vector_matches_dense(mode, simple_pyntcloud):
+    voxelgrid = VoxelGrid(points=simple_pyntcloud.xyz, n_x=3, n_y=3, n_z=3)
+    voxelgrid.compute()
+    dense = voxelgrid.get_feature_vector(mode=mode).ravel()
+
+    voxel_n, values = voxelgrid.get_feature_vector(mode=mode, sparse=True)
+
+    assert np.all(voxel_n == np.unique(voxelgrid.voxel_n))
+    assert np.allclose(values, dense[voxel_n])
+
+
+def test_sparse_voxelgrid_only_stores_occupied_voxels(simple_pyntcloud):
+    dense = VoxelGrid(points=simple_pyntcloud.xyz, n_x=3, n_y=3, n_z=3)
+    dense.compute()
+    sparse = VoxelGrid(points=simple_pyntcloud.xyz, n_x=3, n_y=3, n_z=3, sparse=True)
+    sparse.compute()
+
+    assert sparse.id != dense.id
+    assert np.all(sparse.voxel_n == dense.voxel_n)
+    assert len(sparse.voxel_centers) == len(sparse.occupied_voxels)
+    assert np.allclose(sparse.voxel_centers, dense.voxel_centers[dense.occupied_voxels])
+    assert np.allclose(sparse.centers_of(4), dense.voxel_centers[[4]])
+
+
+@pytest.mark.parametrize("mode", ["binary", "density", "TDF", "x_mean"])
+def test_dense_feature_vector_of_sparse_voxelgrid(mode, simple_pyntcloud):
+    dense = VoxelGrid(points=simple_pyntcloud.xyz, n_x=3, n_y=3, n_z=3)
+    dense.compute()
+    sparse = VoxelGrid(points=simple_pyntcloud.xyz, n_x=3, n_y=3, n_z=3, sparse=True)
+    sparse.compute()
+
+    assert np.allclose(
+        sparse.get_feature_vector(mode=mode, sparse=False),
+        dense.get_feature_vector(mode=mode),
+    )
+
+
+def test_query_voxelgrid_matches_searchsorted():
+    rng = np.random.default_rng(0)
+    points = rng.random((1000, 3)) * 10
+    x_y_z = [7, 3, 5]
+    segments = [np.linspace(0, 10, n + 1) for n in x_y_z]
+    # points on the limits of the voxels and outside of the grid
+    points[:8, 0] = segments[0]
+    points[8:10] = [[-1, -1, -1], [11, 11, 11]]
+
+    voxel_n = query_voxelgrid(segments, x_y_z, points)
+
+    expected = np.ravel_multi_index(
+        [
+            np.clip(np.searchsorted(segments[i], points[:, i]) - 1, 0, x_y_z[i] - 1)
+            for i in range(3)
+        ],
+        x_y_z,
+    )
+    assert voxel_n.dtype == np.int32
+    assert np.all(voxel_n == expected)
+
+
+@pytest.mark.parametrize("connectivity", [6, 18, 26])
+def test_get_voxel_neighbors_batch_matches_brute_force(connectivity):
+    points = np.random.default_rng(0).random((200, 3))
+    voxelgrid = VoxelGrid(points=points, n_x=6, n_y=5, n_z=4)
+    voxelgrid.compute()
+
+    occupied = voxelgrid.occupied_voxels
+    voxels = occupied[::3]
+    indptr, neighbors = voxelgrid.get_voxel_neighbors_batch(voxels, connectivity)
+
+    occupied_xyz = np.stack(np.unravel_index(occupied, voxelgrid.x_y_z), axis=1)
+    for i, voxel in enumerate(voxels):
+        offsets = np.abs(occupied_xyz - np.unravel_index(voxel, voxelgrid.x_y_z))
+        is_neighbor = (offsets.max(1) == 1) & (
+            offsets.sum(1) <= {6: 1, 18: 2, 26: 3}[connectivity]
+        )
+        assert np.all(neighbors[indptr[i] : indptr[i + 1]] == occupied[is_neighbor])
+    if connectivity == 26:
+        assert np.all(
+            neighbors[indptr[0] : indptr[1]]
+            == np.setdiff1d(voxelgrid.get_voxel_neighbors(voxels[0]), voxels[0])
+        )
+
+    with pytest.raises(ValueError):
+        voxelgrid.get_voxel_neighbors_batch([voxelgrid.n_voxels + 1])
+
+
+def test_voxelgrid_spec_matches_voxelgrid():
+    rng = np.random.default_rng(0)
+    points = rng.random((500, 3)).astype(np.float32)
+    voxelgrid = VoxelGrid(points=points, size_x=0.07, size_y=0.07, size_z=0.07)
+    voxelgrid.compute()
+
+    spec = pickle.loads(pickle.dumps(voxelgrid.get_spec()))
+    assert len(pickle.dumps(spec)) < 1000
+
+    new_points = rng.random((100, 3)) * 1.2 - 0.1
+    assert np.all(spec.query(new_points) == voxelgrid.query(new_points))
+    voxels = voxelgrid.occupied_voxels
+    assert np.all(spec.centers_of(voxels) == voxelgrid.centers_of(voxels))
+    assert spec.n_voxels == voxelgrid.n_voxels
+
+
+def test_voxelgrid_spec_from_bounds():
+    spec = VoxelGridSpec.from_bounds([0, 0, 0], [1, 0.5, 0.25], [0.3, 0.1, 1])
+
+    assert np.all(spec.x_y_z == [4, 5, 1])
+    np.testing.assert_allclose(spec.xyzmax, [1.2, 0.5, 1])
+    points = np.array([[0.05, 0.05, 0.05], [1.1, 0.45, 0.9]])
+    assert np.all(spec.query(points) == [0, 19])
+    np.testing.assert_allclose(spec.centers_of([0]), [[0.15, 0.05, 0.5]], rtol=1e-6)
@@ -0,0 +1,59 @@
+import pytest
+
+import numpy as np
+
+from pyntcloud.utils import array
+from pyntcloud.utils.array import cov3D, eigh3x3, segment_cov3D
+
+
+@pytest.fixture()
+def covariances():
+    rng = np.random.default_rng(0)
+    neighborhoods = np.concatenate(
+        [
+            rng.random((50, 8, 3)),
+            # planar and linear neighborhoods
+            rng.random((50, 8, 3)) * [1, 1, 1e-6],
+            rng.random((50, 8, 3)) * [1, 1e-6, 1e-6],
+        ]
+    )
+    cov = cov3D(neighborhoods)
+    # repeated eigenvalues
+    degenerate = np.stack([np.eye(3), np.zeros((3, 3)), np.diag([2.0, 1.0, 1.0])])
+    return np.concatenate([cov, degenerate])
+
+
+@pytest.mark.parametrize("use_numba", [False, True])
+def test_eigh3x3_matches_eigh(covariances, use_numba, monkeypatch):
+    if use_numba and not array.is_numba_avaliable:
+        pytest.skip("numba is not available")
+    monkeypatch.setattr(array, "is_numba_avaliable", use_numba)
+
+    values, vectors = eigh3x3(covariances)
+
+    expected = np.linalg.eigh(covariances)[0][:, ::-1]
+    np.testing.assert_allclose(values, expected, atol=1e-14)
+    np.testing.assert_allclose(
+        covariances @ vectors, vectors * values[:, None, :], atol=1e-14
+    )
+    np.testing.assert_allclose(
+        np.einsum("nji,njk->nik", vectors, vectors),
+        np.broadcast_to(np.eye(3), vectors.shape),
+        atol=1e-12,
+    )
+    np.testing.assert_array_equal(eigh3x3(covariances, eigenvectors=False), values)
+
+
+def test_segment_cov3D_matches_cov3D():
+    rng = np.random.default_rng(0)
+    neighborhoods = [rng.random((size, 3)) + 1000 for size in [5, 1, 0, 8, 3]]
+    indptr = np.cumsum([0] + [len(x) for x in neighborhoods])
+
+    cov = segment_cov3D(np.concatenate(neighborhoods), indptr)
+
+    assert cov.shape == (5, 3, 3)
+    for i, neighborhood in enumerate(neighborhoods):
+        if len(neighborhood):
+            np.testing.assert_allclose(cov[i], cov3D(neighborhood[None])[0], atol=1e-12)
+        else:
+            assert np.all(cov[i] == 0)
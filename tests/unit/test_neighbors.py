@@ -0,0 +1,90 @@
+import numpy as np
+
+from pyntcloud.neighbors import k_neighbors, kr_neighbors, r_neighbors
+from pyntcloud.structures import KDTree
+
+
+def test_r_neighbors_csr_matches_lists():
+    points = np.random.default_rng(0).random((500, 3))
+    kdtree = KDTree(points=points)
+    kdtree.compute()
+
+    lists = r_neighbors(kdtree, 0.1)
+    indptr, indices, distances = r_neighbors(
+        kdtree, 0.1, format="csr", return_distances=True, chunk_size=64
+    )
+
+    assert indptr.shape == (501,)
+    assert indices.dtype == np.int32
+    for i, neighbors in enumerate(lists):
+        row = indices[indptr[i] : indptr[i + 1]]
+        assert sorted(row) == sorted(neighbors)
+        np.testing.assert_allclose(
+            distances[indptr[i] : indptr[i + 1]],
+            np.linalg.norm(points[row] - points[i], axis=1),
+        )
+
+
+def test_r_neighbors_include_points_at_r():
+    # distances are exact in binary
+    points = np.array([[0.0, 0, 0], [0.5, 0, 0], [1.5, 0, 0]])
+    kdtree = KDTree(points=points)
+    kdtree.compute()
+
+    lists = r_neighbors(kdtree, 0.5)
+    indptr, indices = r_neighbors(kdtree, 0.5, format="csr")
+
+    assert sorted(lists[0]) == [0, 1]
+    assert sorted(indices[indptr[0] : indptr[1]]) == [0, 1]
+    assert list(indices[indptr[2] : indptr[3]]) == [2]
+
+    indptr, indices = kr_neighbors(kdtree, 2, 0.5)
+    assert list(indices[indptr[0] : indptr[1]]) == [0, 1]
+    assert list(indices[indptr[2] : indptr[3]]) == [2]
+
+
+def test_k_neighbors_chunks_match_single_query(tmp_path):
+    points = np.random.default_rng(0).random((500, 3))
+    kdtree = KDTree(points=points)
+    kdtree.compute()
+    expected_distances, expected = kdtree.query(points, k=5)
+
+    out = np.lib.format.open_memmap(
+        str(tmp_path / "neighbors.npy"), mode="w+", dtype=np.int32, shape=(500, 4)
+    )
+    distances, indices = k_neighbors(
+        kdtree, 4, chunk_size=64, out=out, return_distances=True
+    )
+
+    assert indices is out
+    assert np.all(indices == expected[:, 1:])
+    assert distances.dtype == np.float32
+    np.testing.assert_allclose(distances, expected_distances[:, 1:], rtol=1e-6)
+    assert k_neighbors(kdtree, 4).dtype == np.int32
+    np.testing.assert_array_equal(
+        k_neighbors(kdtree, 4, return_indices=False, return_distances=True),
+        distances,
+    )
+
+
+def test_kr_neighbors_are_k_neighbors_within_r():
+    points = np.random.default_rng(0).random((500, 3))
+    kdtree = KDTree(points=points)
+    kdtree.compute()
+    expected_distances, expected = kdtree.query(points, k=9)
+
+    indptr, indices, distances = kr_neighbors(
+        kdtree, 8, 0.1, return_distances=True, chunk_size=64
+    )
+
+    assert indptr.shape == (501,)
+    assert indices.dtype == np.int32
+    assert np.all(np.diff(indptr) >= 1)
+    for i in range(500):
+        within = expected_distances[i] <= 0.1
+        np.testing.assert_array_equal(
+            indices[indptr[i] : indptr[i + 1]], expected[i][within]
+        )
+        np.testing.assert_allclose(
+            distances[indptr[i] : indptr[i + 1]], expected_distances[i][within]
+        )